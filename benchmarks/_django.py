@@ -0,0 +1,32 @@
+"""
+Shared Django bootstrap for the benchmark scripts.
+
+Benchmarks run against the example project on a throwaway SQLite test database:
+
+    python -m benchmarks.bench_table_for_rows
+"""
+
+import os
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "example_project.settings_test")
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create the test database for the duration of the block."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
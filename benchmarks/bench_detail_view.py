@@ -0,0 +1,248 @@
+"""
+Benchmark suite for the detail-view rendering pipeline.
+
+Times table_for, details_table_for, fill_missing_values, a full auto_layout_detail.html
+page and LazyFragmentView for every combination of row and column counts, on factory
+data with FK, Money and datetime columns. Results are written as JSON so runs of two
+commits can be compared:
+
+    python -m benchmarks.bench_detail_view --output before.json
+    git checkout other-branch
+    python -m benchmarks.bench_detail_view --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from benchmarks._django import setup_django, test_database
+
+DEFAULT_ROWS = (10, 100, 1000)
+DEFAULT_COLS = (5, 20, 50)
+
+
+def column_pool():
+    """Column kinds cycled through to build tables of any width."""
+    from moneyed import Money
+
+    from djadmin_detail_view.template_helpers import col
+
+    return [
+        lambda: col("name"),
+        lambda: col("email"),
+        lambda: col("company"),  # FK, auto-linked
+        lambda: col("created_at"),
+        lambda: col("balance", value=lambda contact: Money(contact.pk, "SGD")),
+        lambda: col("company.name"),  # through the FK
+        lambda: col("phone"),
+        lambda: col("last_seen", value=lambda contact: contact.updated_at),
+        lambda: col("is_active"),
+        lambda: col("updated_at"),
+    ]
+
+
+def build_cols(n_cols):
+    pool = column_pool()
+    cols = []
+    for index in range(n_cols):
+        column = pool[index % len(pool)]()
+        column["display_name"] = f"{column['display_name']} {index}"
+        cols.append(column)
+    return cols
+
+
+def make_detail_view(n_rows, cols):
+    """A company detail view whose page holds a details panel and a contacts table of the given size."""
+    from django.views.generic import DetailView
+
+    from djadmin_detail_view import AdminDetailMixin, detail, details_table_for, lazy_panel, table_for
+    from example_project.companies.models import Company
+
+    class BenchDetailView(AdminDetailMixin, DetailView):
+        model = Company
+
+        def get_context_data(self, request, *args, **kwargs):
+            ctx = super().get_context_data(request, *args, **kwargs)
+            ctx["layout"] = [
+                {"row": [{"col": details_table_for(panel_name="Company", obj=self.object, details=self.details())}]},
+                {"row": [{"col": self.contacts_table(lazy_load_key=None)}]},
+                {"row": [{"col": self.lazy_contacts()}]},
+            ]
+            return ctx
+
+        def details(self):
+            return [detail(name) for name in ["id", "name", "address", "phone", "email", "website", "created_at"]]
+
+        def contacts_table(self, lazy_load_key):
+            return table_for(
+                panel_name="Contacts",
+                obj_set=self.object.contact_set.all(),
+                obj_set_limit=n_rows,
+                cols=cols,
+                lazy_load_key=lazy_load_key,
+            )
+
+        @lazy_panel("bench_contacts")
+        def lazy_contacts(self):
+            return self.contacts_table(lazy_load_key="bench_contacts")
+
+    return BenchDetailView
+
+
+def benchmarks(company, contacts, n_rows, cols, user):
+    """{name: zero-argument callable} for one rows x cols combination."""
+    from django.contrib import admin
+    from django.test import RequestFactory
+
+    from djadmin_detail_view import LazyFragmentView, details_table_for, table_for
+    from djadmin_detail_view.template_helpers import fill_missing_values, reset_lazy_key_tracking
+    from example_project.companies.models import Company, Contact
+
+    admin_obj = admin.site._registry[Company]
+    detail_view_class = make_detail_view(n_rows, cols)
+    page_view = detail_view_class.as_view(admin_obj=admin_obj)
+    lazy_view = LazyFragmentView.as_view(admin_obj=admin_obj, detail_view_class=detail_view_class)
+    factory = RequestFactory()
+    queryset = Contact.objects.filter(company=company)
+
+    def request():
+        reset_lazy_key_tracking()
+        req = factory.get("/")
+        req.user = user
+        return req
+
+    def run_table_for():
+        table_for(obj_set=queryset, obj_set_limit=n_rows, cols=cols)
+
+    def run_details_table_for():
+        details_table_for(obj=contacts[0], details=[dict(column) for column in cols])
+
+    def run_fill_missing_values():
+        for contact in contacts:
+            fill_missing_values(contact, [dict(column) for column in cols])
+
+    def run_page():
+        page_view(request(), pk=company.pk).render()
+
+    def run_lazy_fragment():
+        lazy_view(request(), pk=company.pk, fragment_key="bench_contacts")
+
+    return {
+        "table_for": run_table_for,
+        "details_table_for": run_details_table_for,
+        "fill_missing_values": run_fill_missing_values,
+        "page_render": run_page,
+        "lazy_fragment": run_lazy_fragment,
+    }
+
+
+def measure(func, min_repeat, budget):
+    """Run func at least min_repeat times and until budget seconds are spent; times in ms."""
+    func()  # warm up
+
+    times = []
+    started = time.perf_counter()
+    while len(times) < min_repeat or time.perf_counter() - started < budget:
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "repeat": len(times),
+    }
+
+
+def run(rows, cols_counts, min_repeat, budget):
+    from django.contrib.auth.models import User
+
+    from example_project.companies.models import Contact
+    from example_project.companies.tests.factories import CompanyFactory, ContactFactory
+
+    user = User.objects.create_superuser(username="bench", email="bench@example.com", password="bench")
+    results = []
+
+    for n_rows in rows:
+        company = CompanyFactory()
+        ContactFactory.create_batch(n_rows, company=company)
+        contacts = list(Contact.objects.select_related("company").filter(company=company))
+
+        for n_cols in cols_counts:
+            cols = build_cols(n_cols)
+            for name, func in benchmarks(company, contacts, n_rows, cols, user).items():
+                result = {"benchmark": name, "rows": n_rows, "cols": n_cols}
+                result.update(measure(func, min_repeat, budget))
+                results.append(result)
+                print(f"{name:<22}{n_rows:>6} rows{n_cols:>4} cols{result['median_ms']:>12.2f} ms")
+
+    return results
+
+
+def metadata():
+    import django
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "machine": platform.machine(),
+        "database": "sqlite",
+    }
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    before = {(r["benchmark"], r["rows"], r["cols"]): r["median_ms"] for r in baseline["results"]}
+
+    print(f"\nCompared to {baseline_path} ({baseline['meta'].get('commit')}):")
+    for result in results:
+        key = (result["benchmark"], result["rows"], result["cols"])
+        if key not in before:
+            continue
+        change = (result["median_ms"] / before[key] - 1) * 100
+        print(
+            f"{key[0]:<22}{key[1]:>6} rows{key[2]:>4} cols"
+            f"{before[key]:>12.2f} ->{result['median_ms']:>10.2f} ms{change:>+8.1f}%"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--cols", type=int, nargs="+", default=DEFAULT_COLS)
+    parser.add_argument("--min-repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds to spend per measurement")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    setup_django()
+
+    with test_database():
+        results = run(args.rows, args.cols, args.min_repeat, args.budget)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
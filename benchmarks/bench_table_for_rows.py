@@ -0,0 +1,101 @@
+"""
+Microbenchmark: per-row cost of building table_for rows.
+
+Compares the previous row construction (details_table_for + copy.deepcopy of the whole
+row, model instance included) against the current one (slotted Row/Cell objects sharing
+the columns and the model instance). Reports time, memory blocks retained and peak traced memory per row.
+
+    python -m benchmarks.bench_table_for_rows [--rows 10] [--repeat 200]
+"""
+
+import argparse
+import copy
+import time
+import tracemalloc
+
+from benchmarks._django import setup_django, test_database
+
+
+def legacy_rows(objs, cols):
+    from djadmin_detail_view.template_helpers import details_table_for
+
+    rows = []
+    for obj in objs:
+        row = details_table_for(obj=obj, details=cols.copy())
+        rows.append(copy.deepcopy(row))
+    return rows
+
+
+def current_rows(objs, cols):
+    from djadmin_detail_view.template_helpers import table_for
+
+    return table_for(obj_set=objs, obj_set_limit=None, cols=cols)["rows"]
+
+
+def measure(build_rows, objs, cols, repeat):
+    build_rows(objs, cols)  # warm up
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build_rows(objs, cols)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    rows = build_rows(objs, cols)
+    after_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+
+    n_rows = len(objs)
+    return {
+        "us_per_row": elapsed / repeat / n_rows * 1_000_000,
+        "blocks_per_row": (after_blocks - before_blocks) / n_rows,
+        "peak_bytes_per_row": peak / n_rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from djadmin_detail_view.template_helpers import col
+    from example_project.companies.models import Contact
+    from example_project.companies.tests.factories import CompanyFactory, ContactFactory
+
+    with test_database():
+        company = CompanyFactory()
+        ContactFactory.create_batch(args.rows, company=company)
+
+        # Loaded relations are what made deepcopy expensive: every row copied the company too
+        objs = list(Contact.objects.select_related("company").filter(company=company))
+        cols = [
+            col("id"),
+            col("name"),
+            col("phone"),
+            col("email"),
+            col("company"),
+            col("created_at"),
+            col("is_active"),
+        ]
+
+        results = {
+            "before (deepcopy)": measure(legacy_rows, objs, cols, args.repeat),
+            "after": measure(current_rows, objs, cols, args.repeat),
+        }
+
+    print(f"{'':<20}{'us/row':>12}{'blocks/row':>14}{'peak B/row':>14}")
+    for name, result in results.items():
+        print(
+            f"{name:<20}{result['us_per_row']:>12.1f}"
+            f"{result['blocks_per_row']:>14.1f}{result['peak_bytes_per_row']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,37 @@
-from .mixins import AdminChangeListViewDetail, AdminDetailMixin, LazyFragmentView
+from .fragment_cache import invalidate_lazy_fragments, invalidate_lazy_fragments_on_change
+from .mixins import (
+    AdminChangeListViewDetail,
+    AdminDetailMixin,
+    AsyncAdminDetailMixin,
+    AsyncLazyFragmentBatchView,
+    AsyncLazyFragmentView,
+    LazyFragmentBatchView,
+    LazyFragmentMoreView,
+    LazyFragmentView,
+    PanelExportView,
+)
 from .template_helpers import (
+    DeferredPanel,
     LazyFragment,
+    admin_action_btn,
     col,
     detail,
     details_table_for,
     dropdown_divider,
     dropdown_header,
     dropdown_item,
+    lazy_panel,
     menu_item,
     table_for,
     top_menu_btn,
 )
 from .url_helpers import (
+    admin_actions_for,
+    admin_export_path_for,
     admin_filtered_list_path_for,
+    admin_has_action,
+    admin_lazy_batch_path_for,
+    admin_lazy_more_path_for,
     admin_lazy_path_for,
     admin_path_for,
     admin_path_name,
@@ -21,23 +40,40 @@ from .url_helpers import (
 )
 
 __all__ = [
+    # Fragment cache
+    "invalidate_lazy_fragments",
+    "invalidate_lazy_fragments_on_change",
     # Mixins
     "AdminChangeListViewDetail",
     "AdminDetailMixin",
+    "AsyncAdminDetailMixin",
+    "AsyncLazyFragmentBatchView",
+    "AsyncLazyFragmentView",
+    "LazyFragmentBatchView",
+    "LazyFragmentMoreView",
     "LazyFragmentView",
+    "PanelExportView",
     # Template helpers
+    "DeferredPanel",
     "LazyFragment",
+    "admin_action_btn",
     "col",
     "detail",
     "details_table_for",
     "dropdown_divider",
     "dropdown_header",
     "dropdown_item",
+    "lazy_panel",
     "menu_item",
     "table_for",
     "top_menu_btn",
     # URL helpers
+    "admin_actions_for",
+    "admin_export_path_for",
     "admin_filtered_list_path_for",
+    "admin_has_action",
+    "admin_lazy_batch_path_for",
+    "admin_lazy_more_path_for",
     "admin_lazy_path_for",
     "admin_path_for",
     "admin_path_name",
@@ -0,0 +1,112 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from .defaults import PANEL_WORKERS
+from .instrumentation import record_thread_queries
+from .template_helpers import DeferredPanel
+
+
+def run_instrumented(func, *args, **kwargs):
+    """Call func, recording its queries into the request's timings when instrumenting."""
+    with record_thread_queries():
+        return func(*args, **kwargs)
+
+
+async def run_in_sync_thread(func, *args, **kwargs):
+    """Await func(*args, **kwargs) run on the request's sync thread, like any sync view code."""
+    return await sync_to_async(run_instrumented)(func, *args, **kwargs)
+
+
+def run_in_worker(func, *args, **kwargs):
+    """
+    Call func on a worker thread, which has its own DB connection.
+
+    The connection is closed afterwards if it is unusable or older than CONN_MAX_AGE,
+    as Django does at the end of a request, so worker threads don't leak connections.
+    Worker queries run outside the request's transaction.
+    """
+    close_old_connections()
+    try:
+        return run_instrumented(func, *args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def gather_in_workers(calls):
+    """
+    Run the zero-argument callables in calls concurrently on worker threads, at most
+    DJADMIN_PANEL_WORKERS at a time, returning their results in the same order.
+
+    Contextvars (e.g. the lazy panel being rendered) are copied into each call.
+    """
+    semaphore = asyncio.Semaphore(PANEL_WORKERS)
+    run = sync_to_async(run_in_worker, thread_sensitive=False)
+
+    async def bounded(call):
+        async with semaphore:
+            return await run(call)
+
+    return await asyncio.gather(*[bounded(call) for call in calls])
+
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def worker_pool():
+    """The process-wide pool of DJADMIN_PANEL_WORKERS threads sync views build panels on."""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = ThreadPoolExecutor(max_workers=PANEL_WORKERS, thread_name_prefix="djadmin-panel")
+    return _worker_pool
+
+
+def submit_to_workers(func, *args, **kwargs):
+    """Start run_in_worker(func, ...) on the worker pool with a copy of the caller's contextvars; return its Future."""
+    context = contextvars.copy_context()
+    return worker_pool().submit(context.run, run_in_worker, func, *args, **kwargs)
+
+
+def map_in_workers(calls):
+    """Sync counterpart of gather_in_workers: run calls on the worker pool, results in order."""
+    futures = [submit_to_workers(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def deferred_columns(layout):
+    """Yield the layout's {"col": DeferredPanel} items, in layout order."""
+    for item in layout or ():
+        if isinstance(item, list):
+            yield from deferred_columns(item)
+        elif isinstance(item, dict):
+            if item.get("row"):
+                yield from deferred_columns(item["row"])
+            elif isinstance(item.get("col"), DeferredPanel):
+                yield item
+            elif isinstance(item.get("col"), list):
+                yield from deferred_columns(item["col"])
+
+
+async def aresolve_deferred_panels(layout):
+    """Build the layout's DeferredPanels concurrently and put each panel in its column."""
+    items = list(deferred_columns(layout))
+    panels = await gather_in_workers([item["col"].resolve for item in items])
+
+    for item, panel in zip(items, panels):
+        item["col"] = panel
+
+
+def submit_deferred_panels(layout):
+    """
+    Start building the layout's DeferredPanels on the worker pool. Each column becomes a
+    DeferredPanel waiting for its result, so rendering (or streaming) still goes through
+    the layout in order while the panels are built in parallel.
+    """
+    for item in deferred_columns(layout):
+        item["col"] = DeferredPanel(submit_to_workers(item["col"].resolve).result)
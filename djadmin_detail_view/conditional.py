@@ -0,0 +1,55 @@
+import hashlib
+from datetime import timezone as dt_timezone
+
+from django.utils import timezone
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def validators_for(etag_value=None, last_modified=None):
+    """
+    Turn declared validator values into (ETag header value, Last-Modified timestamp).
+
+    etag_value may be anything with a stable str(), e.g. a tuple of updated_at values;
+    it is hashed into a quoted ETag. last_modified is a datetime.
+    """
+    etag = None
+    if etag_value is not None:
+        etag = quote_etag(hashlib.md5(str(etag_value).encode(), usedforsecurity=False).hexdigest())
+
+    timestamp = None
+    if last_modified is not None:
+        if timezone.is_naive(last_modified):
+            last_modified = timezone.make_aware(last_modified, dt_timezone.utc)
+        timestamp = int(last_modified.timestamp())
+
+    return etag, timestamp
+
+
+def not_modified_response(request, etag, last_modified):
+    """A 304 (or 412) response when the request's conditions match, else None."""
+    if etag is None and last_modified is None:
+        return None
+
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def patch_validator_headers(response, etag, last_modified):
+    """
+    Set ETag/Last-Modified on response.
+
+    Responses with validators may be stored by the browser but must be revalidated on
+    every use (private, no-cache); responses without are never cached, like the admin's
+    own views.
+    """
+    if etag is None and last_modified is None:
+        add_never_cache_headers(response)
+        return response
+
+    if etag is not None and not response.has_header("ETag"):
+        response.headers["ETag"] = etag
+    if last_modified is not None and not response.has_header("Last-Modified"):
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -3,3 +3,27 @@ from django.conf import settings
 TEMPLATE_TIME_FORMAT = getattr(settings, "DJADMIN_TEMPLATE_TIME_FORMAT", "d M Y, P O")
 EXCLUDE_BOOTSTRAP_TAGS = getattr(settings, "DJADMIN_EXCLUDE_BOOTSTRAP_TAGS", False)
 LAZY_LOADING_ENABLED = getattr(settings, "DJADMIN_LAZY_LOADING_ENABLED", True)
+
+# How table_for counts obj_set: "exact", "capped", "estimated", "has_more" or "none"
+COUNT_STRATEGY = getattr(settings, "DJADMIN_COUNT_STRATEGY", "exact")
+# Dotted path to a callable(queryset) -> int | None used by the "estimated" count strategy
+COUNT_ESTIMATOR = getattr(settings, "DJADMIN_COUNT_ESTIMATOR", "djadmin_detail_view.query_helpers.estimate_count")
+
+# Cache alias storing lazy panel HTML for table_for/details_table_for(lazy_cache_ttl=...)
+LAZY_CACHE_ALIAS = getattr(settings, "DJADMIN_LAZY_CACHE_ALIAS", "default")
+
+# Per-panel query/time instrumentation (Server-Timing header, "djadmin_detail_view.performance" log)
+INSTRUMENTATION_ENABLED = getattr(settings, "DJADMIN_INSTRUMENTATION_ENABLED", False)
+# Dotted path to a callable(request, report) receiving each instrumented request's report
+INSTRUMENTATION_HOOK = getattr(settings, "DJADMIN_INSTRUMENTATION_HOOK", None)
+
+# Render non-lazy object_list/object_details panels with djadmin_detail_view.renderers
+# instead of the template markup (same HTML; overridden templates are unaffected)
+NATIVE_RENDERER = getattr(settings, "DJADMIN_NATIVE_RENDERER", False)
+
+# Most panels built at once by AsyncAdminDetailMixin, or by parallel_panels sync views (one shared
+# thread pool per process), each on its own thread and DB connection
+PANEL_WORKERS = getattr(settings, "DJADMIN_PANEL_WORKERS", 4)
+
+# Rows fetched per query while table_for(exportable=True) panels are downloaded as CSV/XLSX
+EXPORT_CHUNK_SIZE = getattr(settings, "DJADMIN_EXPORT_CHUNK_SIZE", 2000)
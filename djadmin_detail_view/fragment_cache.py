@@ -0,0 +1,92 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+
+from djadmin_detail_view.defaults import LAZY_CACHE_ALIAS
+
+KEY_PREFIX = "djadmin_detail_view:lazy"
+
+
+def lazy_fragment_cache_key(obj, fragment_key, extra=None):
+    """
+    Cache key of obj's lazy panel fragment_key.
+
+    Includes obj's current version token, so invalidate_lazy_fragments(obj) retires
+    every cached panel of obj at once. `extra` (table_for's lazy_cache_key) varies the
+    key further, e.g. per user when the panel's content depends on permissions.
+    """
+    cache_key = f"{KEY_PREFIX}:{_object_label(obj)}:{fragment_key}:{_version_for(obj)}"
+    if extra is not None:
+        cache_key += ":" + hashlib.md5(str(extra).encode(), usedforsecurity=False).hexdigest()
+    return cache_key
+
+
+def get_cached_fragment(cache_key):
+    return _cache().get(cache_key)
+
+
+def cache_fragment(cache_key, html, ttl):
+    _cache().set(cache_key, html, ttl)
+
+
+def invalidate_lazy_fragments(obj):
+    """Retire every cached lazy panel of obj by moving it to a new version token."""
+    _cache().set(_version_key(obj), _new_version(), None)
+
+
+def invalidate_lazy_fragments_on_change(model, get_objects=None):
+    """
+    Invalidate cached lazy panels whenever an instance of model is saved or deleted.
+
+    get_objects(instance) returns the detail page object(s) showing the instance, e.g.
+    `lambda contact: contact.company` for a company page listing contacts. Defaults to
+    the instance itself. Call from AppConfig.ready().
+    """
+
+    def handler(sender, instance, **kwargs):
+        objs = get_objects(instance) if get_objects else instance
+        if isinstance(objs, Model) or objs is None:
+            objs = [objs]
+
+        for obj in objs:
+            if obj is not None:
+                invalidate_lazy_fragments(obj)
+
+    dispatch_uid = f"{KEY_PREFIX}:{model._meta.label_lower}:{id(get_objects)}"
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(handler, sender=model, weak=False, dispatch_uid=dispatch_uid)
+
+    return handler
+
+
+def _cache():
+    return caches[LAZY_CACHE_ALIAS]
+
+
+def _object_label(obj):
+    return f"{obj._meta.label_lower}:{obj.pk}"
+
+
+def _version_key(obj):
+    return f"{KEY_PREFIX}:version:{_object_label(obj)}"
+
+
+def _version_for(obj):
+    version_key = _version_key(obj)
+    cache = _cache()
+
+    version = cache.get(version_key)
+    if version is None:
+        # A fresh token rather than a counter: if the version entry is evicted, panels
+        # cached under the old token must not become reachable again
+        cache.add(version_key, _new_version(), None)
+        version = cache.get(version_key)
+
+    return version
+
+
+def _new_version():
+    return time.time_ns()
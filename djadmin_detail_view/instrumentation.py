@@ -0,0 +1,275 @@
+import contextvars
+import functools
+import logging
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+
+from django.db import connections
+from django.utils.module_loading import import_string
+from django.utils.text import slugify
+
+from djadmin_detail_view.defaults import INSTRUMENTATION_ENABLED, INSTRUMENTATION_HOOK
+
+logger = logging.getLogger("djadmin_detail_view.performance")
+
+# Bucket for queries run outside any panel (object lookup, admin context, ...)
+OTHER = "other"
+
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+_current_panel = contextvars.ContextVar("current_panel", default=None)
+_query_recorder = contextvars.ContextVar("query_recorder", default=None)
+
+
+@dataclass
+class PanelTimings:
+    """Numbers for one panel. Times are in seconds."""
+
+    name: str
+    queries: int = 0
+    db_time: float = 0.0
+    fill_time: float = 0.0
+    render_time: float = 0.0
+    build_time: float = 0.0
+    sql: list = field(default_factory=list)
+
+
+@dataclass
+class RequestTimings:
+    """Numbers for one instrumented request. Times are in seconds."""
+
+    view: str
+    path: str
+    panels: dict = field(default_factory=dict)
+    render_time: float = 0.0
+    total_time: float = 0.0
+
+    def panel(self, name):
+        panel = self.panels.get(name)
+        if panel is None:
+            panel = self.panels[name] = PanelTimings(name)
+        return panel
+
+    @property
+    def queries(self):
+        return sum(panel.queries for panel in self.panels.values())
+
+    @property
+    def db_time(self):
+        return sum(panel.db_time for panel in self.panels.values())
+
+    def as_dict(self):
+        return {
+            "view": self.view,
+            "path": self.path,
+            "queries": self.queries,
+            "db_time": self.db_time,
+            "render_time": self.render_time,
+            "total_time": self.total_time,
+            "panels": [asdict(panel) for panel in self.panels.values()],
+        }
+
+    def server_timing(self):
+        """Server-Timing header value: one entry per panel plus db, render and total."""
+        entries = []
+        for panel in self.panels.values():
+            description = _quote(
+                f"{panel.name}: {panel.queries} queries, db {_ms(panel.db_time)}ms, "
+                f"fill {_ms(panel.fill_time)}ms, render {_ms(panel.render_time)}ms"
+            )
+            duration = panel.build_time + panel.render_time if panel.name != OTHER else panel.db_time
+            entries.append(f"panel-{slugify(panel.name) or 'panel'};dur={_ms(duration)};desc={description}")
+
+        entries.append(f"db;dur={_ms(self.db_time)};desc={_quote(f'{self.queries} queries')}")
+        entries.append(f"render;dur={_ms(self.render_time)}")
+        entries.append(f"total;dur={_ms(self.total_time)}")
+
+        return ", ".join(entries)
+
+
+@contextmanager
+def instrument_request(request, view_name):
+    """
+    Collect per-panel timings for the code in the with block.
+
+    Yields the RequestTimings being filled, or None when DJADMIN_INSTRUMENTATION_ENABLED
+    is off; panel helpers then only pay one context variable lookup. When the block
+    completes, the report is logged to "djadmin_detail_view.performance" and passed to
+    DJADMIN_INSTRUMENTATION_HOOK.
+    """
+    if not INSTRUMENTATION_ENABLED:
+        yield None
+        return
+
+    with collect_timings(view_name, request.path) as timings:
+        yield timings
+
+    _report(request, timings)
+
+
+@contextmanager
+def collect_timings(view_name="", path="", capture_sql=False):
+    """
+    Attribute the with block's queries and time to the panels built in it, regardless of
+    DJADMIN_INSTRUMENTATION_ENABLED. Yields the RequestTimings being filled; with
+    capture_sql, each panel also keeps the SQL of its queries.
+    """
+    timings = RequestTimings(view=view_name, path=path)
+    recorder = _QueryRecorder(timings, capture_sql)
+    token = _request_timings.set(timings)
+    recorder_token = _query_recorder.set(recorder)
+    started = perf_counter()
+    try:
+        with _recording_queries(recorder):
+            yield timings
+    finally:
+        timings.total_time = perf_counter() - started
+        _query_recorder.reset(recorder_token)
+        _request_timings.reset(token)
+
+
+@contextmanager
+def record_thread_queries():
+    """
+    Record the with block's queries into the timings being collected, for work that
+    collect_timings()/instrument_request() hand to another thread. Database connections
+    are per thread, so that thread's queries are otherwise missed. The timings reach the
+    thread through its copied contextvars; without them this does nothing.
+    """
+    recorder = _query_recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    with _recording_queries(recorder):
+        yield
+
+
+@contextmanager
+def _recording_queries(recorder):
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield
+
+
+def current_request_timings():
+    """RequestTimings of the request being instrumented, or None."""
+    return _request_timings.get()
+
+
+def instrumented_panel(func):
+    """Decorator attributing a panel helper's queries and time to its lazy_load_key or panel_name."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timings = _request_timings.get()
+        if timings is None:
+            return func(*args, **kwargs)
+
+        name = kwargs.get("lazy_load_key") or kwargs.get("panel_name") or func.__name__
+        token = _current_panel.set(name)
+        started = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _current_panel.reset(token)
+
+        # LazyFragment placeholders cost nothing worth reporting
+        if isinstance(result, dict):
+            timings.panel(name).build_time += perf_counter() - started
+
+        return result
+
+    return wrapper
+
+
+def start_fill_timer():
+    """FillTimer for the panel being built, or None when not instrumenting."""
+    timings = _request_timings.get()
+    if timings is None:
+        return None
+
+    name = _current_panel.get()
+    if name is None:
+        return None
+
+    return FillTimer(timings.panel(name))
+
+
+class FillTimer:
+    """Times a panel's fill_missing_values work, excluding the queries run meanwhile."""
+
+    __slots__ = ("panel", "started", "db_time")
+
+    def __init__(self, panel):
+        self.panel = panel
+        self.db_time = panel.db_time
+        self.started = perf_counter()
+
+    def stop(self):
+        elapsed = perf_counter() - self.started
+        self.panel.fill_time += elapsed - (self.panel.db_time - self.db_time)
+
+
+@contextmanager
+def measure_render(timings, panel_name=None):
+    """Add the with block's time to panel_name's render time, or the page's when None."""
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - started
+        if panel_name is None:
+            timings.render_time += elapsed
+        else:
+            timings.panel(panel_name).render_time += elapsed
+
+
+class _QueryRecorder:
+    def __init__(self, timings, capture_sql=False):
+        self.timings = timings
+        self.capture_sql = capture_sql
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            panel = self.timings.panel(_current_panel.get() or OTHER)
+            panel.queries += 1
+            panel.db_time += perf_counter() - started
+            if self.capture_sql:
+                panel.sql.append(sql)
+
+
+def _report(request, timings):
+    report = timings.as_dict()
+    logger.info(
+        "%s %s: %d queries, %sms db, %sms render, %sms total",
+        timings.view,
+        timings.path,
+        timings.queries,
+        _ms(timings.db_time),
+        _ms(timings.render_time),
+        _ms(timings.total_time),
+        extra={"djadmin_timings": report},
+    )
+
+    hook = _hook()
+    if hook is not None:
+        hook(request, report)
+
+
+def _hook():
+    if not INSTRUMENTATION_HOOK:
+        return None
+    return import_string(INSTRUMENTATION_HOOK)
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.1f}"
+
+
+def _quote(text):
+    return '"' + text.replace("\\", "").replace('"', "") + '"'
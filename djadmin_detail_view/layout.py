@@ -0,0 +1,219 @@
+from django.template import Context
+from django.template.base import render_value_in_context
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from .instrumentation import current_request_timings, measure_render
+from .template_helpers import DeferredPanel, LazyFragment
+
+# Node kinds of a flattened layout. Opening nodes are closed by a CLOSE node.
+ROW = "row"  # <div class="row">
+COL = "col"  # <div class="col">
+CLOSE = "close"  # </div>
+HEADER = "header"
+DETAILS = "details"  # details_table_for() result or its LazyFragment
+TABLE = "table"  # table_for() result or its LazyFragment
+BLANK = "blank"  # "col": None
+PARTIAL = "partial"
+PREVIEW_FILE = "preview_file"
+VALUE = "value"  # anything else, printed like {{ item.col }}
+DEFERRED = "deferred"  # DeferredPanel, built when rendered
+
+# Nodes whose rendering may take a while; streamed pages flush before each
+_PANEL_KINDS = frozenset([DETAILS, TABLE, PARTIAL, DEFERRED])
+
+OBJECT_DETAILS_TEMPLATE = "admin/djadmin_components/object_details.html"
+OBJECT_LIST_TEMPLATE = "admin/djadmin_components/object_list.html"
+PREVIEW_FILE_TEMPLATE = "admin/djadmin_components/preview_file.html"
+
+
+class LayoutNode:
+    """One step of a flattened layout: kind, the value it renders and its layout item."""
+
+    __slots__ = ("kind", "value", "item")
+
+    def __init__(self, kind, value=None, item=None):
+        self.kind = kind
+        self.value = value
+        self.item = item
+
+    def __repr__(self):
+        return f"LayoutNode({self.kind!r}, {self.value!r})"
+
+
+def flatten_layout(layout):
+    """
+    Normalize a get_context_data() layout into a flat list of LayoutNodes.
+
+    Walks rows, nested lists, headers and columns the way _auto_row_col.html and
+    _auto_col.html do, classifying every column once so render_layout_nodes() needs no
+    per-item checks or nested includes.
+    """
+    nodes = []
+    for item in layout or ():
+        _flatten_item(item, nodes)
+    return nodes
+
+
+def _get(item, key):
+    if isinstance(item, dict):
+        return item.get(key)
+    return getattr(item, key, None)
+
+
+def _flatten_item(item, nodes):
+    row = _get(item, "row")
+    if row:
+        nodes.append(LayoutNode(ROW))
+        for sub_item in row:
+            _flatten_item(sub_item, nodes)
+        nodes.append(LayoutNode(CLOSE))
+    elif isinstance(item, list):
+        for sub_item in item:
+            _flatten_item(sub_item, nodes)
+    elif _get(item, "header"):
+        nodes.append(LayoutNode(HEADER, _get(item, "header")))
+    elif item:
+        nodes.append(LayoutNode(COL))
+        _flatten_col(item, nodes)
+        nodes.append(LayoutNode(CLOSE))
+
+
+def _flatten_col(item, nodes):
+    column = item.get("col", "") if isinstance(item, dict) else getattr(item, "col", "")
+
+    if isinstance(column, DeferredPanel):
+        nodes.append(LayoutNode(DEFERRED, column))
+    elif isinstance(column, LazyFragment):
+        nodes.append(LayoutNode(DETAILS if column.fragment_type == "details" else TABLE, column))
+    elif isinstance(column, list):
+        for sub_item in column:
+            _flatten_item(sub_item, nodes)
+    elif column is None:
+        nodes.append(LayoutNode(BLANK))
+    elif isinstance(column, dict):
+        if "obj" in column:
+            nodes.append(LayoutNode(DETAILS, column))
+        elif "rows" in column:
+            nodes.append(LayoutNode(TABLE, column))
+        elif "partial" in column:
+            nodes.append(LayoutNode(PARTIAL, column, item))
+        elif "preview_file" in column:
+            nodes.append(LayoutNode(PREVIEW_FILE, column["preview_file"]))
+        else:
+            nodes.append(LayoutNode(VALUE, column))
+    else:
+        nodes.append(LayoutNode(VALUE, column))
+
+
+def render_layout_nodes(context, nodes):
+    """Render flattened layout nodes in one pass within context (a template Context)."""
+    return mark_safe("".join(iter_layout_html(context, nodes)))
+
+
+def iter_layout_html(context, nodes):
+    """
+    Yield the HTML of flattened layout nodes in chunks, a new chunk starting before each
+    panel, partial or DeferredPanel, so a streamed page is sent up to the panel being built.
+
+    Panels and partials are rendered with the engine's templates, loaded once per call,
+    in context pushed with the variables the old {% include ... with %} passed.
+    """
+    render_node = _node_renderer(context)
+    chunk = []
+    for node in nodes:
+        if node.kind in _PANEL_KINDS and chunk:
+            yield "".join(chunk)
+            chunk = []
+        chunk.append(render_node(node))
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def _node_renderer(context):
+    templates = {}
+
+    def render_template(template_name, **values):
+        template = templates.get(template_name)
+        if template is None:
+            template = templates[template_name] = context.template.engine.get_template(template_name)
+        with context.push(**values):
+            return template.render(context)
+
+    def render_panel(template_name, panel, helper_name, **values):
+        timings = current_request_timings()
+        # LazyFragment placeholders aren't reported, like in instrumented_panel
+        if timings is None or not isinstance(panel, dict):
+            return render_template(template_name, **values)
+
+        # The name instrumented_panel reported the panel's build under
+        name = panel.get("lazy_key") or panel.get("panel_name") or helper_name
+        with measure_render(timings, name):
+            return render_template(template_name, **values)
+
+    def render_node(node):
+        kind = node.kind
+        if kind is ROW:
+            html = '<div class="row">'
+        elif kind is COL:
+            html = '<div class="col">'
+        elif kind is CLOSE:
+            html = "</div>"
+        elif kind is TABLE:
+            html = render_panel(OBJECT_LIST_TEMPLATE, node.value, "table_for", object_list=node.value)
+        elif kind is DETAILS:
+            html = render_panel(OBJECT_DETAILS_TEMPLATE, node.value, "details_table_for", object_details=node.value)
+        elif kind is DEFERRED:
+            deferred_nodes = []
+            _flatten_col({"col": node.value.resolve()}, deferred_nodes)
+            return "".join([render_node(deferred_node) for deferred_node in deferred_nodes])
+        elif kind is HEADER:
+            html = format_html("<h2>{}</h2>\n<hr />", render_value_in_context(node.value, context))
+        elif kind is BLANK:
+            html = "&nbsp;"
+        elif kind is PARTIAL:
+            html = render_template(node.value["partial"], item=node.item, **node.value.get("with_args", {}))
+        elif kind is PREVIEW_FILE:
+            html = render_template(PREVIEW_FILE_TEMPLATE, file=node.value)
+        else:
+            html = render_value_in_context(node.value, context)
+
+        return html + "\n"
+
+    return render_node
+
+
+class LayoutStream:
+    """
+    The layout of a detail page rendered for streaming (AdminDetailMixin.streaming).
+
+    While the page template renders, {% render_layout %} hands its context and nodes to
+    the LayoutStream found in the context as "layout_stream" and outputs MARKER instead
+    of the layout. The page is then sent as the HTML before the marker, the layout chunk
+    by chunk, and the HTML after it.
+    """
+
+    MARKER = "<!-- djadmin-layout-stream -->"
+
+    def __init__(self):
+        self.context = None
+        self.template = None
+        self.nodes = []
+
+    def capture(self, context, nodes):
+        # The template's context is popped once rendering ends; keep a copy
+        self.context = Context(context.flatten(), autoescape=context.autoescape)
+        self.template = context.template
+        self.nodes = nodes
+        return mark_safe(self.MARKER)
+
+    def iter_html(self, page_html):
+        """Yield page_html with the layout's chunks in place of the marker."""
+        head, marker, tail = page_html.partition(self.MARKER)
+        yield head
+
+        if marker:
+            with self.context.bind_template(self.template):
+                yield from iter_layout_html(self.context, self.nodes)
+            yield tail
@@ -1,12 +1,38 @@
+from functools import partial, update_wrapper
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.contrib import admin
+from django.core import signing
 from django.core.exceptions import ImproperlyConfigured
-from django.http import Http404, HttpResponse
-from django.template.loader import render_to_string
-from django.urls import path
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string, select_template
+from django.urls import path, reverse
+from django.utils.cache import patch_vary_headers
 from django.utils.html import format_html
 from django.views import View
-
-from .url_helpers import admin_lazy_path_for, admin_path_for, admin_path_name
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_protect
+
+from .concurrency import (
+    aresolve_deferred_panels,
+    gather_in_workers,
+    map_in_workers,
+    run_in_sync_thread,
+    submit_deferred_panels,
+)
+from .conditional import not_modified_response, patch_validator_headers, validators_for
+from .exports import export_formats, export_response
+from .fragment_cache import cache_fragment
+from .instrumentation import current_request_timings, instrument_request, measure_render
+from .layout import LayoutStream
+from .query_helpers import InvalidCursorError, decode_keyset_cursor
+from .serializers import PanelEncoder, serialize_panel
+from .url_helpers import (
+    admin_lazy_more_path_for,
+    admin_lazy_path_for,
+    admin_path_for,
+    admin_path_name,
+)
 
 
 class AdminChangeListViewDetail:
@@ -24,6 +50,9 @@ class AdminChangeListViewDetail:
         urls = self._remove_default_detail_redirect(default_urls)
         urls = self._add_default_detail(urls)
         urls = self._add_lazy_fragment_url(urls)
+        urls = self._add_lazy_fragment_batch_url(urls)
+        urls = self._add_lazy_fragment_more_url(urls)
+        urls = self._add_panel_export_url(urls)
 
         return urls
 
@@ -38,9 +67,10 @@ class AdminChangeListViewDetail:
     def _add_default_detail(self, urls):
         detail_view = self.get_default_detail_view()
 
+        # cacheable: the view sets its own cache headers, revalidating when it declares validators
         detail_path = path(
             f"<{detail_view.pk_url_kwarg}>/",
-            self.admin_site.admin_view(detail_view.as_view(admin_obj=self)),
+            self._admin_view(detail_view.as_view(admin_obj=self), cacheable=True),
             name=admin_path_name(detail_view.model, "detail"),
         )
 
@@ -49,19 +79,79 @@ class AdminChangeListViewDetail:
     def _add_lazy_fragment_url(self, urls):
         detail_view = self.get_default_detail_view()
 
+        lazy_view_class = AsyncLazyFragmentView if detail_view.view_is_async else LazyFragmentView
+
         lazy_path = path(
             f"<{detail_view.pk_url_kwarg}>/lazy/<str:fragment_key>/",
-            self.admin_site.admin_view(
-                LazyFragmentView.as_view(
+            self._admin_view(
+                lazy_view_class.as_view(
                     admin_obj=self,
                     detail_view_class=detail_view,
-                )
+                ),
+                cacheable=True,
             ),
             name=admin_path_name(detail_view.model, "lazy_fragment"),
         )
 
         return urls + [lazy_path]
 
+    def _add_lazy_fragment_batch_url(self, urls):
+        detail_view = self.get_default_detail_view()
+
+        batch_view_class = AsyncLazyFragmentBatchView if detail_view.view_is_async else LazyFragmentBatchView
+
+        lazy_batch_path = path(
+            f"<{detail_view.pk_url_kwarg}>/lazy/",
+            self._admin_view(
+                batch_view_class.as_view(
+                    admin_obj=self,
+                    detail_view_class=detail_view,
+                )
+            ),
+            name=admin_path_name(detail_view.model, "lazy_fragment_batch"),
+        )
+
+        return urls + [lazy_batch_path]
+
+    def _add_lazy_fragment_more_url(self, urls):
+        detail_view = self.get_default_detail_view()
+
+        lazy_more_path = path(
+            f"<{detail_view.pk_url_kwarg}>/lazy/<str:fragment_key>/more/",
+            self.admin_site.admin_view(
+                LazyFragmentMoreView.as_view(
+                    admin_obj=self,
+                    detail_view_class=detail_view,
+                )
+            ),
+            name=admin_path_name(detail_view.model, "lazy_fragment_more"),
+        )
+
+        return urls + [lazy_more_path]
+
+    def _add_panel_export_url(self, urls):
+        detail_view = self.get_default_detail_view()
+
+        export_path = path(
+            f"<{detail_view.pk_url_kwarg}>/export/<str:fragment_key>/",
+            self.admin_site.admin_view(
+                PanelExportView.as_view(
+                    admin_obj=self,
+                    detail_view_class=detail_view,
+                )
+            ),
+            name=admin_path_name(detail_view.model, "panel_export"),
+        )
+
+        return urls + [export_path]
+
+    def _admin_view(self, view, cacheable=False):
+        """admin_site.admin_view(view), awaiting the view when it is async."""
+        if iscoroutinefunction(view):
+            return _async_admin_view(self.admin_site, view, cacheable)
+
+        return self.admin_site.admin_view(view, cacheable)
+
     def get_list_display(self, request):
         list_display = super().get_list_display(request)
 
@@ -80,15 +170,148 @@ class AdminChangeListViewDetail:
         return format_html('<a href="{}">View</a>', url)
 
 
+def _async_admin_view(admin_site, view, cacheable=False):
+    """AdminSite.admin_view() for async views; Django's wrapper is sync and can't await them."""
+
+    async def inner(request, *args, **kwargs):
+        if not await sync_to_async(admin_site.has_permission)(request):
+            return await sync_to_async(_admin_login_redirect)(admin_site, request)
+        return await view(request, *args, **kwargs)
+
+    if not cacheable:
+        inner = never_cache(inner)
+    if not getattr(view, "csrf_exempt", False):
+        inner = csrf_protect(inner)
+    return update_wrapper(inner, view)
+
+
+def _admin_login_redirect(admin_site, request):
+    # Same responses as AdminSite.admin_view() gives users without admin access
+    from django.contrib.auth.views import redirect_to_login
+
+    if request.path == reverse("admin:logout", current_app=admin_site.name):
+        return HttpResponseRedirect(reverse("admin:index", current_app=admin_site.name))
+
+    return redirect_to_login(request.get_full_path(), reverse("admin:login", current_app=admin_site.name))
+
+
 class AdminDetailMixin:
     template_name = "admin/djadmin_components/auto_layout_detail.html"
     admin_obj = None
+    # Send the page up to its layout right away, then the layout panel by panel
+    streaming = False
+    # Build the layout's DeferredPanels in parallel on the worker pool (sync views)
+    parallel_panels = False
 
     def get(self, request, *args, **kwargs):
         self._validate_admin_obj()
+
+        with instrument_request(request, type(self).__name__) as timings:
+            etag, last_modified, response = self._get_object_and_validators(request)
+            if response is None:
+                context = self.get_context_data(request, *args, object=self.object, **kwargs)
+                if self.parallel_panels:
+                    submit_deferred_panels(context.get("layout"))
+
+                response = self._render_page(context, timings)
+
+        return self._finish_response(response, timings, etag, last_modified)
+
+    def _get_object_and_validators(self, request):
+        """Set self.object; return its (etag, last_modified) and a 304 response or None."""
         self.object = self.get_object()
-        context = self.get_context_data(request, *args, object=self.object, **kwargs)
-        return self.render_to_response(context)
+
+        etag, last_modified = validators_for(self.get_etag(), self.get_last_modified())
+        return etag, last_modified, not_modified_response(request, etag, last_modified)
+
+    def _render_page(self, context, timings):
+        if self.streaming:
+            return self.render_to_streaming_response(context)
+
+        response = self.render_to_response(context)
+        if timings is not None:
+            # Render now, so the template time is part of the report
+            with measure_render(timings):
+                response.render()
+
+        return response
+
+    def _finish_response(self, response, timings, etag, last_modified):
+        if timings is not None:
+            response.headers["Server-Timing"] = timings.server_timing()
+
+        return patch_validator_headers(response, etag, last_modified)
+
+    def render_to_streaming_response(self, context):
+        """
+        StreamingHttpResponse of the page: everything but the layout is rendered now and
+        sent first, then the layout follows in chunks, each panel (and DeferredPanel)
+        built and rendered as the stream reaches it.
+
+        The streamed part is instrumented separately, as "<view>.stream"; its timings
+        are logged but can't be sent in a Server-Timing header.
+        """
+        layout_stream = LayoutStream()
+        template = select_template(self.get_template_names(), using=self.template_engine)
+        page_html = template.render(context | {"layout_stream": layout_stream}, self.request)
+
+        return StreamingHttpResponse(self.stream_html(layout_stream, page_html), content_type=self.content_type)
+
+    def stream_html(self, layout_stream, page_html):
+        """Iterator over the streamed page's chunks."""
+        with instrument_request(self.request, f"{type(self).__name__}.stream"):
+            yield from layout_stream.iter_html(page_html)
+
+    def get_etag(self):
+        """
+        Cheap validator of the page's content, e.g. `(self.object.updated_at, latest_child_updated_at)`.
+
+        When this or get_last_modified() returns a value, conditional GETs are answered
+        with 304 Not Modified before get_context_data() runs. Lazy panels are validated
+        separately, see @lazy_panel(etag=..., last_modified=...).
+        """
+        return None
+
+    def get_last_modified(self):
+        """Datetime the page's content last changed, e.g. self.object.updated_at. See get_etag()."""
+        return None
+
+    def get_lazy_panel_etag(self, lazy_load_key):
+        """Validator of the lazy panel lazy_load_key, from @lazy_panel(etag=...)."""
+        return self._call_lazy_panel_validator(lazy_load_key, "lazy_panel_etag")
+
+    def get_lazy_panel_last_modified(self, lazy_load_key):
+        """Last change of the lazy panel lazy_load_key, from @lazy_panel(last_modified=...)."""
+        return self._call_lazy_panel_validator(lazy_load_key, "lazy_panel_last_modified")
+
+    def _call_lazy_panel_validator(self, lazy_load_key, attr):
+        builder = self.get_lazy_panel_builder(lazy_load_key)
+        validator = getattr(builder, attr, None)
+        if validator is None:
+            return None
+
+        return validator(self)
+
+    @classmethod
+    def get_lazy_panel_methods(cls):
+        """Map lazy_load_key -> method name for methods decorated with @lazy_panel."""
+        if "_lazy_panel_methods" not in cls.__dict__:
+            methods = {}
+            for name in dir(cls):
+                lazy_load_key = getattr(getattr(cls, name, None), "lazy_panel_key", None)
+                if lazy_load_key:
+                    methods[lazy_load_key] = name
+            cls._lazy_panel_methods = methods
+
+        return cls._lazy_panel_methods
+
+    def get_lazy_panel_builder(self, lazy_load_key):
+        """Return the bound @lazy_panel method building lazy_load_key, or None."""
+        method_name = self.get_lazy_panel_methods().get(lazy_load_key)
+        if method_name is None:
+            return None
+
+        return getattr(self, method_name)
 
     def _validate_admin_obj(self):
         if self.admin_obj is None:
@@ -120,6 +343,52 @@ class AdminDetailMixin:
         return context | admin_base_context
 
 
+class AsyncAdminDetailMixin(AdminDetailMixin):
+    """
+    AdminDetailMixin with an async get() for ASGI deployments.
+
+    get_context_data() runs on the request's sync thread as usual, but the layout's
+    DeferredPanel columns are then built concurrently, each on a worker thread with its
+    own DB connection (at most DJADMIN_PANEL_WORKERS at a time). The slowest panel, not
+    the sum of all panels, sets the page's latency. Wrap only panels that don't depend
+    on each other or on the request's transaction.
+
+    With streaming, the DeferredPanels are started on the worker pool instead and the
+    page is streamed by an async iterator, each chunk rendered on the sync thread, so
+    ASGI servers send the chunks as they come rather than buffering a sync iterator.
+
+    AdminChangeListViewDetail registers async detail views with an async admin_view,
+    and their lazy panels with AsyncLazyFragmentView/AsyncLazyFragmentBatchView.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self._validate_admin_obj()
+
+        with instrument_request(request, type(self).__name__) as timings:
+            etag, last_modified, response = await run_in_sync_thread(self._get_object_and_validators, request)
+            if response is None:
+                context = await run_in_sync_thread(self.get_context_data, request, *args, object=self.object, **kwargs)
+                if self.streaming:
+                    # The stream waits on each panel when it reaches it; the page head goes out first
+                    submit_deferred_panels(context.get("layout"))
+                else:
+                    await aresolve_deferred_panels(context.get("layout"))
+
+                response = await run_in_sync_thread(self._render_page, context, timings)
+                if not self.streaming:
+                    # Templates may still run queries, so render on the sync thread too
+                    await run_in_sync_thread(response.render)
+
+        return self._finish_response(response, timings, etag, last_modified)
+
+    async def stream_html(self, layout_stream, page_html):
+        chunks = layout_stream.iter_html(page_html)
+        with instrument_request(self.request, f"{type(self).__name__}.stream"):
+            # Chunks render templates and run queries, so pull each one on the sync thread
+            while (chunk := await run_in_sync_thread(next, chunks, None)) is not None:
+                yield chunk
+
+
 class LazyFragmentView(View):
     """
     View that renders lazy-loaded fragments for admin detail pages.
@@ -129,17 +398,79 @@ class LazyFragmentView(View):
 
     When a lazy panel is requested, this view:
     1. Sets a context variable to signal which panel should render content
-    2. Re-runs get_context_data() on the DetailView
+    2. Calls the panel's @lazy_panel builder if the DetailView declares one,
+       otherwise re-runs get_context_data() on the DetailView
     3. Finds the matching panel (now with actual content) in the layout
     4. Returns the rendered HTML
+
+    Panels declaring validators with @lazy_panel(etag=..., last_modified=...) answer
+    conditional GETs with 304 Not Modified before any of this happens.
+
+    With `?format=json` or `Accept: application/json`, the panel's columns and
+    formatted rows are returned as JSON (see serializers) instead of its HTML.
     """
 
     admin_obj = None
     detail_view_class = None
 
     def get(self, request, pk, fragment_key):
-        from .template_helpers import _rendering_lazy_panel
+        as_json = self._wants_json(request)
+
+        with instrument_request(request, type(self).__name__) as timings:
+            detail_view = self._build_detail_view(request, pk)
+
+            etag_value = detail_view.get_lazy_panel_etag(fragment_key)
+            if as_json and etag_value is not None:
+                etag_value = (etag_value, "json")
+
+            etag, last_modified = validators_for(
+                etag_value,
+                detail_view.get_lazy_panel_last_modified(fragment_key),
+            )
+            response = not_modified_response(request, etag, last_modified)
+            if response is None:
+                fragment_data = self._resolve_fragment(detail_view, fragment_key, as_json)
+                if fragment_data is None:
+                    raise Http404(f"Panel with key '{fragment_key}' not found in layout or context")
+
+                if as_json:
+                    response = self._render_fragment_json(fragment_data)
+                else:
+                    response = HttpResponse(self._render_fragment(fragment_data, request, detail_view.object))
+
+        if timings is not None:
+            response.headers["Server-Timing"] = timings.server_timing()
+
+        patch_vary_headers(response, ["Accept"])
+        return patch_validator_headers(response, etag, last_modified)
 
+    def _wants_json(self, request):
+        if "format" in request.GET:
+            return request.GET["format"] == "json"
+
+        accepted = [media_type.split(";")[0].strip() for media_type in request.headers.get("Accept", "").split(",")]
+        return "application/json" in accepted and "text/html" not in accepted
+
+    def _resolve_fragment(self, detail_view, fragment_key, as_json):
+        from .template_helpers import _skipping_fragment_cache
+
+        token = _skipping_fragment_cache.set(as_json)
+        try:
+            return self._resolve_panels(detail_view, [fragment_key])[fragment_key]
+        finally:
+            _skipping_fragment_cache.reset(token)
+
+    def _render_fragment_json(self, fragment_data):
+        timings = current_request_timings()
+        if timings is None:
+            data = serialize_panel(fragment_data)
+        else:
+            with measure_render(timings, fragment_data.get("lazy_key")):
+                data = serialize_panel(fragment_data)
+
+        return JsonResponse(data, encoder=PanelEncoder)
+
+    def _build_detail_view(self, request, pk):
         # Reconstruct the detail view
         detail_view = self.detail_view_class()
         detail_view.admin_obj = self.admin_obj
@@ -152,15 +483,63 @@ class LazyFragmentView(View):
         except Exception:
             raise Http404(f"Object with pk={pk} not found")
 
-        # Set context variable to tell table_for/details_table_for to render
-        # actual content for this specific panel instead of LazyFragment
-        token = _rendering_lazy_panel.set(fragment_key)
+        return detail_view
+
+    def _resolve_panels(self, detail_view, fragment_keys):
+        """
+        Build the panels for fragment_keys, returning {fragment_key: panel data or None}.
+
+        Panels with a @lazy_panel builder are built on their own. The rest share a single
+        get_context_data() run.
+        """
+        from .template_helpers import _rendering_lazy_object
+
+        token = _rendering_lazy_object.set(detail_view.object)
+        try:
+            return self._build_panels(detail_view, fragment_keys)
+        finally:
+            _rendering_lazy_object.reset(token)
+
+    def _build_panels(self, detail_view, fragment_keys):
+        panels = dict.fromkeys(fragment_keys)
+        remaining_keys = []
+
+        for fragment_key in fragment_keys:
+            builder = detail_view.get_lazy_panel_builder(fragment_key)
+            if builder is None:
+                remaining_keys.append(fragment_key)
+                continue
+
+            panel = self._call_with_rendering(fragment_key, builder)
+            panels[fragment_key] = panel if self._is_matching_panel(panel, fragment_key) else None
+
+        if remaining_keys:
+            rendering = remaining_keys[0] if len(remaining_keys) == 1 else frozenset(remaining_keys)
+            context = self._call_with_rendering(
+                rendering,
+                detail_view.get_context_data,
+                detail_view.request,
+                object=detail_view.object,
+            )
+            for fragment_key in remaining_keys:
+                panels[fragment_key] = self._find_panel(context, fragment_key)
+
+        return panels
+
+    def _call_with_rendering(self, rendering, func, *args, **kwargs):
+        """
+        Call func with `rendering` (a lazy_key or a frozenset of them) set, so the
+        matching panels return actual content instead of LazyFragment.
+        """
+        from .template_helpers import _rendering_lazy_panel
+
+        token = _rendering_lazy_panel.set(rendering)
         try:
-            # Re-run get_context_data - the matching panel will now return content
-            context = detail_view.get_context_data(request, object=detail_view.object)
+            return func(*args, **kwargs)
         finally:
             _rendering_lazy_panel.reset(token)
 
+    def _find_panel(self, context, fragment_key):
         # Find the matching panel - first in layout, then in context directly
         fragment_data = self._find_panel_in_layout(context.get("layout", []), fragment_key)
 
@@ -168,19 +547,36 @@ class LazyFragmentView(View):
             # Panel might be in context but not in layout (e.g., rendered via partial template)
             fragment_data = self._find_panel_in_context(context, fragment_key)
 
-        if fragment_data is None:
-            raise Http404(f"Panel with key '{fragment_key}' not found in layout or context")
+        return fragment_data
+
+    def _render_fragment(self, fragment_data, request, obj):
+        # Served from the fragment cache (lazy_cache_ttl)
+        if "cached_html" in fragment_data:
+            return fragment_data["cached_html"]
 
+        timings = current_request_timings()
+        if timings is None:
+            html = self._render_fragment_template(fragment_data, request, obj)
+        else:
+            with measure_render(timings, fragment_data.get("lazy_key")):
+                html = self._render_fragment_template(fragment_data, request, obj)
+
+        lazy_cache = fragment_data.get("lazy_cache")
+        if lazy_cache:
+            cache_fragment(lazy_cache["key"], html, lazy_cache["ttl"])
+
+        return html
+
+    def _render_fragment_template(self, fragment_data, request, obj):
         # Determine which template to use based on fragment structure
         if isinstance(fragment_data, dict) and "rows" in fragment_data:
             template = "admin/djadmin_components/object_list.html"
-            render_context = {"object_list": fragment_data}
+            render_context = {"object_list": fragment_data, "object": obj}
         else:
             template = "admin/djadmin_components/object_details.html"
-            render_context = {"object_details": fragment_data}
+            render_context = {"object_details": fragment_data, "object": obj}
 
-        html = render_to_string(template, render_context, request=request)
-        return HttpResponse(html)
+        return render_to_string(template, render_context, request=request)
 
     def _find_panel_in_layout(self, layout, fragment_key):
         """
@@ -242,3 +638,184 @@ class LazyFragmentView(View):
                 if lazy_key and lazy_key == fragment_key:
                     return value
         return None
+
+
+class LazyFragmentBatchView(LazyFragmentView):
+    """
+    View that renders several lazy-loaded fragments in a single request.
+
+    Registered by AdminChangeListViewDetail next to LazyFragmentView. The keys are
+    passed as repeated `key` query parameters (`?key=orders&key=contacts`) and all
+    matching panels without a @lazy_panel builder are built from ONE get_context_data()
+    run, so a page with N lazy panels costs one object lookup and at most one context
+    build instead of N.
+
+    Responds with JSON: {"fragments": {key: html}, "missing": [key, ...]}.
+    """
+
+    def get(self, request, pk):
+        fragment_keys = self._requested_keys(request)
+
+        with instrument_request(request, type(self).__name__) as timings:
+            detail_view = self._build_detail_view(request, pk)
+            if detail_view.parallel_panels:
+                panels = self._merge_panels(
+                    fragment_keys, map_in_workers(self._panel_calls(detail_view, fragment_keys))
+                )
+            else:
+                panels = self._resolve_panels(detail_view, fragment_keys)
+
+            response = self._render_batch(panels, request, detail_view.object)
+
+        if timings is not None:
+            response.headers["Server-Timing"] = timings.server_timing()
+
+        return response
+
+    def _requested_keys(self, request):
+        fragment_keys = list(dict.fromkeys(key for key in request.GET.getlist("key") if key))
+        if not fragment_keys:
+            raise Http404("No fragment keys requested")
+
+        return fragment_keys
+
+    def _panel_calls(self, detail_view, fragment_keys):
+        """
+        Independent calls building fragment_keys' panels: one per @lazy_panel builder and
+        one get_context_data() run shared by the other keys.
+        """
+        builder_keys = [key for key in fragment_keys if detail_view.get_lazy_panel_builder(key)]
+        context_keys = [key for key in fragment_keys if key not in builder_keys]
+        key_groups = [[key] for key in builder_keys] + ([context_keys] if context_keys else [])
+
+        return [partial(self._resolve_panels, detail_view, keys) for keys in key_groups]
+
+    def _merge_panels(self, fragment_keys, results):
+        panels = {}
+        for group_panels in results:
+            panels.update(group_panels)
+
+        return {key: panels[key] for key in fragment_keys}
+
+    def _render_batch(self, panels, request, obj):
+        fragments = {}
+        missing = []
+        for fragment_key, fragment_data in panels.items():
+            if fragment_data is None:
+                missing.append(fragment_key)
+                continue
+
+            fragments[fragment_key] = self._render_fragment(fragment_data, request, obj)
+
+        return JsonResponse({"fragments": fragments, "missing": missing})
+
+
+class AsyncLazyFragmentView(LazyFragmentView):
+    """LazyFragmentView for AsyncAdminDetailMixin detail views."""
+
+    async def get(self, request, pk, fragment_key):
+        # One panel has nothing to build concurrently; run the sync view on the sync thread
+        return await run_in_sync_thread(super().get, request, pk, fragment_key)
+
+
+class AsyncLazyFragmentBatchView(LazyFragmentBatchView):
+    """
+    LazyFragmentBatchView for AsyncAdminDetailMixin detail views.
+
+    Each requested @lazy_panel builder, and the get_context_data() run shared by the
+    other keys, is built concurrently on its own worker thread (see gather_in_workers).
+    """
+
+    async def get(self, request, pk):
+        fragment_keys = self._requested_keys(request)
+
+        with instrument_request(request, type(self).__name__) as timings:
+            detail_view = await run_in_sync_thread(self._build_detail_view, request, pk)
+            panels = self._merge_panels(
+                fragment_keys, await gather_in_workers(self._panel_calls(detail_view, fragment_keys))
+            )
+            response = await run_in_sync_thread(self._render_batch, panels, request, detail_view.object)
+
+        if timings is not None:
+            response.headers["Server-Timing"] = timings.server_timing()
+
+        return response
+
+
+class LazyFragmentMoreView(LazyFragmentView):
+    """
+    View that renders the next page of rows of a table_for(load_more=True) panel.
+
+    Registered by AdminChangeListViewDetail next to LazyFragmentView. The signed
+    `cursor` query parameter holds the last shown row's ordering values; the panel is
+    rebuilt with it set, so table_for seeks past that row instead of using OFFSET.
+
+    Responds with JSON: {"rows_html": "<tr>...", "next_url": url or null}.
+    """
+
+    def get(self, request, pk, fragment_key):
+        from .template_helpers import _lazy_panel_cursor
+
+        try:
+            cursor = decode_keyset_cursor(request.GET.get("cursor", ""))
+        except signing.BadSignature:
+            raise Http404("Invalid cursor")
+
+        detail_view = self._build_detail_view(request, pk)
+
+        token = _lazy_panel_cursor.set(cursor)
+        try:
+            fragment_data = self._resolve_panels(detail_view, [fragment_key])[fragment_key]
+        except InvalidCursorError:
+            raise Http404("Cursor does not match the panel's ordering")
+        finally:
+            _lazy_panel_cursor.reset(token)
+
+        if fragment_data is None or not fragment_data.get("load_more"):
+            raise Http404(f"Panel with key '{fragment_key}' does not load more rows")
+
+        rows_html = render_to_string(
+            "admin/djadmin_components/_object_list_rows.html",
+            {"object_list": fragment_data, "object": detail_view.object},
+            request=request,
+        )
+
+        next_url = None
+        if fragment_data["next_cursor"]:
+            next_url = admin_lazy_more_path_for(detail_view.object, fragment_key, fragment_data["next_cursor"])
+
+        return JsonResponse({"rows_html": rows_html, "next_url": next_url})
+
+
+class PanelExportView(LazyFragmentView):
+    """
+    View that downloads every row of a table_for(exportable=True) panel.
+
+    Registered by AdminChangeListViewDetail next to LazyFragmentView. The panel is
+    looked up like a lazy panel, by its export key, with export mode set: table_for then
+    returns the panel's queryset and columns without querying, and the rows are streamed
+    with exports.export_response(). `?format=` is "csv" (default) or "xlsx".
+    """
+
+    def get(self, request, pk, fragment_key):
+        from .template_helpers import _exporting_panel
+
+        export_format = request.GET.get("format", "csv")
+        if export_format not in export_formats():
+            raise Http404(f"Export format '{export_format}' is not available")
+
+        detail_view = self._build_detail_view(request, pk)
+
+        token = _exporting_panel.set(fragment_key)
+        try:
+            panel = self._resolve_panels(detail_view, [fragment_key])[fragment_key]
+        finally:
+            _exporting_panel.reset(token)
+
+        # Anything else found under the key (e.g. a lazy details panel) isn't exportable
+        if panel is None or "rows" in panel or not panel.get("export_key"):
+            raise Http404(f"Panel with key '{fragment_key}' is not exportable")
+
+        obj = detail_view.object
+        filename = f"{obj._meta.model_name}-{obj.pk}-{fragment_key}"
+        return export_response(panel, export_format, filename)
@@ -0,0 +1,408 @@
+import datetime
+import json
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import BinaryField, F, JSONField, Q, TextField
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable, QuerySet
+from django.utils.module_loading import import_string
+
+from djadmin_detail_view.defaults import COUNT_ESTIMATOR
+
+# Columns worth leaving out of a table's SELECT when no col() reads them
+HEAVY_FIELD_TYPES = (TextField, JSONField, BinaryField)
+
+
+def with_inferred_related(queryset, cols):
+    """
+    Apply select_related/prefetch_related for the relations the cols' dotted paths traverse.
+
+    col("company.name") or an auto-linked col("company") read a related object for every row;
+    without this, a table of N rows makes N extra queries. Forward FK/O2O chains (and reverse
+    O2O) are joined with select_related, reverse FK/M2M/generic relations are prefetched.
+    Columns with a `value` are skipped since their callable may read anything.
+    """
+    if not _can_optimize(queryset):
+        return queryset
+
+    select_related, prefetch_related = infer_related_lookups(
+        queryset.model,
+        [column["col_name"] for column in cols if column["value"] is None],
+    )
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    return queryset
+
+
+def infer_related_lookups(model, col_names):
+    """Return (select_related, prefetch_related) lookups needed to read col_names from model."""
+    select_related = []
+    prefetch_related = []
+
+    for col_name in col_names:
+        select_path = []
+        attr_path = []
+        current_model = model
+
+        for attr in col_name.split("."):
+            relation = _relation_for(current_model, attr)
+            if relation is None:
+                break
+
+            attr_path.append(attr)
+
+            if not _is_single_relation(relation):
+                # Managers/generic relations can't be joined; prefetch them and stop here
+                _append_unique(prefetch_related, "__".join(attr_path))
+                break
+
+            select_path.append(relation.name)
+            current_model = relation.related_model
+
+        if select_path:
+            _append_unique(select_related, "__".join(select_path))
+
+    return select_related, prefetch_related
+
+
+def with_restricted_fields(queryset, cols, needs_whole_object=False):
+    """
+    Narrow the queryset to the concrete fields the cols read, plus the pk.
+
+    Only applied when every column is a plain attribute path (no `value`), since a callable
+    or a model property may read any field. With needs_whole_object (e.g. str(obj) is
+    rendered for auto-linked columns), .only() would trigger one query per row for whatever
+    __str__ reads, so just the unreferenced TextField/JSONField/BinaryField columns are
+    deferred instead.
+    """
+    if not _can_optimize(queryset) or queryset.query.deferred_loading != (frozenset(), True):
+        return queryset
+
+    model = queryset.model
+    # Related managers (company.contact_set.all()) set the known parent on every row,
+    # which reads the foreign key
+    local_fields = {field.name for field in queryset._known_related_objects}
+
+    for column in cols:
+        if column["value"] is not None:
+            return queryset
+
+        attr = column["col_name"].split(".")[0]
+        fields = _local_fields_for(model, attr)
+        if fields is None:
+            # A property or method: no way of knowing which fields it reads
+            return queryset
+
+        local_fields.update(fields)
+
+    if needs_whole_object:
+        heavy_fields = [
+            field.name
+            for field in model._meta.concrete_fields
+            if isinstance(field, HEAVY_FIELD_TYPES) and field.name not in local_fields
+        ]
+        return queryset.defer(*heavy_fields) if heavy_fields else queryset
+
+    return queryset.only(model._meta.pk.name, *sorted(local_fields))
+
+
+def _local_fields_for(model, attr):
+    """
+    Names of model's own concrete fields needed to read attribute `attr`, or None when
+    attr is not a field (properties, methods).
+    """
+    opts = model._meta
+    for field in opts.concrete_fields:
+        if attr in (field.name, field.attname):
+            return [field.name]
+
+    relation = _relation_for(model, attr)
+    if relation is None:
+        return None
+
+    if hasattr(relation, "ct_field"):
+        # GenericForeignKey reads its content type and object id columns
+        return [relation.ct_field, relation.fk_field]
+
+    # Reverse and many-to-many relations are read through the pk
+    return []
+
+
+COUNT_EXACT = "exact"
+COUNT_CAPPED = "capped"
+COUNT_ESTIMATED = "estimated"
+COUNT_HAS_MORE = "has_more"
+COUNT_NONE = "none"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_CAPPED, COUNT_ESTIMATED, COUNT_HAS_MORE, COUNT_NONE)
+
+
+def count_rows(obj_set, fetched, obj_set_limit, strategy=COUNT_EXACT, cap=None):
+    """
+    Count obj_set for a table that fetched `fetched` rows of it, limited to obj_set_limit.
+
+    When fewer rows than the limit came back, that is the total and no query runs.
+    Otherwise, by strategy:
+        exact: SELECT COUNT(*).
+        capped: count a LIMIT cap + 1 slice, returning "{cap}+" past the cap (cap defaults
+            to obj_set_limit).
+        estimated: the DJADMIN_COUNT_ESTIMATOR hook's estimate as "~N", falling back to
+            capped when it has none.
+        has_more: None; table_for fetched one extra row to set has_more instead.
+        none: None, no count is shown.
+    """
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(f"Unknown count strategy '{strategy}'. Use one of: {', '.join(COUNT_STRATEGIES)}.")
+
+    if isinstance(obj_set, list):
+        return len(obj_set)
+
+    if not obj_set_limit or fetched < obj_set_limit:
+        return fetched
+
+    if strategy in (COUNT_HAS_MORE, COUNT_NONE):
+        return None
+
+    if strategy == COUNT_EXACT:
+        return obj_set.count()
+
+    if strategy == COUNT_ESTIMATED:
+        estimate = import_string(COUNT_ESTIMATOR)(obj_set)
+        if estimate is not None:
+            return f"~{estimate}"
+
+    cap = cap or obj_set_limit
+    probed = obj_set[: cap + 1].count()
+    return f"{cap}+" if probed > cap else probed
+
+
+def estimate_count(queryset):
+    """
+    Default DJADMIN_COUNT_ESTIMATOR: the query planner's row estimate on PostgreSQL.
+
+    Returns None on other databases, where the "estimated" strategy falls back to "capped".
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+KEYSET_CURSOR_SALT = "djadmin_detail_view.keyset"
+
+
+class InvalidCursorError(ValueError):
+    """A keyset cursor that doesn't fit the queryset's ordering."""
+
+
+def keyset_ordering(queryset):
+    """
+    The queryset's ordering as [(field_path, descending), ...], ending with the pk as a
+    tiebreaker so every row has a unique position.
+
+    Returns None when the ordering can't drive keyset pagination: expressions, random
+    ordering, or paths that don't end in a concrete, non-relation field.
+    """
+    query = queryset.query
+    ordering = query.order_by or (query.default_ordering and queryset.model._meta.ordering) or ()
+    pk_name = queryset.model._meta.pk.name
+
+    keyset = []
+    for item in ordering:
+        if not isinstance(item, str) or item == "?":
+            return None
+
+        descending = item.startswith("-")
+        name = item.lstrip("+-")
+        if name == "pk":
+            name = pk_name
+
+        if _keyset_field(queryset.model, name) is None:
+            return None
+
+        keyset.append((name, descending))
+
+    if not any(name == pk_name for name, _ in keyset):
+        keyset.append((pk_name, False))
+
+    return keyset
+
+
+def keyset_order_by(keyset, model):
+    """
+    order_by() arguments for a keyset. Nullable fields sort NULLs as the largest value
+    (last ascending, first descending) on every database, so keyset_filter() can seek
+    past them.
+    """
+    order_by = []
+    for name, descending in keyset:
+        if not _keyset_nullable(model, name):
+            order_by.append(f"-{name}" if descending else name)
+        elif descending:
+            order_by.append(F(name).desc(nulls_first=True))
+        else:
+            order_by.append(F(name).asc(nulls_last=True))
+
+    return order_by
+
+
+def keyset_cursor(obj, keyset):
+    """Signed cursor pointing just after obj."""
+    values = []
+    for name, _ in keyset:
+        value = obj
+        for part in name.split(LOOKUP_SEP):
+            # A NULL relation along the path makes the whole value NULL
+            value = getattr(value, part) if value is not None else None
+        values.append(value)
+
+    return signing.dumps(values, salt=KEYSET_CURSOR_SALT, serializer=_CursorSerializer)
+
+
+def decode_keyset_cursor(cursor):
+    """Raw cursor values from a signed cursor. Raises signing.BadSignature if tampered with."""
+    return signing.loads(cursor, salt=KEYSET_CURSOR_SALT, serializer=_CursorSerializer)
+
+
+def keyset_filter(queryset, keyset, cursor_values):
+    """
+    Rows of queryset positioned after cursor_values in keyset order.
+
+    Seeks with (a > x) OR (a = x AND b > y) OR ..., so later pages cost the same as the
+    first one, unlike OFFSET. NULLs are the largest values, as in keyset_order_by().
+    """
+    if not isinstance(cursor_values, list) or len(cursor_values) != len(keyset):
+        raise InvalidCursorError("Cursor does not match the panel's ordering")
+
+    try:
+        values = [
+            _keyset_field(queryset.model, name).to_python(value) for (name, _), value in zip(keyset, cursor_values)
+        ]
+    except ValidationError as e:
+        raise InvalidCursorError("Cursor does not match the panel's ordering") from e
+
+    seek = Q()
+    for index, (name, descending) in enumerate(keyset):
+        after = _keyset_after(name, descending, values[index], _keyset_nullable(queryset.model, name))
+        if after is None:
+            continue
+
+        clause = Q()
+        for prefix in range(index):
+            prefix_name, prefix_value = keyset[prefix][0], values[prefix]
+            if prefix_value is None:
+                clause &= Q(**{f"{prefix_name}__isnull": True})
+            else:
+                clause &= Q(**{prefix_name: prefix_value})
+        seek |= clause & after
+
+    return queryset.filter(seek)
+
+
+def _keyset_after(name, descending, value, nullable):
+    """Q of the values of name ordered after value, or None when there are none."""
+    if value is None:
+        # NULL sorts last ascending and first descending
+        return Q(**{f"{name}__isnull": False}) if descending else None
+    if descending:
+        return Q(**{f"{name}__lt": value})
+    if nullable:
+        return Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+    return Q(**{f"{name}__gt": value})
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder truncates to milliseconds, which would make rows sharing
+        # the millisecond reappear on the next page
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class _CursorSerializer:
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"), cls=_CursorEncoder).encode("latin-1")
+
+    def loads(self, data):
+        return json.loads(data.decode("latin-1"))
+
+
+def _keyset_field(model, path):
+    parts = path.split(LOOKUP_SEP)
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+
+        if index < len(parts) - 1:
+            if not (field.many_to_one or field.one_to_one) or field.related_model is None:
+                return None
+            model = field.related_model
+        elif field.is_relation or not field.concrete:
+            return None
+
+    return field
+
+
+def _keyset_nullable(model, path):
+    """Whether a keyset path can be NULL: a nullable field, or one behind a nullable relation."""
+    for part in path.split(LOOKUP_SEP):
+        field = model._meta.get_field(part)
+        if field.null:
+            return True
+        model = field.related_model
+
+    return False
+
+
+def _can_optimize(queryset):
+    # union()/intersection()/difference() querysets support neither select_related() nor only()
+    return (
+        isinstance(queryset, QuerySet)
+        and queryset._iterable_class is ModelIterable
+        and not queryset.query.is_sliced
+        and not queryset.query.combinator
+        and queryset._result_cache is None
+    )
+
+
+def _relation_for(model, attr):
+    """The relation field behind attribute `attr` of model instances, or None."""
+    for field in model._meta.get_fields():
+        if not field.is_relation:
+            continue
+
+        if field.auto_created and not field.concrete:
+            # Reverse relation: reachable through its accessor (e.g. contact_set)
+            if field.get_accessor_name() == attr:
+                return field
+        elif field.name == attr:
+            return field
+
+    return None
+
+
+def _is_single_relation(relation):
+    return (relation.many_to_one or relation.one_to_one) and relation.related_model is not None
+
+
+def _append_unique(lookups, lookup):
+    if lookup not in lookups:
+        lookups.append(lookup)
@@ -0,0 +1,313 @@
+from django.db.models import Model
+from django.db.models.fields.files import FieldFile
+from django.template import Context
+from django.template.base import render_value_in_context
+from django.utils.html import conditional_escape, format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import gettext
+
+from .templatetags.djadmin_tags import (
+    get_export_url,
+    get_lazy_more_url,
+    get_obj_classname,
+    get_obj_detail_url,
+    jsonify,
+    try_admin_auto_link,
+)
+from .url_helpers import admin_path_for
+
+# The shipped object_list.html, _object_list_rows.html and object_details.html hand their
+# non-lazy panels to these functions when DJADMIN_NATIVE_RENDERER is on. The output is
+# byte-identical to the template markup (test_renderers.py holds them to it), so any
+# change to those templates must be mirrored here. Projects overriding the templates
+# simply don't call the render_native_* tags and keep full control of the markup.
+
+_CONTEXT = Context()
+
+# Cell kinds, resolved once per value type instead of by is_file_field/is_link_field/
+# is_model_field tag dispatches per cell
+_TEXT = "text"
+_LINK = "link"  # str starting with "http"
+_FILE = "file"
+_MODEL = "model"
+_DICT = "dict"
+
+_cell_kinds = {}
+
+
+def _cell_kind(value):
+    value_type = type(value)
+    kind = _cell_kinds.get(value_type)
+    if kind is None:
+        if issubclass(value_type, FieldFile):
+            kind = _FILE
+        elif issubclass(value_type, str):
+            kind = _LINK
+        elif issubclass(value_type, Model):
+            kind = _MODEL
+        elif issubclass(value_type, dict):
+            kind = _DICT
+        else:
+            kind = _TEXT
+        _cell_kinds[value_type] = kind
+
+    if kind is _LINK and not value.startswith("http"):
+        return _TEXT
+    return kind
+
+
+def _out(value):
+    """{{ value }}: localized and autoescaped like a template variable."""
+    return render_value_in_context(value, _CONTEXT)
+
+
+def _translated(message):
+    """{{ _("message") }}"""
+    return mark_safe(gettext(message))
+
+
+def render_object_list(object_list, obj):
+    """HTML of object_list.html for a table_for() result (not a LazyFragment)."""
+    rows = object_list.get("rows")
+    cols = object_list.get("cols")
+    allow_edit = object_list.get("allow_edit")
+
+    if object_list.get("obj_set_limit"):
+        if object_list.get("count") is not None:
+            count = format_html("<span>({} of {})</span>", _out(len(rows)), _out(object_list.get("count", "")))
+        elif object_list.get("has_more"):
+            count = format_html("<span>({}+)</span>", _out(len(rows)))
+        else:
+            count = format_html("<span>({})</span>", _out(len(rows)))
+        count = f"\n            \n              {count}\n            \n          "
+    else:
+        count = ""
+
+    view_all_url = object_list.get("view_all_url")
+    view_all = format_html('<a href="{}">View All</a>', _out(view_all_url)) if view_all_url else ""
+    export = _export_links(object_list, obj) if object_list.get("export_key") else ""
+
+    headers = "".join([format_html("<th>{}</th>", _out(column.get("display_name", ""))) for column in cols])
+    actions_header = format_html("<th>{}</th>", _translated("Actions")) if allow_edit else ""
+
+    if rows:
+        empty = ""
+    else:
+        colspan = _out(len(cols) + 1 if allow_edit else len(cols))
+        empty = (
+            "\n            <tr>"
+            f'\n              <td colspan="{colspan}"'
+            '\n                  class="text-center text-muted">No records found.</td>'
+            "\n            </tr>"
+            "\n          "
+        )
+
+    html = [
+        '<div class="card mb-5 object-list">',
+        '\n      <div class="card-header">',
+        f"\n        {_out(object_list.get('panel_name', ''))}",
+        "\n        <small>",
+        f"\n          {count}",
+        "\n        </small>",
+        '\n        <div class="float-end small">',
+        f"\n          {export}",
+        f"\n          {view_all}",
+        "\n        </div>",
+        "\n      </div>",
+        '\n      <table class="table table-striped table-borderless mb-0">',
+        "\n        <thead>",
+        f"\n          {headers}",
+        f"\n          {actions_header}",
+        "\n        </thead>",
+        '\n        <tbody data-lazy-panel-target="rows">',
+        f"\n          \n\n\n  {render_object_list_rows(object_list)}\n\n",
+        f"\n          {empty}",
+        "\n        </tbody>",
+        "\n        <tfoot>",
+        f"\n          {_load_more_footer(object_list, obj)}",
+        f"\n          {_add_footer(object_list)}",
+        f"\n          {_view_all_footer(object_list)}",
+        "\n        </tfoot>",
+        "\n      </table>",
+        "\n    </div>",
+    ]
+    return mark_safe("".join(html))
+
+
+def render_object_list_rows(object_list):
+    """HTML of _object_list_rows.html: the <tr> of every row, as served by "load more"."""
+    allow_edit = object_list.get("allow_edit")
+    html = []
+
+    for row in object_list.get("rows"):
+        html.append("\n    <tr>\n      ")
+        for obj_detail in row.get("obj_details"):
+            html.append(
+                "\n        <td>\n          \n          \n          "
+                f"{_row_cell(obj_detail.get('value_out', ''))}"
+                "\n        </td>\n      "
+            )
+
+        actions = row.get("actions")
+        actions = f"\n          {''.join([_out(action) for action in actions])}\n        " if actions else ""
+        if allow_edit:
+            edit_path = conditional_escape(admin_path_for(row.get("obj", "")))
+            edit = f'\n          <a href="{edit_path}" class="ms-2">{_translated("Edit")}</a>\n        '
+        else:
+            edit = ""
+        html.append(f"\n      <td>\n        {actions}\n        {edit}\n      </td>\n    </tr>\n  ")
+
+    return mark_safe("".join(html))
+
+
+def _row_cell(value):
+    kind = _cell_kind(value)
+    if kind is _FILE:
+        if value:
+            link = format_html('<a href="{}">{}</a>', _out(value.url), _out(value))
+            return f"\n            \n              {link}\n            \n          "
+        return "\n            \n              -\n            \n          "
+    if kind is _LINK:
+        value = _out(value)
+        return f'\n            <a href="{value}">{value}</a>\n          '
+    return f"\n            {_out(value)}\n          "
+
+
+def _export_links(object_list, obj):
+    # {% include "_export_links.html" %} inside {% if object_list.export_key %}
+    csv_link = format_html('<a class="me-2" href="{}">CSV</a>', _out(get_export_url(obj, object_list, "csv")))
+    xlsx_url = get_export_url(obj, object_list, "xlsx")
+    xlsx_link = format_html('\n  <a class="me-2" href="{}">XLSX</a>\n', _out(xlsx_url)) if xlsx_url else ""
+    return f"\n            \n\n\n{csv_link}\n{xlsx_link}\n\n          "
+
+
+def _load_more_footer(object_list, obj):
+    if not object_list.get("next_cursor"):
+        return ""
+
+    more_url = get_lazy_more_url(obj, object_list)
+    # Every row ends with its actions cell, so span it too
+    colspan = _out(len(object_list.get("cols")) + 1)
+    return (
+        "\n            "
+        '\n            <tr data-lazy-panel-target="more">'
+        f'\n              <td colspan="{colspan}" class="text-center">'
+        '\n                <button type="button"'
+        '\n                        class="btn btn-outline-secondary btn-sm"'
+        '\n                        data-action="lazy-panel#loadMore"'
+        f'\n                        data-lazy-panel-url-param="{_out(more_url)}">{_translated("Load more")}</button>'
+        "\n              </td>"
+        "\n            </tr>"
+        "\n          "
+    )
+
+
+def _add_footer(object_list):
+    add_url = object_list.get("add_url")
+    if not add_url:
+        return ""
+
+    label = _out(object_list.get("add_label") or _translated("Add"))
+    return (
+        "\n            <tr>"
+        "\n              <td>"
+        f'\n                <a class="btn btn-primary btn-sm" href="{_out(add_url)}">{label}</a>'
+        "\n              </td>"
+        "\n            </tr>"
+        "\n          "
+    )
+
+
+def _view_all_footer(object_list):
+    view_all_footer_url = object_list.get("view_all_footer_url")
+    if not view_all_footer_url:
+        return ""
+
+    return (
+        "\n            <tr>"
+        "\n              <td>"
+        '\n                <a class="btn btn-primary btn-sm"'
+        f'\n                   href="{_out(view_all_footer_url)}">{_translated("View All")}</a>'
+        "\n              </td>"
+        "\n            </tr>"
+        "\n          "
+    )
+
+
+def render_object_details(object_details):
+    """HTML of object_details.html for a details_table_for() result (not a LazyFragment)."""
+    obj = object_details.get("obj")
+    is_empty = object_details.get("is_empty")
+
+    if object_details.get("panel_name"):
+        header = f"\n          {_out(object_details['panel_name'])}\n        "
+    elif obj and not is_empty:
+        classname = conditional_escape(get_obj_classname(obj))
+        header = f"\n          {classname}: {_out(try_admin_auto_link(obj, 'detail'))}\n        "
+    else:
+        header = ""
+
+    if obj and not is_empty:
+        body = "".join([_detail_row(obj_detail) for obj_detail in object_details.get("obj_details")])
+        body = (
+            '\n        <table class="table table-borderless mb-0 table-striped">'
+            f"\n          {body}"
+            "\n        </table>"
+            "\n      "
+        )
+    else:
+        empty_message = _out(object_details.get("empty_message") or "No data available")
+        body = (
+            '\n        <div class="card-body text-center text-muted py-4">'
+            f'\n          <p class="mb-0">{empty_message}</p>'
+            "\n        </div>"
+            "\n      "
+        )
+
+    html = [
+        '<div class="card mb-5">',
+        '\n      <div class="card-header">',
+        f"\n        {header}",
+        "\n      </div>",
+        f"\n      {body}",
+        "\n    </div>",
+    ]
+    return mark_safe("".join(html))
+
+
+def _detail_row(obj_detail):
+    help_text = obj_detail.get("help_text")
+    if help_text:
+        help_text = format_html('<div class="ms-2 mt-1 text-muted fst-italic">{}</div>', _out(help_text))
+    else:
+        help_text = ""
+
+    return (
+        "\n            <tr>"
+        "\n              <th>"
+        f"\n                {_out(obj_detail.get('display_name', ''))}"
+        f"\n                {help_text}"
+        "\n              </th>"
+        "\n              <td>"
+        "\n                "
+        "\n                "
+        f"\n                {_detail_cell(obj_detail.get('value_out', ''))}"
+        "\n              </td>"
+        "\n            </tr>"
+        "\n          "
+    )
+
+
+def _detail_cell(value):
+    kind = _cell_kind(value)
+    if kind is _FILE:
+        if value:
+            link = format_html('<a href="{}">{}</a>', _out(value.url), _out(value))
+            return f"\n                  \n                    {link}\n                  \n                "
+        return "\n                  \n                    -\n                  \n                "
+    if kind is _MODEL:
+        link = format_html('<a href="{}">{}</a>', conditional_escape(get_obj_detail_url(value)), _out(value))
+        return f"\n                  {link}\n                "
+    if kind is _DICT:
+        return f"\n                  <pre><code>{jsonify(value)}</code></pre>\n                "
+    return f"\n                  {_out(value)}\n                "
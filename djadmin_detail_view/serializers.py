@@ -0,0 +1,89 @@
+from html import unescape
+
+from django.db.models import Model
+from django.db.models.fields.files import FieldFile
+from django.utils.html import strip_tags
+from django.utils.safestring import SafeData
+
+from .templatetags.djadmin_tags import CustomEncoder, get_obj_detail_url, is_link_field
+
+# The lazy endpoint's JSON mode (?format=json or Accept: application/json) answers with
+# these instead of rendering the panel templates. Rows are lists aligned with "columns",
+# so the column keys aren't repeated per cell.
+
+
+class PanelEncoder(CustomEncoder):
+    """CustomEncoder that falls back to str() for values JSON has no type for."""
+
+    def default(self, obj):
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+def serialize_panel(panel):
+    """JSON-ready dict of a table_for()/details_table_for() result."""
+    if "rows" in panel:
+        return serialize_table(panel)
+    return serialize_details(panel)
+
+
+def serialize_table(object_list):
+    cols = object_list["cols"]
+    return {
+        "type": "table",
+        "panel_name": object_list.get("panel_name"),
+        "lazy_key": object_list.get("lazy_key"),
+        "columns": [_serialize_column(column) for column in cols],
+        "rows": [
+            [serialize_value(cell.get("value_out")) for cell in row["obj_details"]] for row in object_list["rows"]
+        ],
+        "count": object_list.get("count"),
+        "has_more": object_list.get("has_more"),
+        "next_cursor": object_list.get("next_cursor"),
+    }
+
+
+def serialize_details(object_details):
+    obj = object_details.get("obj")
+    details = []
+    if obj and not object_details.get("is_empty"):
+        details = [
+            {**_serialize_column(column), "value": serialize_value(column.get("value_out"))}
+            for column in object_details["obj_details"]
+        ]
+
+    return {
+        "type": "details",
+        "panel_name": object_details.get("panel_name"),
+        "lazy_key": object_details.get("lazy_key"),
+        "object": serialize_value(obj) if isinstance(obj, Model) else None,
+        "is_empty": object_details.get("is_empty"),
+        "empty_message": object_details.get("empty_message"),
+        "details": details,
+    }
+
+
+def serialize_value(value):
+    """
+    A cell's value_out as JSON data. Objects and files become {"text", "url"}, HTML
+    (e.g. auto-links) becomes {"text", "html"}; the rest is left to PanelEncoder.
+    """
+    if isinstance(value, SafeData):
+        return {"text": unescape(strip_tags(value)), "html": str(value)}
+    if isinstance(value, Model):
+        return {"text": str(value), "url": get_obj_detail_url(value)}
+    if isinstance(value, FieldFile):
+        return {"text": value.name, "url": value.url} if value else None
+    if is_link_field(value):
+        return {"text": value, "url": value}
+    return value
+
+
+def _serialize_column(column):
+    return {
+        "col_name": column.get("col_name"),
+        "display_name": column.get("display_name"),
+        "help_text": column.get("help_text"),
+    }
@@ -1,11 +1,17 @@
 import { Controller } from '@hotwired/stimulus'
 
+// Panels waiting to be loaded together, grouped by batch URL.
+// Filled by connect() and drained once the current tick has finished connecting.
+const pendingBatches = new Map()
+
 /**
  * Stimulus controller for lazy loading admin panel content.
  *
  * Usage:
  * <div data-controller="lazy-panel"
- *      data-lazy-panel-url-value="/admin/app/model/1/lazy/fragment_key/">
+ *      data-lazy-panel-url-value="/admin/app/model/1/lazy/fragment_key/"
+ *      data-lazy-panel-batch-url-value="/admin/app/model/1/lazy/"
+ *      data-lazy-panel-key-value="fragment_key">
  *   <div data-lazy-panel-target="content">
  *     <div class="card">
  *       <div class="card-header">Panel Name</div>
@@ -21,26 +27,71 @@ import { Controller } from '@hotwired/stimulus'
  * 2. On success, replace the content target's innerHTML with the response
  * 3. On error, display error message in the card body with retry option
  *
+ * Panels sharing a batch URL that connect in the same tick are fetched with a
+ * single request to the batch endpoint. Panels missing from the batch response,
+ * or a failed batch request, fall back to the per-panel URL above.
+ *
+ * Tables built with table_for(load_more=True) render a "Load more" button
+ * (data-action="lazy-panel#loadMore") that appends the next page of rows to the
+ * rows target.
+ *
  * The outer wrapper (with data-controller) persists for future features like refresh.
  */
 export default class extends Controller {
-  static targets = ['content', 'body', 'spinner']
+  static targets = ['content', 'body', 'spinner', 'rows', 'more']
 
   static values = {
     url: String,
+    batchUrl: String,
+    key: String,
     retryCount: { type: Number, default: 0 },
     maxRetries: { type: Number, default: 3 },
     loaded: { type: Boolean, default: false },
   }
 
   connect() {
-    this.load()
+    if (this.batchUrlValue && this.keyValue) {
+      this.enqueueBatch()
+    } else {
+      this.load()
+    }
+  }
+
+  /**
+   * Queue this panel to be loaded together with every other panel that
+   * connects in the same tick and shares the same batch URL.
+   */
+  enqueueBatch() {
+    const batchUrl = this.batchUrlValue
+
+    if (!pendingBatches.has(batchUrl)) {
+      pendingBatches.set(batchUrl, [])
+      queueMicrotask(() => {
+        const controllers = pendingBatches.get(batchUrl)
+        pendingBatches.delete(batchUrl)
+        loadBatch(batchUrl, controllers)
+      })
+    }
+
+    pendingBatches.get(batchUrl).push(this)
   }
 
   /**
    * Refresh the panel content. Can be called externally or via data-action.
+   *
+   * A loaded panel whose response carried an ETag is revalidated in place: the
+   * current content stays up while the server checks it, and a 304 keeps it.
    */
   refresh() {
+    if (this.loadedValue && this.etag) {
+      this.revalidate()
+      return
+    }
+
+    this.reload()
+  }
+
+  reload() {
     this.retryCountValue = 0
     this.loadedValue = false
     this.restoreSpinner()
@@ -142,14 +193,8 @@ export default class extends Controller {
 
       const html = await response.text()
 
-      // Success - replace content target's innerHTML (preserving outer wrapper)
-      if (this.hasContentTarget) {
-        this.contentTarget.innerHTML = html
-      } else {
-        // Fallback: replace element's innerHTML if no content target
-        this.element.innerHTML = html
-      }
-      this.loadedValue = true
+      this.etag = response.headers.get('ETag')
+      this.render(html)
     } catch (error) {
       console.error('Lazy panel load failed:', error)
 
@@ -172,6 +217,85 @@ export default class extends Controller {
     }
   }
 
+  async revalidate() {
+    try {
+      const response = await fetch(this.urlValue, {
+        headers: {
+          'X-Requested-With': 'XMLHttpRequest',
+          'If-None-Match': this.etag,
+        },
+        credentials: 'same-origin',
+        redirect: 'error', // Treat redirects as errors
+        cache: 'no-store', // Let the 304 reach us instead of the browser cache
+      })
+
+      if (response.status === 304) {
+        return
+      }
+
+      if (!response.ok) {
+        throw new HttpError(response.status, response.statusText)
+      }
+
+      const html = await response.text()
+
+      this.etag = response.headers.get('ETag')
+      this.render(html)
+    } catch (error) {
+      console.error('Lazy panel revalidation failed, reloading:', error)
+      this.reload()
+    }
+  }
+
+  render(html) {
+    // Success - replace content target's innerHTML (preserving outer wrapper)
+    if (this.hasContentTarget) {
+      this.contentTarget.innerHTML = html
+    } else {
+      // Fallback: replace element's innerHTML if no content target
+      this.element.innerHTML = html
+    }
+    this.loadedValue = true
+  }
+
+  /**
+   * Append the next page of a load_more table. The button carries the page URL in
+   * data-lazy-panel-url-param; the response gives the rows and the following page URL.
+   */
+  async loadMore(event) {
+    const button = event.currentTarget
+    button.disabled = true
+
+    try {
+      const response = await fetch(event.params.url, {
+        headers: {
+          'X-Requested-With': 'XMLHttpRequest',
+          Accept: 'application/json',
+        },
+        credentials: 'same-origin',
+        redirect: 'error', // Treat redirects as errors
+      })
+
+      if (!response.ok) {
+        throw new HttpError(response.status, response.statusText)
+      }
+
+      const { rows_html: rowsHtml, next_url: nextUrl } = await response.json()
+
+      this.rowsTarget.insertAdjacentHTML('beforeend', rowsHtml)
+
+      if (nextUrl) {
+        button.setAttribute('data-lazy-panel-url-param', nextUrl)
+        button.disabled = false
+      } else if (this.hasMoreTarget) {
+        this.moreTarget.remove()
+      }
+    } catch (error) {
+      console.error('Lazy panel load more failed:', error)
+      button.disabled = false
+    }
+  }
+
   async getErrorText(response) {
     try {
       const text = await response.text()
@@ -191,6 +315,53 @@ export default class extends Controller {
   }
 }
 
+/**
+ * Load every queued panel of a page from the batch endpoint in one request.
+ * A single panel skips the batch endpoint and uses its own URL.
+ */
+async function loadBatch(batchUrl, controllers) {
+  if (controllers.length === 1) {
+    controllers[0].load()
+    return
+  }
+
+  controllers.forEach((controller) => controller.showSpinner())
+
+  const url = new URL(batchUrl, window.location.origin)
+  controllers.forEach((controller) => url.searchParams.append('key', controller.keyValue))
+
+  let fragments
+  try {
+    const response = await fetch(url, {
+      headers: {
+        'X-Requested-With': 'XMLHttpRequest',
+        Accept: 'application/json',
+      },
+      credentials: 'same-origin',
+      redirect: 'error', // Treat redirects as errors
+    })
+
+    if (!response.ok) {
+      throw new HttpError(response.status, response.statusText)
+    }
+
+    fragments = (await response.json()).fragments
+  } catch (error) {
+    console.error('Lazy panel batch load failed, loading panels individually:', error)
+    controllers.forEach((controller) => controller.load())
+    return
+  }
+
+  controllers.forEach((controller) => {
+    if (controller.keyValue in fragments) {
+      controller.render(fragments[controller.keyValue])
+    } else {
+      // Let the per-panel endpoint produce the proper error for this panel
+      controller.load()
+    }
+  })
+}
+
 /**
  * Custom error class for HTTP errors
  */
@@ -1,16 +1,32 @@
 import contextvars
 import copy
+from collections.abc import Mapping, MutableMapping
 from dataclasses import dataclass
 from datetime import date, datetime
 from operator import attrgetter
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import DateField, DateTimeField, ImageField, Model, QuerySet
 from django.db.models.fields.files import ImageFieldFile
-from django.utils import formats, timezone
+from django.utils import dateformat, formats, timezone
 from django.utils.html import format_html
-
-from djadmin_detail_view.defaults import LAZY_LOADING_ENABLED, TEMPLATE_TIME_FORMAT
-
-from .url_helpers import auto_link
+from django.utils.text import slugify
+
+from djadmin_detail_view.defaults import COUNT_STRATEGY, LAZY_LOADING_ENABLED, TEMPLATE_TIME_FORMAT
+
+from .fragment_cache import get_cached_fragment, lazy_fragment_cache_key
+from .instrumentation import instrumented_panel, start_fill_timer
+from .query_helpers import (
+    COUNT_HAS_MORE,
+    count_rows,
+    keyset_cursor,
+    keyset_filter,
+    keyset_order_by,
+    keyset_ordering,
+    with_inferred_related,
+    with_restricted_fields,
+)
+from .url_helpers import admin_has_action, admin_path_for, auto_link, has_detail_url
 
 # Context variable to signal which lazy panel should be force-rendered
 # When set, table_for/details_table_for with matching key returns content instead of LazyFragment
@@ -19,6 +35,22 @@ _rendering_lazy_panel = contextvars.ContextVar("rendering_lazy_panel", default=N
 # Context variable to track lazy_keys used in the current request (for duplicate detection)
 _used_lazy_keys = contextvars.ContextVar("used_lazy_keys", default=None)
 
+# Context variable holding the decoded keyset cursor while LazyFragmentMoreView renders
+# the next page of a load_more table_for panel
+_lazy_panel_cursor = contextvars.ContextVar("lazy_panel_cursor", default=None)
+
+# Context variable holding the export key of the table_for(exportable=True) panel being
+# downloaded; that panel returns its export spec instead of querying its rows
+_exporting_panel = contextvars.ContextVar("exporting_panel", default=None)
+
+# Context variable set while the lazy endpoint serves JSON, which the HTML fragment cache
+# (lazy_cache_ttl) can't answer: panels skip it and are built
+_skipping_fragment_cache = contextvars.ContextVar("skipping_fragment_cache", default=False)
+
+# Context variable holding the detail page object while the lazy endpoint builds panels,
+# used to key the lazy_cache_ttl fragment cache
+_rendering_lazy_object = contextvars.ContextVar("rendering_lazy_object", default=None)
+
 
 def _register_lazy_key(lazy_key: str, panel_name: str) -> None:
     """
@@ -42,6 +74,41 @@ def _register_lazy_key(lazy_key: str, panel_name: str) -> None:
     used_keys[lazy_key] = panel_name
 
 
+def _is_rendering_lazy_panel(lazy_key: str) -> bool:
+    """
+    Check whether the lazy endpoint is currently rendering the panel with lazy_key.
+
+    _rendering_lazy_panel holds a single key for LazyFragmentView and a frozenset
+    of keys for LazyFragmentBatchView.
+    """
+    rendering = _rendering_lazy_panel.get()
+    if isinstance(rendering, frozenset):
+        return lazy_key in rendering
+    return rendering == lazy_key
+
+
+def _lazy_cache_lookup(lazy_key, lazy_cache_ttl, lazy_cache_key):
+    """
+    Look up a lazy panel in the fragment cache.
+
+    Returns (cached panel or None, cache entry or None). The cached panel carries the
+    stored HTML, which the lazy endpoint returns as is. The cache entry tells the lazy
+    endpoint where to store the panel's HTML after rendering it.
+    """
+    obj = _rendering_lazy_object.get()
+
+    # Only whole first pages are cached; "load more" pages depend on their cursor
+    if not lazy_cache_ttl or obj is None or _lazy_panel_cursor.get() is not None or _skipping_fragment_cache.get():
+        return None, None
+
+    cache_key = lazy_fragment_cache_key(obj, lazy_key, lazy_cache_key)
+    html = get_cached_fragment(cache_key)
+    if html is not None:
+        return {"lazy_key": lazy_key, "cached_html": html}, None
+
+    return None, {"key": cache_key, "ttl": lazy_cache_ttl}
+
+
 def reset_lazy_key_tracking() -> None:
     """Reset the lazy key tracking. Called at the start of each request."""
     _used_lazy_keys.set(None)
@@ -85,6 +152,63 @@ class LazyFragment:
         return not LAZY_LOADING_ENABLED
 
 
+class DeferredPanel:
+    """
+    A layout column built when the layout renders it: {"col": DeferredPanel(self.orders_table)}.
+
+    On a streaming detail page (AdminDetailMixin.streaming) everything before the panel
+    is already sent while func runs, so slow panels no longer delay the first byte.
+    Lazy panels are cheap placeholders already; the lazy endpoints don't look inside
+    DeferredPanels, so don't wrap table_for/details_table_for(lazy_load_key=...).
+    """
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def resolve(self):
+        """Build the panel: func(*args, **kwargs)."""
+        return self.func(*self.args, **self.kwargs)
+
+
+def lazy_panel(lazy_load_key: str, etag=None, last_modified=None):
+    """
+    Decorator registering a DetailView method as the deferred builder of a lazy panel.
+
+    The method takes no arguments besides self and returns the table_for()/details_table_for()
+    call for the panel, using the same lazy_load_key. Call it from get_context_data() to place
+    the panel in the layout as usual; on the lazy endpoint, LazyFragmentView calls ONLY this
+    method instead of re-running the whole get_context_data(), so the other panels' queries
+    and formatting are skipped.
+
+    Usage:
+        @lazy_panel("orders")
+        def orders_panel(self):
+            return table_for(
+                panel_name="Orders",
+                obj_set=self.object.order_set.all(),
+                cols=[col("id"), col("total")],
+                lazy_load_key="orders",
+            )
+
+    etag / last_modified: optional callables taking the DetailView and returning a cheap
+    validator for the panel, e.g. `lambda view: view.object.order_set.aggregate(Max("updated_at"))`.
+    With either one, the lazy endpoint answers conditional GETs (the panel's refresh)
+    with 304 Not Modified without building the panel.
+    """
+
+    def decorator(method):
+        method.lazy_panel_key = lazy_load_key
+        method.lazy_panel_etag = etag
+        method.lazy_panel_last_modified = last_modified
+        return method
+
+    return decorator
+
+
 try:
     from moneyed import Money
 except ImportError:
@@ -112,6 +236,7 @@ def _is_empty_obj(obj):
     return False
 
 
+@instrumented_panel
 def details_table_for(
     *,
     obj,
@@ -120,7 +245,15 @@ def details_table_for(
     empty_message=None,
     lazy_load_key=None,
     lazy_placeholder=None,
+    lazy_cache_ttl=None,
+    lazy_cache_key=None,
 ):
+    """
+    Build an attributes table of obj with one row per detail().
+
+    lazy_cache_ttl: seconds to cache the panel's rendered HTML when served by the lazy
+        endpoint (see fragment_cache). lazy_cache_key varies the cache key further.
+    """
     # Disable lazy loading if LAZY_LOADING_ENABLED is False
     if not LAZY_LOADING_ENABLED:
         lazy_load_key = None
@@ -132,7 +265,7 @@ def details_table_for(
 
         # Check if we're being called from lazy endpoint for THIS panel
         # If so, skip lazy loading and return actual content
-        if _rendering_lazy_panel.get() != lazy_load_key:
+        if not _is_rendering_lazy_panel(lazy_load_key):
             return LazyFragment(
                 lazy_key=lazy_load_key,
                 panel_name=panel_name or "",
@@ -141,10 +274,17 @@ def details_table_for(
             )
         # Otherwise, fall through to render actual content
 
+        cached_panel, lazy_cache = _lazy_cache_lookup(lazy_load_key, lazy_cache_ttl, lazy_cache_key)
+        if cached_panel is not None:
+            return cached_panel
+
     is_empty = _is_empty_obj(obj)
 
     if obj and not is_empty:
+        fill_timer = start_fill_timer()
         fill_missing_values(obj, details)
+        if fill_timer:
+            fill_timer.stop()
 
     result = {
         "panel_name": panel_name,
@@ -157,22 +297,190 @@ def details_table_for(
     # Include lazy_key in result so LazyFragmentView can find the panel
     if lazy_load_key:
         result["lazy_key"] = lazy_load_key
+        if lazy_cache:
+            result["lazy_cache"] = lazy_cache
 
     return result
 
 
+class _SlotMapping(MutableMapping):
+    """
+    Dict interface over a class's _keys attributes, so templates and code written for
+    plain dicts keep working: obj["key"], obj.get("key"), "key" in obj, dict(obj),
+    obj.copy() and obj | {...}. An unset slot is a missing key. Other keys go to an
+    _extra dict, created on first use, when the class has an _extra slot.
+    """
+
+    __slots__ = ()
+    _keys = ()
+
+    def __getitem__(self, key):
+        if key in self._keys:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        else:
+            extra = getattr(self, "_extra", None)
+            if extra is not None and key in extra:
+                return extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._keys:
+            return getattr(self, key, default)
+        extra = getattr(self, "_extra", None)
+        if extra is None:
+            return default
+        return extra.get(key, default)
+
+    def __setitem__(self, key, value):
+        if key in self._keys:
+            setattr(self, key, value)
+            return
+
+        try:
+            extra = getattr(self, "_extra", None)
+            if extra is None:
+                extra = self._extra = {}
+        except AttributeError:
+            raise KeyError(f"{type(self).__name__} has no {key!r} key") from None
+        extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._keys:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        else:
+            extra = getattr(self, "_extra", None)
+            if extra is None or key not in extra:
+                raise KeyError(key)
+            del extra[key]
+
+    def __iter__(self):
+        yield from (key for key in self._keys if hasattr(self, key))
+        yield from getattr(self, "_extra", None) or ()
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def copy(self):
+        """Shallow copy of the same type, like dict.copy()."""
+        duplicate = copy.copy(self)
+        extra = getattr(self, "_extra", None)
+        if extra is not None:
+            duplicate._extra = dict(extra)
+        return duplicate
+
+    def __or__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        # The left operand's type wins, as with dicts
+        return {**other, **self}
+
+
+class Column(_SlotMapping):
+    """A detail()/col(). details_table_for() sets its value_out for the panel's obj."""
+
+    __slots__ = ("col_name", "display_name", "value", "help_text", "value_out", "_extra")
+    _keys = ("col_name", "display_name", "value", "help_text", "value_out")
+
+    def __init__(self, col_name, display_name, value, help_text):
+        self.col_name = col_name
+        self.display_name = display_name
+        self.value = value
+        self.help_text = help_text
+
+
+class Cell(_SlotMapping):
+    """
+    One table_for() cell: the row's value_out, read through to its column for the other
+    keys. Every row shares the table's columns instead of copying them; keys set on a
+    cell go to its own _extra dict and override the column for that cell only.
+    """
+
+    __slots__ = ("column", "value_out", "_extra")
+    _keys = ("col_name", "display_name", "value", "help_text", "value_out")
+
+    def __init__(self, column, value_out=""):
+        self.column = column
+        self.value_out = value_out
+
+    def __getitem__(self, key):
+        if key == "value_out":
+            return self.value_out
+        extra = getattr(self, "_extra", None)
+        if extra is not None and key in extra:
+            return extra[key]
+        return self.column[key]
+
+    def get(self, key, default=None):
+        if key == "value_out":
+            return self.value_out
+        extra = getattr(self, "_extra", None)
+        if extra is not None and key in extra:
+            return extra[key]
+        return self.column.get(key, default)
+
+    def __setitem__(self, key, value):
+        if key == "value_out":
+            self.value_out = value
+            return
+
+        extra = getattr(self, "_extra", None)
+        if extra is None:
+            extra = self._extra = {}
+        extra[key] = value
+
+    def __delitem__(self, key):
+        extra = getattr(self, "_extra", None)
+        if extra is None or key not in extra:
+            raise KeyError(key)
+        del extra[key]
+
+    def __iter__(self):
+        extra = getattr(self, "_extra", None) or {}
+        yield from (key for key in self.column if key != "value_out")
+        yield "value_out"
+        yield from (key for key in extra if key not in self.column and key != "value_out")
+
+
+class Row(_SlotMapping):
+    """One table_for() row: obj, its Cells (obj_details) and, with actions, their results."""
+
+    __slots__ = ("panel_name", "obj", "obj_details", "is_empty", "empty_message", "actions", "_extra")
+    _keys = ("panel_name", "obj", "obj_details", "is_empty", "empty_message", "actions")
+
+    def __init__(self, obj, obj_details, is_empty, actions=None):
+        # Rows used to be details_table_for() results; keep their panel_name and empty_message keys
+        self.panel_name = None
+        self.obj = obj
+        self.obj_details = obj_details
+        self.is_empty = is_empty
+        self.empty_message = None
+        self.actions = actions
+
+
 def detail(col_name, display_name=None, value: any = None, help_text: str = None):
     if display_name is None:
         display_name = col_name.replace("_", " ").title()
 
-    return {
-        "col_name": col_name,
-        "display_name": display_name,
-        "value": value,
-        "help_text": help_text,
-    }
+    return Column(col_name, display_name, value, help_text)
 
 
+@instrumented_panel
 def table_for(
     *,
     panel_name=None,
@@ -189,19 +497,65 @@ def table_for(
     count=None,
     lazy_load_key=None,
     lazy_placeholder=None,
+    infer_related=True,
+    restrict_fields=True,
+    count_strategy=None,
+    count_cap=None,
+    load_more=False,
+    lazy_cache_ttl=None,
+    lazy_cache_key=None,
+    exportable=False,
 ):
+    """
+    Build a list table of obj_set's objects with one column per col().
+
+    infer_related: select_related/prefetch_related the relations that dotted or
+        auto-linked col() paths read (see query_helpers.with_inferred_related),
+        avoiding one query per row. Pass False to keep obj_set's queries untouched.
+    restrict_fields: when every col() is a plain field path and there are no actions,
+        load only the fields the columns read (see query_helpers.with_restricted_fields).
+        Pass False to load every column.
+    count: the total to display; computed with count_strategy when omitted.
+    count_strategy: "exact", "capped", "estimated", "has_more" or "none" (default: the
+        DJADMIN_COUNT_STRATEGY setting, "exact"). See query_helpers.count_rows.
+        "has_more" fetches obj_set_limit + 1 rows in the rows query and sets the
+        result's has_more flag instead of counting.
+    count_cap: the cap for the "capped" strategy (default: obj_set_limit).
+    load_more: add a "Load more" button fetching the next obj_set_limit rows with
+        keyset pagination, seeking past the last row on obj_set's ordering (plus the pk
+        as tiebreaker) instead of using OFFSET. Requires lazy_load_key, since the rows
+        are served by the panel's lazy endpoint. Ignored for lists and for orderings
+        that aren't plain field paths (see query_helpers.keyset_ordering).
+    lazy_cache_ttl: seconds to cache the panel's rendered HTML when served by the lazy
+        endpoint, skipping its queries on a hit (see fragment_cache). lazy_cache_key
+        varies the cache key further, e.g. per user.
+    exportable: add CSV/XLSX download links to the panel, streaming every row of obj_set
+        with the same columns (obj_set_limit doesn't apply; see exports). The panel's
+        export key is its lazy_load_key, else its slugified panel_name.
+    """
+    if load_more and not lazy_load_key:
+        raise ValueError(f"table_for(load_more=True) requires a lazy_load_key (panel '{panel_name}').")
+
+    export_key = None
+    if exportable:
+        export_key = lazy_load_key or slugify(panel_name or "")
+        if not export_key:
+            raise ValueError("table_for(exportable=True) requires a lazy_load_key or a panel_name.")
+    exporting = export_key is not None and _exporting_panel.get() == export_key
+
     # Disable lazy loading if LAZY_LOADING_ENABLED is False
     if not LAZY_LOADING_ENABLED:
         lazy_load_key = None
+        load_more = False
 
-    if lazy_load_key:
+    if lazy_load_key and not exporting:
         # Register the lazy_load_key to detect duplicates (only on initial page load)
         if _rendering_lazy_panel.get() is None:
             _register_lazy_key(lazy_load_key, panel_name or lazy_load_key)
 
         # Check if we're being called from lazy endpoint for THIS panel
         # If so, skip lazy loading and return actual content
-        if _rendering_lazy_panel.get() != lazy_load_key:
+        if not _is_rendering_lazy_panel(lazy_load_key):
             return LazyFragment(
                 lazy_key=lazy_load_key,
                 panel_name=panel_name or "",
@@ -210,28 +564,87 @@ def table_for(
             )
         # Otherwise, fall through to render actual content
 
+        cached_panel, lazy_cache = _lazy_cache_lookup(lazy_load_key, lazy_cache_ttl, lazy_cache_key)
+        if cached_panel is not None:
+            return cached_panel
+
     rows = []
     objs = obj_set
 
-    if obj_set_limit:
+    if infer_related:
+        objs = with_inferred_related(objs, cols)
+
+    if restrict_fields and not actions:
+        # Auto-linked id/legal_name columns render str(obj), which may read any field
+        needs_whole_object = any(column["col_name"] in AUTOLINK_COL_NAMES for column in cols)
+        objs = with_restricted_fields(objs, cols, needs_whole_object=needs_whole_object)
+
+    if exporting:
+        # lazy_key lets the lazy endpoints' panel lookup find the export spec
+        return {
+            "panel_name": panel_name,
+            "lazy_key": export_key,
+            "export_key": export_key,
+            "cols": cols,
+            "obj_set": objs,
+        }
+
+    keyset = None
+    cursor = None
+    if load_more and obj_set_limit and isinstance(obj_set, QuerySet):
+        keyset = keyset_ordering(obj_set)
+
+    if keyset is not None:
+        objs = objs.order_by(*keyset_order_by(keyset, obj_set.model))
+        cursor = _lazy_panel_cursor.get()
+        if cursor is not None:
+            objs = keyset_filter(objs, keyset, cursor)
+
+    count_strategy = count_strategy or COUNT_STRATEGY
+    has_more = None
+
+    if obj_set_limit and (count_strategy == COUNT_HAS_MORE or keyset is not None) and not isinstance(obj_set, list):
+        # One extra row tells whether there is more, in the same query as the rows
+        objs = list(objs[: obj_set_limit + 1])
+        has_more = len(objs) > obj_set_limit
+        objs = objs[:obj_set_limit]
+    elif obj_set_limit:
         objs = objs[:obj_set_limit]
 
-    # It's just like creating an attributes table
+    # Resolve accessors, autolinking and formatters once for the whole table
+    plan = _compile_column_plan(cols, _model_for(obj_set))
+
+    # It's just like creating an attributes table. Each row gets its own Cells holding
+    # value_out, so it never leaks between rows; the columns and the model instance
+    # are shared, never copied.
+    fill_timer = start_fill_timer()
     for obj in objs:
-        row = details_table_for(obj=obj, details=cols.copy())
+        row = _build_row(obj, cols, plan)
 
         if actions:
-            for action in actions:
-                row.setdefault("actions", []).append(action(obj))
+            row["actions"] = [action(obj) for action in actions]
 
-        rows.append(copy.deepcopy(row))
+        rows.append(row)
 
-    if rows:
-        count = len(obj_set) if isinstance(obj_set, list) else obj_set.count or "Many"
-    else:
-        count = 0
+    if fill_timer:
+        fill_timer.stop()
 
-    0 if rows else (obj_set.count or len(obj_set) or "Many")
+    next_cursor = None
+    if keyset is not None and has_more:
+        next_cursor = keyset_cursor(rows[-1]["obj"], keyset)
+
+    # Follow-up "load more" pages only render rows; the header count came with the first page
+    if count is None and cursor is None:
+        if has_more is False:
+            count = len(rows)
+        else:
+            count = count_rows(obj_set, len(rows), obj_set_limit, count_strategy, count_cap)
+
+    if has_more is None and obj_set_limit:
+        if len(rows) < obj_set_limit:
+            has_more = False
+        elif isinstance(count, int):
+            has_more = count > len(rows)
 
     result = {
         "panel_name": panel_name,
@@ -245,11 +658,17 @@ def table_for(
         "add_url": add_url,
         "add_label": add_label,
         "count": count,
+        "has_more": has_more,
+        "load_more": keyset is not None,
+        "next_cursor": next_cursor,
+        "export_key": export_key,
     }
 
     # Include lazy_key in result so LazyFragmentView can find the panel
     if lazy_load_key:
         result["lazy_key"] = lazy_load_key
+        if lazy_cache:
+            result["lazy_cache"] = lazy_cache
 
     return result
 
@@ -257,51 +676,212 @@ def table_for(
 col = detail
 
 
-def fill_missing_values(obj, rows):
-    for row in rows:
-        if _is_present(row["value"]):
-            if callable(row["value"]):
-                ret = row["value"](obj)
-            else:
-                ret = row["value"]
-        else:
-            ret = attrgetter(row["col_name"])(obj)
+def _model_for(obj_set):
+    """Model class of a QuerySet's objects. Lists may mix types, so they get a generic plan."""
+    if isinstance(obj_set, QuerySet):
+        return obj_set.model
+    return None
+
+
+def _build_row(obj, cols, plan):
+    """Same keys as details_table_for(obj=obj, details=cols), using a precompiled plan."""
+    is_empty = _is_empty_obj(obj)
 
-            ret = _attempt_to_turn_into_link(row, obj, ret)
+    if obj and not is_empty:
+        cells = [Cell(column, column_plan.value_out(obj)) for column, column_plan in zip(cols, plan)]
+    else:
+        cells = [Cell(column) for column in cols]
 
-        if isinstance(ret, datetime):
-            ret = timezone.localtime(ret)
-            ret = formats.date_format(ret, TEMPLATE_TIME_FORMAT)
-        elif isinstance(ret, date):
-            ret = formats.date_format(ret, format="SHORT_DATE_FORMAT")
-        elif _is_money(ret) and humanize_money_with_currency is not None:
-            ret = humanize_money_with_currency(ret)
-        elif isinstance(ret, ImageFieldFile) and ret.name and ret.url:
-            ret = format_html('<img src="{}" style="max-width: 100px; max-height: 100px;">', ret.url)
-        elif ret is None:
-            ret = "-"
+    return Row(obj, cells, is_empty)
 
-        row["value_out"] = ret
+
+def fill_missing_values(obj, rows, plan=None):
+    """
+    Set row["value_out"] on each detail/col dict in rows for obj.
+
+    plan is the compiled column plan for rows (see _compile_column_plan). table_for
+    compiles it once per table and reuses it for every row; when omitted it is compiled
+    here from obj's model.
+    """
+    if plan is None:
+        plan = _compile_column_plan(rows, type(obj) if isinstance(obj, Model) else None)
+
+    for row, column_plan in zip(rows, plan):
+        row["value_out"] = column_plan.value_out(obj)
 
 
 # If the col name is "id/legal_name" or the result is an object with an admin path
 # turn it into a link
 AUTOLINK_COL_NAMES = ["id", "legal_name"]
 
+# Autolink decisions stored on a _ColumnPlan
+_AUTOLINK_ROW = "row"  # link the row object itself (AUTOLINK_COL_NAMES)
+_AUTOLINK_VALUE = "value"  # link the value when it turns out to be an object with an admin path
+
+
+class _ColumnPlan:
+    """
+    Everything fill_missing_values needs to know about one column, resolved once per table.
+
+    accessor: obj -> raw value (callable value, constant value or attrgetter of col_name)
+    autolink: None, _AUTOLINK_ROW or _AUTOLINK_VALUE
+    formatter: raw value -> value_out, picked from the model field type when known
+    """
+
+    __slots__ = ("col_name", "accessor", "autolink", "formatter")
+
+    def __init__(self, col_name, accessor, autolink, formatter):
+        self.col_name = col_name
+        self.accessor = accessor
+        self.autolink = autolink
+        self.formatter = formatter
 
-def _attempt_to_turn_into_link(row, orig_obj, orig_ret):
-    # Try to see if it's an object that has an admin path
-    # If so, turn it into a link
-    if row["col_name"] in AUTOLINK_COL_NAMES:
-        curr_obj = orig_obj
+    def value_out(self, obj):
+        ret = self.accessor(obj)
+
+        if self.autolink is _AUTOLINK_ROW:
+            ret = _try_auto_link(obj, ret)
+        elif self.autolink is _AUTOLINK_VALUE:
+            ret = _try_auto_link(ret, ret)
+
+        return self.formatter(ret)
+
+
+def _compile_column_plan(cols, model=None):
+    """Compile detail()/col() columns into one _ColumnPlan per column for objects of model."""
+    return [_compile_column(column, model) for column in cols]
+
+
+def _compile_column(column, model):
+    col_name = column["col_name"]
+    value = column["value"]
+
+    if _is_present(value):
+        accessor = value if callable(value) else _constant(value)
+        return _ColumnPlan(col_name, accessor, None, _format_value)
+
+    field = _resolve_model_field(model, col_name) if model is not None else None
+
+    if col_name in AUTOLINK_COL_NAMES:
+        autolink = _AUTOLINK_ROW
+    elif field is not None and not field.is_relation:
+        # Plain concrete values (str, int, datetime...) never have an admin path
+        autolink = None
     else:
-        # ELSE try to see if it's an object that has an admin path
-        curr_obj = orig_ret
+        autolink = _AUTOLINK_VALUE
+
+    return _ColumnPlan(col_name, attrgetter(col_name), autolink, _formatter_for_field(field, autolink))
+
+
+def _constant(value):
+    return lambda obj: value
+
+
+def _resolve_model_field(model, col_name):
+    """Follow a dotted col_name through model._meta, returning the final field or None."""
+    parts = col_name.split(".")
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except (FieldDoesNotExist, AttributeError):
+            return None
+
+        if index == len(parts) - 1:
+            # "company_id" resolves to the FK field but holds the raw id, not the related object
+            if field.is_relation and part != field.name:
+                return None
+            return field
+
+        model = field.related_model
+        if model is None:
+            return None
+
+    return None
+
 
-    try:
+def _formatter_for_field(field, autolink):
+    # Autolinked values may be replaced by an <a> tag, so only the generic chain is safe
+    if field is None or autolink is not None:
+        return _format_value
+    if isinstance(field, DateTimeField):
+        return _make_datetime_formatter()
+    if isinstance(field, DateField):
+        return _format_date
+    if isinstance(field, ImageField):
+        return _format_image
+    if field.is_relation or type(field).__module__.startswith("django.db.models"):
+        return _format_plain
+    # Third-party fields (e.g. MoneyField) may return anything
+    return _format_value
+
+
+def _format_value(ret):
+    if isinstance(ret, datetime):
+        return _format_datetime(ret)
+    elif isinstance(ret, date):
+        return _format_date(ret)
+    elif _is_money(ret) and humanize_money_with_currency is not None:
+        return humanize_money_with_currency(ret)
+    elif isinstance(ret, ImageFieldFile):
+        return _format_image(ret)
+    elif ret is None:
+        return "-"
+
+    return ret
+
+
+def _format_datetime(ret):
+    if ret is None:
+        return "-"
+
+    ret = timezone.localtime(ret)
+    return formats.date_format(ret, TEMPLATE_TIME_FORMAT)
+
+
+def _make_datetime_formatter():
+    """
+    _format_datetime with the current timezone and format string resolved up front,
+    so per-cell formatting skips the thread-local lookups localtime()/date_format() repeat.
+    """
+    current_timezone = timezone.get_current_timezone()
+    time_format = formats.get_format(TEMPLATE_TIME_FORMAT)
+
+    def format_datetime(ret):
+        if ret is None:
+            return "-"
+
+        ret = timezone.localtime(ret, current_timezone)
+        return dateformat.format(ret, time_format)
+
+    return format_datetime
+
+
+def _format_date(ret):
+    if ret is None:
+        return "-"
+
+    return formats.date_format(ret, format="SHORT_DATE_FORMAT")
+
+
+def _format_image(ret):
+    if ret is None:
+        return "-"
+    if ret.name and ret.url:
+        return format_html('<img src="{}" style="max-width: 100px; max-height: 100px;">', ret.url)
+
+    return ret
+
+
+def _format_plain(ret):
+    if ret is None:
+        return "-"
+
+    return ret
+
+
+def _try_auto_link(curr_obj, orig_ret):
+    if has_detail_url(curr_obj):
         return auto_link(curr_obj, "detail")
-    except Exception:
-        pass
 
     return orig_ret
 
@@ -421,3 +1001,34 @@ def top_menu_btn(
     )
     item["btn_class"] = btn_class
     return item
+
+
+def admin_action_btn(
+    obj,
+    action,
+    label=None,
+    *,
+    site_name="admin",
+    **kwargs,
+):
+    """
+    Helper to create a top menu button for one of obj's admin pages, e.g. "history".
+
+    Availability comes from the admin actions map (url_helpers.admin_actions_for), so no
+    URL is reversed for missing actions.
+
+    Args:
+        obj: Model instance
+        action: Admin action ("change", "delete", "history", ...)
+        label: Button text (default: the action, title-cased)
+        site_name: Admin site name (default: "admin")
+        **kwargs: Passed on to top_menu_btn
+
+    Returns:
+        Dict with button configuration, or None when obj's admin has no such page
+        (dropped from the menu by the template's filter_none)
+    """
+    if not admin_has_action(obj, action, site_name):
+        return None
+
+    return top_menu_btn(label or action.title(), admin_path_for(obj, action, site_name=site_name), **kwargs)
@@ -1,4 +1,5 @@
 import json
+from collections.abc import Mapping
 
 from django.conf import settings
 from django.core.serializers import serialize
@@ -8,9 +9,9 @@ from django.db.models.fields.files import FieldFile
 from django.db.models.query import QuerySet
 from django.template import Library
 from django.template.loader import get_template
-from django.urls import NoReverseMatch
 
-from djadmin_detail_view.defaults import EXCLUDE_BOOTSTRAP_TAGS
+from djadmin_detail_view.defaults import EXCLUDE_BOOTSTRAP_TAGS, NATIVE_RENDERER
+from djadmin_detail_view.layout import flatten_layout, render_layout_nodes
 from djadmin_detail_view.template_helpers import LazyFragment
 
 try:
@@ -18,7 +19,15 @@ try:
 except ImportError:
     Money = None
 
-from ..url_helpers import admin_lazy_path_for, admin_path_for, auto_link
+from ..url_helpers import (
+    admin_export_path_for,
+    admin_has_action,
+    admin_lazy_batch_path_for,
+    admin_lazy_more_path_for,
+    admin_lazy_path_for,
+    admin_path_for,
+    auto_link,
+)
 
 register = Library()
 
@@ -137,6 +146,9 @@ class CustomEncoder(DjangoJSONEncoder):
     def default(self, obj):
         if Money is not None and isinstance(obj, Money):
             return obj.amount
+        # Column, Row and Cell from template_helpers
+        if isinstance(obj, Mapping):
+            return dict(obj)
         return super().default(obj)
 
 
@@ -149,12 +161,7 @@ def jsonify(object):
 
 @register.simple_tag
 def check_simple_history(obj):
-    try:
-        admin_path_for(obj, "history")
-
-        return True
-    except NoReverseMatch:
-        return False
+    return admin_has_action(obj, "history")
 
 
 @register.filter
@@ -173,6 +180,26 @@ def include_dynamic_with(context, template_name, args_dict):
     return template_obj.render(new_context)
 
 
+@register.simple_tag(takes_context=True)
+def render_layout(context, layout):
+    """
+    Render a detail view's layout (rows, columns, headers and panels) in one pass.
+
+    Replaces walking the layout with nested _auto_row_col.html/_auto_col.html includes.
+
+    Usage in templates:
+        {% render_layout layout %}
+    """
+    nodes = flatten_layout(layout)
+
+    # Streaming detail pages render the layout after the rest of the page is sent
+    layout_stream = context.get("layout_stream")
+    if layout_stream is not None:
+        return layout_stream.capture(context, nodes)
+
+    return render_layout_nodes(context, nodes)
+
+
 @register.filter
 def is_lazy_fragment(value):
     """Check if value is a LazyFragment (lazy-loaded panel)."""
@@ -192,3 +219,82 @@ def get_lazy_url(obj, fragment):
         {% get_lazy_url object fragment as lazy_url %}
     """
     return admin_lazy_path_for(obj, fragment.lazy_key)
+
+
+@register.simple_tag
+def get_lazy_batch_url(obj):
+    """
+    Generate URL for loading several lazy fragments of obj in one request.
+
+    Usage in templates:
+        {% get_lazy_batch_url object as lazy_batch_url %}
+    """
+    return admin_lazy_batch_path_for(obj)
+
+
+@register.simple_tag
+def get_lazy_more_url(obj, object_list):
+    """
+    Generate URL for loading the rows after a load_more table_for panel's last row.
+
+    Usage in templates:
+        {% get_lazy_more_url object object_list as lazy_more_url %}
+    """
+    return admin_lazy_more_path_for(obj, object_list["lazy_key"], object_list["next_cursor"])
+
+
+@register.simple_tag
+def get_export_url(obj, object_list, export_format):
+    """
+    Generate URL for downloading every row of a table_for(exportable=True) panel, or
+    None when export_format isn't available (XLSX without xlsxwriter).
+
+    Usage in templates:
+        {% get_export_url object object_list "csv" as csv_export_url %}
+    """
+    # The exports module imports this one
+    from djadmin_detail_view.exports import export_formats
+
+    if export_format not in export_formats():
+        return None
+    return admin_export_path_for(obj, object_list["export_key"], export_format)
+
+
+# The renderers module imports this one, so it is imported where used.
+@register.simple_tag
+def render_native_object_list(object_list, obj):
+    """
+    object_list.html markup of a table_for() panel built in Python, or None when
+    DJADMIN_NATIVE_RENDERER is off and the template should render it.
+
+    Usage in templates:
+        {% render_native_object_list object_list object as native_html %}
+    """
+    if not NATIVE_RENDERER or not isinstance(object_list, dict):
+        return None
+
+    from djadmin_detail_view.renderers import render_object_list
+
+    return render_object_list(object_list, obj)
+
+
+@register.simple_tag
+def render_native_object_list_rows(object_list):
+    """_object_list_rows.html counterpart of render_native_object_list."""
+    if not NATIVE_RENDERER or not isinstance(object_list, dict):
+        return None
+
+    from djadmin_detail_view.renderers import render_object_list_rows
+
+    return render_object_list_rows(object_list)
+
+
+@register.simple_tag
+def render_native_object_details(object_details):
+    """object_details.html counterpart of render_native_object_list."""
+    if not NATIVE_RENDERER or not isinstance(object_details, dict):
+        return None
+
+    from djadmin_detail_view.renderers import render_object_details
+
+    return render_object_details(object_details)
@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+
+from djadmin_detail_view.instrumentation import OTHER, collect_timings
+from djadmin_detail_view.url_helpers import admin_lazy_path_for, admin_path_for
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_max_queries(max_queries, label="Block"):
+    """
+    Fail if the with block runs more than max_queries SQL queries.
+
+    The failure message breaks the queries down per table_for/details_table_for panel
+    (by lazy_load_key or panel_name) with their SQL, so an N+1 points at its col().
+    Yields the RequestTimings being filled.
+    """
+    with collect_timings(label, capture_sql=True) as timings:
+        yield timings
+
+    _check_budget(timings, max_queries, label)
+
+
+def assert_detail_view_queries(client, obj, max_queries, fragment_key=None, site_name="admin"):
+    """
+    GET obj's detail page, or its lazy panel fragment_key, with a logged-in test client
+    and fail if it runs more than max_queries SQL queries. Returns the response.
+
+    Usage:
+        def test_company_page_query_budget(self):
+            self.client.force_login(self.superuser)
+            assert_detail_view_queries(self.client, company, 12)
+            assert_detail_view_queries(self.client, company, 3, fragment_key="orders")
+    """
+    if fragment_key is None:
+        url = admin_path_for(obj, "detail", site_name=site_name)
+    else:
+        url = admin_lazy_path_for(obj, fragment_key, site_name=site_name)
+
+    with collect_timings(url, capture_sql=True) as timings:
+        response = client.get(url)
+
+    if response.status_code != 200:
+        raise AssertionError(f"{url} returned {response.status_code}, expected 200")
+
+    _check_budget(timings, max_queries, url)
+
+    return response
+
+
+def _check_budget(timings, max_queries, label):
+    if timings.queries <= max_queries:
+        return
+
+    lines = [f"{label} ran {timings.queries} queries, budget is {max_queries}:"]
+
+    # Heaviest panels first, queries outside any panel last
+    panels = sorted(timings.panels.values(), key=lambda panel: (panel.name == OTHER, -panel.queries))
+    for panel in panels:
+        name = "outside panels" if panel.name == OTHER else panel.name
+        lines.append(f"  {name}: {panel.queries} queries")
+        lines.extend(f"    {sql}" for sql in panel.sql)
+
+    raise QueryBudgetExceeded("\n".join(lines))
@@ -1,5 +1,10 @@
+from urllib.parse import urlencode
+from uuid import UUID
+from weakref import WeakKeyDictionary
+
 from django.apps import apps
-from django.urls import reverse
+from django.db.models import Model
+from django.urls import NoReverseMatch, get_resolver, get_script_prefix, get_urlconf, reverse
 from django.utils.html import format_html
 
 # Attempt to use hosts_reverse first.
@@ -11,6 +16,63 @@ except ImportError:
     hosts_reverse = None
 
 
+def has_detail_url(obj, site_name="admin"):
+    """Whether obj is a saved instance of a model with a detail URL. A map lookup; never raises."""
+    return isinstance(obj, Model) and obj.pk is not None and admin_has_action(type(obj), "detail", site_name)
+
+
+# Admin URLs probed by admin_actions_for(). Object-level actions take the pk.
+MODEL_ACTIONS = ("changelist", "add")
+OBJECT_ACTIONS = ("change", "delete", "history", "detail")
+
+# admin_actions_for() results per URL resolver, like _reversed_urls
+_admin_actions = WeakKeyDictionary()
+
+
+def admin_actions_for(model, site_name="admin"):
+    """
+    The admin actions ("changelist", "add", "change", "delete", "history", "detail")
+    with a URL for model (a model class, instance or "app_label.model" string).
+
+    Resolved once per model and URLconf, then served from a process-wide map, so
+    templates and menu helpers can check for e.g. a history page without reversing.
+    """
+    if isinstance(model, str):
+        model = _class_from_str(model)
+    elif not isinstance(model, type):
+        model = type(model)
+
+    resolver = get_resolver(get_urlconf())
+    actions_by_model = _admin_actions.get(resolver)
+    if actions_by_model is None:
+        actions_by_model = _admin_actions[resolver] = {}
+
+    key = (site_name, model)
+    actions = actions_by_model.get(key)
+    if actions is None:
+        actions = actions_by_model[key] = _probe_admin_actions(model, site_name)
+
+    return actions
+
+
+def admin_has_action(model, action, site_name="admin"):
+    """Whether model (class, instance or "app_label.model") has an admin URL for action."""
+    return action in admin_actions_for(model, site_name)
+
+
+def _probe_admin_actions(model, site_name):
+    actions = set()
+    for action in MODEL_ACTIONS + OBJECT_ACTIONS:
+        args = [_PLACEHOLDER_PK] if action in OBJECT_ACTIONS else []
+        try:
+            reverse(f"{site_name}:{admin_path_name(model, action)}", args=args)
+        except NoReverseMatch:
+            continue
+        actions.add(action)
+
+    return frozenset(actions)
+
+
 def admin_filtered_list_path_for(obj, **kwargs):
     path = admin_path_for(obj, action="changelist")
 
@@ -41,32 +103,23 @@ def admin_path_for(obj, action="change", site_name="admin"):
             action = "changelist"
 
     if action in ["add", "changelist", "search"]:
-        return reverse(f"{site_name}:{admin_path_name(obj, action=action)}")
+        return _memoized_reverse(f"{site_name}:{admin_path_name(obj, action=action)}")
 
-    return reverse(f"{site_name}:{admin_path_name(obj, action=action)}", args=[obj.id])
+    return _memoized_reverse(f"{site_name}:{admin_path_name(obj, action=action)}", pk=obj.id)
 
 
 def admin_url_for(obj, action="change", site_name="admin"):
     if hosts_reverse is None:
         if action in ["add", "changelist"]:
-            return reverse(f"{site_name}:{admin_path_name(obj, action=action)}")
+            return _memoized_reverse(f"{site_name}:{admin_path_name(obj, action=action)}")
 
-        return reverse(f"{site_name}:{admin_path_name(obj, action=action)}", args=[obj.id])
+        return _memoized_reverse(f"{site_name}:{admin_path_name(obj, action=action)}", pk=obj.id)
 
     else:
         if action in ["add", "changelist"]:
-            return hosts_reverse(
-                f"{site_name}:{admin_path_name(obj, action=action)}",
-                host=HOST_NAME_FOR_ADMIN,
-                scheme="https",
-            )
+            return _memoized_reverse(f"{site_name}:{admin_path_name(obj, action=action)}", hosts=True)
 
-        return hosts_reverse(
-            f"{site_name}:{admin_path_name(obj, action=action)}",
-            args=[obj.id],
-            host=HOST_NAME_FOR_ADMIN,
-            scheme="https",
-        )
+        return _memoized_reverse(f"{site_name}:{admin_path_name(obj, action=action)}", pk=obj.id, hosts=True)
 
 
 def admin_path_name(klass, action="change"):
@@ -96,7 +149,142 @@ def admin_lazy_path_for(obj, fragment_key, site_name="admin"):
     app_label = obj._meta.app_label
     model_name = obj._meta.model_name
 
-    return reverse(
+    return _memoized_reverse(
         f"{site_name}:{app_label}_{model_name}_lazy_fragment",
-        kwargs={"pk": obj.pk, "fragment_key": fragment_key},
+        pk=obj.pk,
+        kwargs={"fragment_key": fragment_key},
+    )
+
+
+def admin_lazy_batch_path_for(obj, site_name="admin"):
+    """
+    Generate URL for loading several lazy fragments in one request.
+
+    Args:
+        obj: Model instance
+        site_name: Admin site name (default: "admin")
+
+    Returns:
+        URL path for the batch lazy fragment endpoint. Append one `key` query
+        parameter per lazy_key to load.
+    """
+    app_label = obj._meta.app_label
+    model_name = obj._meta.model_name
+
+    return _memoized_reverse(
+        f"{site_name}:{app_label}_{model_name}_lazy_fragment_batch",
+        pk=obj.pk,
+        kwargs={},
     )
+
+
+def admin_lazy_more_path_for(obj, fragment_key, cursor, site_name="admin"):
+    """
+    Generate URL for loading the next page of rows of a load_more table_for panel.
+
+    Args:
+        obj: Model instance
+        fragment_key: The lazy_key used in table_for
+        cursor: The panel's next_cursor
+        site_name: Admin site name (default: "admin")
+
+    Returns:
+        URL path for the lazy fragment "more" endpoint, including the cursor
+    """
+    app_label = obj._meta.app_label
+    model_name = obj._meta.model_name
+
+    path = _memoized_reverse(
+        f"{site_name}:{app_label}_{model_name}_lazy_fragment_more",
+        pk=obj.pk,
+        kwargs={"fragment_key": fragment_key},
+    )
+
+    return f"{path}?{urlencode({'cursor': cursor})}"
+
+
+def admin_export_path_for(obj, export_key, export_format="csv", site_name="admin"):
+    """
+    Generate URL for downloading every row of an exportable table_for panel.
+
+    Args:
+        obj: Model instance
+        export_key: The panel's export_key (its lazy_load_key, else its slugified panel_name)
+        export_format: "csv" or "xlsx"
+        site_name: Admin site name (default: "admin")
+
+    Returns:
+        URL path for the panel export endpoint, including the format
+    """
+    app_label = obj._meta.app_label
+    model_name = obj._meta.model_name
+
+    path = _memoized_reverse(
+        f"{site_name}:{app_label}_{model_name}_panel_export",
+        pk=obj.pk,
+        kwargs={"fragment_key": export_key},
+    )
+
+    return f"{path}?{urlencode({'format': export_format})}"
+
+
+# Reversed URLs per URL resolver. get_resolver() hands out a new resolver whenever the
+# URLconf changes or clear_url_caches() runs (e.g. ROOT_URLCONF overridden in tests),
+# which drops the old resolver's entries with it.
+_reversed_urls = WeakKeyDictionary()
+
+# Reversed in place of the pk, then replaced by each object's pk. Digits, so int path
+# converters accept it too.
+_PLACEHOLDER_PK = 9081726354453627189
+
+
+def _memoized_reverse(viewname, pk=None, kwargs=None, hosts=False):
+    """
+    reverse(viewname) memoized per URL pattern.
+
+    URLs without a pk are cached as is. URLs with a pk are reversed once with a
+    placeholder pk and the object's pk is substituted in afterwards, which skips the
+    resolver walk of reverse() for every row of a table. The pk goes in args, or in
+    kwargs["pk"] when kwargs is given. pks other than ints and UUIDs, which reverse()
+    might quote, are always reversed directly.
+    """
+    if pk is not None and (isinstance(pk, bool) or not isinstance(pk, (int, UUID))):
+        return _reverse(viewname, pk, kwargs, hosts)
+
+    resolver = get_resolver(get_urlconf())
+    cache = _reversed_urls.get(resolver)
+    if cache is None:
+        cache = _reversed_urls[resolver] = {}
+
+    kwargs_key = None if kwargs is None else tuple(sorted(kwargs.items()))
+    key = (get_script_prefix(), viewname, pk is None, kwargs_key, hosts)
+    try:
+        template = cache[key]
+    except KeyError:
+        if pk is None:
+            template = _reverse(viewname, None, kwargs, hosts)
+        else:
+            parts = _reverse(viewname, _PLACEHOLDER_PK, kwargs, hosts).split(str(_PLACEHOLDER_PK))
+            # The placeholder must show up exactly once to be substituted
+            template = tuple(parts) if len(parts) == 2 else None
+        cache[key] = template
+
+    if pk is None:
+        return template
+    if template is None:
+        return _reverse(viewname, pk, kwargs, hosts)
+
+    return f"{template[0]}{pk}{template[1]}"
+
+
+def _reverse(viewname, pk, kwargs, hosts):
+    reverse_kwargs = {}
+    if kwargs is not None:
+        reverse_kwargs["kwargs"] = kwargs if pk is None else {**kwargs, "pk": pk}
+    elif pk is not None:
+        reverse_kwargs["args"] = [pk]
+
+    if hosts:
+        return hosts_reverse(viewname, host=HOST_NAME_FOR_ADMIN, scheme="https", **reverse_kwargs)
+
+    return reverse(viewname, **reverse_kwargs)
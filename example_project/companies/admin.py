@@ -1,14 +1,17 @@
 from django.contrib import admin
+from django.db.models import Count, Max
 from django.views.generic import DetailView
 from moneyed import Money
 from simple_history.admin import SimpleHistoryAdmin
 
 from djadmin_detail_view.mixins import AdminChangeListViewDetail, AdminDetailMixin
 from djadmin_detail_view.template_helpers import (
+    admin_action_btn,
     col,
     detail,
     details_table_for,
     dropdown_item,
+    lazy_panel,
     table_for,
     top_menu_btn,
 )
@@ -55,6 +58,7 @@ class CompanyDetailView(AdminDetailMixin, DetailView):
                 col("is_active"),
                 col("none", value=lambda x: None),
             ],
+            exportable=True,
         )
 
         contact_list_empty = table_for(
@@ -72,12 +76,15 @@ class CompanyDetailView(AdminDetailMixin, DetailView):
             ],
         )
 
-        # Lazy-loaded contact list
-        contact_list_lazy = table_for(
-            panel_name="Lazy Loaded Contacts",
-            obj_set=self.object.contact_set.all(),
-            cols=[col("id"), col("name"), col("email")],
-            lazy_load_key="lazy_contacts",
+        # Lazy-loaded contact list, built on its own by the lazy endpoint
+        contact_list_lazy = self.lazy_contact_list()
+
+        # Lazy-loaded details panel, loaded in the same batch request as the contact list
+        company_details_lazy = details_table_for(
+            panel_name="Lazy Loaded Company Details",
+            obj=self.object,
+            details=[detail("id"), detail("name"), detail("website")],
+            lazy_load_key="lazy_company_details",
         )
 
         ctx["top_menu_buttons"] = [
@@ -87,9 +94,10 @@ class CompanyDetailView(AdminDetailMixin, DetailView):
                 btn_class="btn-primary",
                 target="_blank",
             ),
-            top_menu_btn(
+            admin_action_btn(
+                self.object,
+                "delete",
                 "Archive",
-                url=f"/admin/companies/company/{self.object.id}/delete/",
                 confirm="Are you sure you want to archive this company?",
             ),
         ]
@@ -125,12 +133,30 @@ class CompanyDetailView(AdminDetailMixin, DetailView):
             {
                 "row": [
                     {"col": contact_list_lazy},
+                    {"col": company_details_lazy},
                 ],
             },
         ]
 
         return ctx
 
+    @lazy_panel("lazy_contacts", etag=lambda view: view.contacts_version())
+    def lazy_contact_list(self):
+        return table_for(
+            panel_name="Lazy Loaded Contacts",
+            obj_set=self.object.contact_set.order_by("name"),
+            obj_set_limit=5,
+            cols=[col("id"), col("name"), col("email")],
+            lazy_load_key="lazy_contacts",
+            load_more=True,
+            lazy_cache_ttl=300,
+            exportable=True,
+        )
+
+    def contacts_version(self):
+        # Count catches deletions, which don't move the latest updated_at
+        return self.object.contact_set.aggregate(Max("updated_at"), Count("pk"))
+
 
 @admin.register(Contact)
 class ContactAdmin(AdminChangeListViewDetail, SimpleHistoryAdmin):
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CompaniesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "example_project.companies"
+
+    def ready(self):
+        from djadmin_detail_view.fragment_cache import invalidate_lazy_fragments_on_change
+
+        from .models import Company, Contact
+
+        # The company page caches its lazy contact list (lazy_cache_ttl)
+        invalidate_lazy_fragments_on_change(Company)
+        invalidate_lazy_fragments_on_change(Contact, lambda contact: contact.company)
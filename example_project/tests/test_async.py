@@ -0,0 +1,235 @@
+import json
+import threading
+from unittest.mock import patch
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib import admin
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.messages.storage import default_storage
+from django.test import AsyncRequestFactory, RequestFactory, TransactionTestCase
+
+from djadmin_detail_view import AsyncAdminDetailMixin, DeferredPanel, col, table_for
+from djadmin_detail_view.concurrency import aresolve_deferred_panels, map_in_workers, submit_deferred_panels
+from djadmin_detail_view.template_helpers import _rendering_lazy_panel, reset_lazy_key_tracking
+from example_project.companies.admin import CompanyAdmin, CompanyDetailView
+from example_project.companies.models import Company, Contact
+
+
+class DeferredContactsMixin:
+    def get_context_data(self, request, *args, **kwargs):
+        ctx = super().get_context_data(request, *args, **kwargs)
+        ctx["layout"] = ctx["layout"] + [
+            {"row": [{"col": DeferredPanel(self.contacts, "Ann")}, {"col": DeferredPanel(self.contacts, "Bob")}]}
+        ]
+        return ctx
+
+    def contacts(self, name):
+        return table_for(
+            panel_name=f"Deferred {name}",
+            obj_set=self.object.contact_set.filter(name=name),
+            cols=[col("name"), col("email")],
+        )
+
+
+class AsyncCompanyDetailView(AsyncAdminDetailMixin, DeferredContactsMixin, CompanyDetailView):
+    pass
+
+
+class AsyncCompanyAdmin(CompanyAdmin):
+    def get_default_detail_view(self):
+        return AsyncCompanyDetailView
+
+
+# Worker threads use their own DB connections, which can't see a TestCase's transaction
+class TestAsyncDetailView(TransactionTestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        for name in ["Ann", "Bob"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email=f"{name}@test.com")
+        self.user = User.objects.create_superuser(username="admin", email="admin@test.com", password="adminpass")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def request(self, user=None, **query):
+        request = AsyncRequestFactory().get("/", query)
+        request.user = user or self.user
+        request.session = {}
+        request._messages = default_storage(request)
+        return request
+
+    async def test_renders_deferred_panels_concurrently(self):
+        # Both panels must be running at once to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        contacts = AsyncCompanyDetailView.contacts
+
+        def waiting_contacts(view, name):
+            barrier.wait()
+            return contacts(view, name)
+
+        view = AsyncCompanyDetailView.as_view(admin_obj=admin.site._registry[Company])
+        with patch.object(AsyncCompanyDetailView, "contacts", waiting_contacts):
+            response = await view(self.request(), pk=self.company.pk)
+
+        content = response.content.decode()
+        assert response.status_code == 200
+        assert content.index("Deferred Ann") < content.index("Deferred Bob")
+        assert "Bob@test.com" in content
+
+    async def test_streams_asynchronously(self):
+        class StreamingAsyncView(AsyncCompanyDetailView):
+            streaming = True
+
+        barrier = threading.Barrier(2, timeout=5)
+        contacts = AsyncCompanyDetailView.contacts
+
+        def waiting_contacts(view, name):
+            barrier.wait()
+            return contacts(view, name)
+
+        view = StreamingAsyncView.as_view(admin_obj=admin.site._registry[Company])
+        with patch.object(AsyncCompanyDetailView, "contacts", waiting_contacts):
+            response = await view(self.request(), pk=self.company.pk)
+            assert response.is_async
+            content = b"".join([chunk async for chunk in response.streaming_content]).decode()
+
+        assert content.index("Deferred Ann") < content.index("Deferred Bob")
+        assert "Bob@test.com" in content
+
+    async def test_resolve_keeps_layout_order(self):
+        layout = [
+            {"row": [{"col": DeferredPanel(lambda: "first")}, {"col": "plain"}]},
+            [{"row": [{"col": [{"row": [{"col": DeferredPanel(lambda: "second")}]}]}]}],
+        ]
+
+        await aresolve_deferred_panels(layout)
+
+        assert layout[0]["row"][0]["col"] == "first"
+        assert layout[1][0]["row"][0]["col"][0]["row"][0]["col"] == "second"
+
+    def test_urls_are_async(self):
+        urls = {url.name: url for url in AsyncCompanyAdmin(Company, admin.site).get_urls() if url.name}
+
+        assert iscoroutinefunction(urls["companies_company_detail"].callback)
+        assert iscoroutinefunction(urls["companies_company_lazy_fragment"].callback)
+        assert iscoroutinefunction(urls["companies_company_lazy_fragment_batch"].callback)
+
+    async def test_async_admin_view_requires_admin(self):
+        urls = {url.name: url for url in AsyncCompanyAdmin(Company, admin.site).get_urls() if url.name}
+
+        response = await urls["companies_company_detail"].callback(
+            self.request(user=AnonymousUser()), pk=self.company.pk
+        )
+
+        assert response.status_code == 302
+        assert "/admin/login/" in response["Location"]
+
+    async def test_batch_builds_panels(self):
+        urls = {url.name: url for url in AsyncCompanyAdmin(Company, admin.site).get_urls() if url.name}
+        request = self.request(key=["lazy_contacts", "missing"])
+
+        response = await urls["companies_company_lazy_fragment_batch"].callback(request, pk=self.company.pk)
+
+        data = json.loads(response.content)
+        assert "Bob" in data["fragments"]["lazy_contacts"]
+        assert data["missing"] == ["missing"]
+
+
+class ParallelCompanyDetailView(DeferredContactsMixin, CompanyDetailView):
+    parallel_panels = True
+
+
+class ParallelCompanyAdmin(CompanyAdmin):
+    def get_default_detail_view(self):
+        return ParallelCompanyDetailView
+
+
+class TestParallelPanels(TransactionTestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        for name in ["Ann", "Bob"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email=f"{name}@test.com")
+        self.user = User.objects.create_superuser(username="admin", email="admin@test.com", password="adminpass")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def request(self, **query):
+        request = RequestFactory().get("/", query)
+        request.user = self.user
+        request.session = {}
+        request._messages = default_storage(request)
+        return request
+
+    def barrier_contacts(self, parties):
+        # All panels must be running at once to get past the barrier
+        barrier = threading.Barrier(parties, timeout=5)
+        contacts = ParallelCompanyDetailView.contacts
+
+        def waiting_contacts(view, name):
+            barrier.wait()
+            return contacts(view, name)
+
+        return patch.object(ParallelCompanyDetailView, "contacts", waiting_contacts)
+
+    def test_builds_deferred_panels_in_parallel(self):
+        view = ParallelCompanyDetailView.as_view(admin_obj=admin.site._registry[Company])
+        with self.barrier_contacts(2):
+            content = view(self.request(), pk=self.company.pk).render().content.decode()
+
+        assert content.index("Deferred Ann") < content.index("Deferred Bob")
+        assert "Bob@test.com" in content
+
+    def test_streams_in_layout_order(self):
+        class StreamingParallelView(ParallelCompanyDetailView):
+            streaming = True
+
+        view = StreamingParallelView.as_view(admin_obj=admin.site._registry[Company])
+        with self.barrier_contacts(2):
+            content = b"".join(view(self.request(), pk=self.company.pk).streaming_content).decode()
+
+        assert content.index("Deferred Ann") < content.index("Deferred Bob")
+
+    def test_map_in_workers_copies_contextvars(self):
+        token = _rendering_lazy_panel.set(True)
+        try:
+            results = map_in_workers([_rendering_lazy_panel.get, lambda: threading.current_thread().name])
+        finally:
+            _rendering_lazy_panel.reset(token)
+
+        assert results[0] is True
+        assert results[1].startswith("djadmin-panel")
+
+    def test_panel_errors_propagate(self):
+        layout = [{"row": [{"col": DeferredPanel(lambda: 1 / 0)}]}]
+
+        submit_deferred_panels(layout)
+
+        with self.assertRaises(ZeroDivisionError):
+            layout[0]["row"][0]["col"].resolve()
+
+    def test_batch_builds_panels(self):
+        urls = {url.name: url for url in ParallelCompanyAdmin(Company, admin.site).get_urls() if url.name}
+        request = self.request(key=["lazy_contacts", "missing"])
+
+        response = urls["companies_company_lazy_fragment_batch"].callback(request, pk=self.company.pk)
+
+        data = json.loads(response.content)
+        assert "Bob" in data["fragments"]["lazy_contacts"]
+        assert data["missing"] == ["missing"]
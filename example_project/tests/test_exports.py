@@ -0,0 +1,130 @@
+import csv
+import io
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.html import format_html
+
+from djadmin_detail_view import admin_export_path_for, admin_lazy_path_for, col, exports, table_for
+from djadmin_detail_view.exports import export_value, iter_export_rows
+from djadmin_detail_view.template_helpers import _exporting_panel, reset_lazy_key_tracking
+from example_project.companies.models import Company, Contact
+
+
+class TestPanelExport(TestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        for name in ["Ann", "Bob", "Cat", "Dan", "Eve", "Fay", "=SUM(A1)"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email=f"{name}@test.com")
+        self.client.force_login(
+            User.objects.create_superuser(username="admin", email="admin@test.com", password="adminpass")
+        )
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+
+    def read_csv(self, response):
+        return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    def test_csv_streams_every_row(self):
+        # lazy_contacts shows 5 rows per page; the export ignores obj_set_limit and the fragment cache
+        self.client.get(admin_lazy_path_for(self.company, "lazy_contacts"))
+
+        response = self.client.get(admin_export_path_for(self.company, "lazy_contacts"))
+
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert f'filename="company-{self.company.pk}-lazy_contacts.csv"' in response["Content-Disposition"]
+        rows = self.read_csv(response)
+        assert rows[0] == ["Id", "Name", "Email"]
+        assert [row[1] for row in rows[1:]] == ["'=SUM(A1)", "Ann", "Bob", "Cat", "Dan", "Eve", "Fay"]
+        assert rows[2][0] == str(Contact.objects.get(name="Ann"))
+
+    def test_panel_name_key(self):
+        response = self.client.get(admin_export_path_for(self.company, "contact-list"))
+
+        rows = self.read_csv(response)
+        assert len(rows) == 8
+        assert rows[1][-1] == "-"
+
+    def test_only_exportable_panels(self):
+        for key in ["lazy_company_details", "empty-list", "missing"]:
+            assert self.client.get(admin_export_path_for(self.company, key)).status_code == 404
+
+        assert self.client.get(admin_export_path_for(self.company, "contact-list", "pdf")).status_code == 404
+
+    def test_page_links_exports(self):
+        content = self.client.get(f"/admin/companies/company/{self.company.pk}/").content.decode()
+
+        assert f'href="{admin_export_path_for(self.company, "contact-list")}">CSV</a>' in content
+
+    @skipUnless(exports.xlsxwriter, "xlsxwriter is not installed")
+    def test_xlsx(self):
+        response = self.client.get(admin_export_path_for(self.company, "contact-list", "xlsx"))
+
+        assert response["Content-Type"] == exports.XLSX_CONTENT_TYPE
+        assert b"".join(response.streaming_content).startswith(b"PK")
+
+    def test_xlsx_needs_xlsxwriter(self):
+        with patch.object(exports, "xlsxwriter", None):
+            response = self.client.get(admin_export_path_for(self.company, "contact-list", "xlsx"))
+            content = self.client.get(f"/admin/companies/company/{self.company.pk}/").content.decode()
+
+        assert response.status_code == 404
+        assert ">XLSX</a>" not in content
+
+    def test_export_spec_skips_rows_query(self):
+        token = _exporting_panel.set("contacts")
+        try:
+            with self.assertNumQueries(0):
+                panel = table_for(
+                    panel_name="Contacts",
+                    obj_set=Contact.objects.filter(company=self.company),
+                    cols=[col("name")],
+                    exportable=True,
+                )
+        finally:
+            _exporting_panel.reset(token)
+
+        assert "rows" not in panel
+        with self.assertNumQueries(1):
+            assert len(list(iter_export_rows(panel))) == 8
+
+    def test_formats_with_the_request_timezone(self):
+        token = _exporting_panel.set("contacts")
+        try:
+            panel = table_for(
+                panel_name="Contacts",
+                obj_set=Contact.objects.filter(company=self.company),
+                cols=[col("created_at")],
+                exportable=True,
+            )
+        finally:
+            _exporting_panel.reset(token)
+
+        with timezone.override("Asia/Tokyo"):
+            expected = list(iter_export_rows(panel))
+            rows = iter_export_rows(panel)
+
+        with timezone.override("America/New_York"):
+            assert list(rows) == expected
+
+    def test_export_values(self):
+        assert export_value(format_html('<a href="/x/">{}</a>', "A & B")) == "A & B"
+        assert export_value({"a": 1}) == '{"a": 1}'
+        assert export_value(None) == ""
+        assert export_value(3) == 3
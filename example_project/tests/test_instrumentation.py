@@ -0,0 +1,106 @@
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from djadmin_detail_view import instrumentation
+from djadmin_detail_view.template_helpers import reset_lazy_key_tracking
+from djadmin_detail_view.url_helpers import admin_lazy_batch_path_for, admin_lazy_path_for, admin_path_for
+from example_project.companies.models import Company, Contact
+
+
+def recording_hook(request, report):
+    recording_hook.reports.append(report)
+
+
+recording_hook.reports = []
+
+
+@patch.object(instrumentation, "INSTRUMENTATION_ENABLED", True)
+class TestInstrumentation(TestCase):
+    """Test per-panel timings on detail pages and lazy fragments."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+        recording_hook.reports = []
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        Contact.objects.create(
+            company=self.company,
+            name="John Doe",
+            phone="555-5678",
+            email="john@test.com",
+        )
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass",
+        )
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+
+    def test_lazy_fragment_server_timing(self):
+        response = self.client.get(admin_lazy_path_for(self.company, "lazy_contacts"))
+
+        server_timing = response.headers["Server-Timing"]
+        assert "panel-lazy_contacts;dur=" in server_timing
+        assert 'desc="lazy_contacts: 1 queries' in server_timing
+        assert "total;dur=" in server_timing
+
+    def test_detail_page_reports_every_panel(self):
+        with patch.object(instrumentation, "INSTRUMENTATION_HOOK", f"{__name__}.recording_hook"):
+            response = self.client.get(admin_path_for(self.company, "detail"))
+
+        assert "Server-Timing" in response.headers
+        (report,) = recording_hook.reports
+        panels = {panel["name"]: panel for panel in report["panels"]}
+        assert "Company Details" in panels
+        assert panels["Company Details"]["fill_time"] > 0
+        assert panels["Company Details"]["render_time"] > 0
+        # Lazy placeholders are not reported
+        assert "lazy_contacts" not in panels
+        assert report["render_time"] > 0
+        assert report["queries"] == sum(panel["queries"] for panel in report["panels"])
+
+    def test_batch_reports_render_time_per_panel(self):
+        with patch.object(instrumentation, "INSTRUMENTATION_HOOK", f"{__name__}.recording_hook"):
+            self.client.get(
+                admin_lazy_batch_path_for(self.company), {"key": ["lazy_contacts", "lazy_company_details"]}
+            )
+
+        panels = {panel["name"]: panel for panel in recording_hook.reports[0]["panels"]}
+        assert panels["lazy_contacts"]["render_time"] > 0
+        assert panels["lazy_company_details"]["render_time"] > 0
+
+    def test_logs_report(self):
+        with self.assertLogs("djadmin_detail_view.performance", level="INFO") as logs:
+            self.client.get(admin_lazy_path_for(self.company, "lazy_contacts"))
+
+        assert "LazyFragmentView" in logs.output[0]
+        assert logs.records[0].djadmin_timings["panels"]
+
+
+class TestInstrumentationDisabled(TestCase):
+    def test_no_header_or_collection(self):
+        company = Company.objects.create(
+            name="Test Company", address="", phone="", email="", website="", description=""
+        )
+        user = User.objects.create_superuser(username="admin", email="admin@test.com", password="adminpass")
+        self.client.force_login(user)
+
+        with patch.object(instrumentation, "_report", Mock()) as report:
+            response = self.client.get(admin_lazy_path_for(company, "lazy_contacts"))
+
+        assert "Server-Timing" not in response.headers
+        report.assert_not_called()
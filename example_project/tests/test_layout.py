@@ -0,0 +1,168 @@
+import re
+from unittest.mock import patch
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.messages.storage import default_storage
+from django.template import engines
+from django.test import RequestFactory, TestCase
+from django.utils.html import format_html
+
+from djadmin_detail_view import DeferredPanel, LazyFragment, col, detail, details_table_for, table_for
+from djadmin_detail_view.layout import BLANK, CLOSE, COL, DETAILS, HEADER, ROW, TABLE, VALUE, flatten_layout
+from djadmin_detail_view.template_helpers import reset_lazy_key_tracking
+from example_project.companies.admin import CompanyDetailView
+from example_project.companies.models import Company, Contact
+
+INCLUDE_CHAIN = (
+    "{% load djadmin_tags %}"
+    "{% for item in layout %}{% include 'admin/djadmin_components/_auto_row_col.html' with item=item %}{% endfor %}"
+)
+RENDER_LAYOUT = "{% load djadmin_tags %}{% render_layout layout %}"
+
+
+def normalize(html):
+    return re.sub(r">\s+<", "><", re.sub(r"\s+", " ", html)).strip()
+
+
+class TestLayout(TestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        Contact.objects.create(company=self.company, name="John", phone="555-5678", email="c@test.com")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def layout(self):
+        details = details_table_for(panel_name="Company", obj=self.company, details=[detail("name")])
+        contacts = table_for(panel_name="Contacts", obj_set=self.company.contact_set.all(), cols=[col("name")])
+        return [
+            {"header": "Overview <1>"},
+            {"row": [{"col": details}, {"col": contacts}]},
+            {
+                "row": [
+                    {"col": LazyFragment(lazy_key="lazy_details", panel_name="Lazy", fragment_type="details")},
+                    {"col": LazyFragment(lazy_key="lazy_table", panel_name="Lazy table")},
+                    {"col": None},
+                ]
+            },
+            [
+                {"row": [{"col": "Plain <text>"}, {"col": format_html("<b>{}</b>", "objective rows")}]},
+                {"row": [{"col": [{"row": [{"col": details}]}, {"header": "Nested"}]}]},
+            ],
+            {"row": [{"col": {"preview_file": None}}]},
+            {
+                "row": [
+                    {"col": {"partial": "admin/djadmin_components/preview_file.html", "with_args": {"file": None}}},
+                    {"col": {"partial": "admin/djadmin_components/_auto_header.html"}, "header": ""},
+                ]
+            },
+            {},
+        ]
+
+    def render(self, source, layout):
+        return engines["django"].from_string(source).render({"layout": layout, "object": self.company})
+
+    def test_flatten_layout(self):
+        kinds = [node.kind for node in flatten_layout(self.layout())]
+
+        assert kinds[:9] == [HEADER, ROW, COL, DETAILS, CLOSE, COL, TABLE, CLOSE, CLOSE]
+        assert kinds[9:18] == [ROW, COL, DETAILS, CLOSE, COL, TABLE, CLOSE, COL, BLANK]
+        assert kinds[20:25] == [ROW, COL, VALUE, CLOSE, COL]
+
+    def test_html_columns_are_values(self):
+        # Strings containing "obj" or "rows" are not mistaken for panels
+        [_, node, _] = flatten_layout([{"col": format_html("<b>{}</b>", "objective rows")}])
+
+        assert node.kind is VALUE
+
+    def test_matches_include_chain(self):
+        layout = self.layout()
+        # The strings of the old chain's {% elif 'obj' in item.col %} checks render as panels there
+        expected_layout = layout[:3] + [[{"row": [{"col": "Plain <text>"}]}, layout[3][1]]] + layout[4:]
+
+        expected = normalize(self.render(INCLUDE_CHAIN, expected_layout))
+        actual = normalize(self.render(RENDER_LAYOUT, expected_layout))
+
+        assert actual == expected
+        assert "Overview &lt;1&gt;" in actual
+        assert "Plain &lt;text&gt;" in actual
+        assert "No file has been uploaded." in actual
+
+
+class StreamingCompanyDetailView(CompanyDetailView):
+    streaming = True
+
+    def get_context_data(self, request, *args, **kwargs):
+        ctx = super().get_context_data(request, *args, **kwargs)
+        ctx["layout"] = ctx["layout"] + [{"row": [{"col": DeferredPanel(self.deferred_contacts)}]}]
+        return ctx
+
+    def deferred_contacts(self):
+        self.built_deferred = True
+        return table_for(panel_name="Deferred Contacts", obj_set=self.object.contact_set.all(), cols=[col("name")])
+
+
+class TestStreamingDetailView(TestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        Contact.objects.create(company=self.company, name="John", phone="555-5678", email="c@test.com")
+        self.user = User.objects.create_superuser(username="admin", email="admin@test.com", password="adminpass")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def get(self, view_class):
+        reset_lazy_key_tracking()
+        request = RequestFactory().get("/")
+        request.user = self.user
+        request.session = {}
+        request._messages = default_storage(request)
+        view = view_class.as_view(admin_obj=admin.site._registry[Company])
+        return view(request, pk=self.company.pk)
+
+    def test_streams_page(self):
+        with patch.object(StreamingCompanyDetailView, "deferred_contacts", autospec=True) as deferred_contacts:
+            deferred_contacts.return_value = {"obj": self.company, "obj_details": [], "is_empty": False}
+            response = self.get(StreamingCompanyDetailView)
+            chunks = iter(response.streaming_content)
+
+            head = next(chunks).decode()
+            assert response.streaming
+            assert "menu-top" in head
+            assert "Contact List" not in head
+            assert not deferred_contacts.called
+
+            rest = b"".join(chunks).decode()
+            assert deferred_contacts.called
+
+        assert "Contact List" in rest
+        assert rest.rstrip().endswith("</html>")
+
+    def test_streamed_layout_matches_rendered_layout(self):
+        streamed = b"".join(self.get(StreamingCompanyDetailView).streaming_content).decode()
+
+        class RenderedCompanyDetailView(StreamingCompanyDetailView):
+            streaming = False
+
+        rendered = self.get(RenderedCompanyDetailView).render().content.decode()
+
+        assert "Deferred Contacts" in streamed
+        csrf_token = re.compile(r'name="csrfmiddlewaretoken" value="[^"]*"')
+        assert normalize(csrf_token.sub("", streamed)) == normalize(csrf_token.sub("", rendered))
@@ -1,19 +1,33 @@
+from unittest.mock import patch
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.views.generic import DetailView
 
 from djadmin_detail_view import (
     AdminDetailMixin,
     LazyFragment,
+    LazyFragmentView,
     col,
     detail,
     details_table_for,
     table_for,
 )
-from djadmin_detail_view.template_helpers import reset_lazy_key_tracking
-from djadmin_detail_view.url_helpers import admin_lazy_path_for
+from djadmin_detail_view.fragment_cache import invalidate_lazy_fragments, lazy_fragment_cache_key
+from djadmin_detail_view.query_helpers import keyset_cursor
+from djadmin_detail_view.template_helpers import _rendering_lazy_panel, reset_lazy_key_tracking
+from djadmin_detail_view.url_helpers import (
+    admin_lazy_batch_path_for,
+    admin_lazy_more_path_for,
+    admin_lazy_path_for,
+    admin_path_for,
+)
+from example_project.companies.admin import CompanyDetailView
 from example_project.companies.models import Company, Contact
 
 
@@ -237,6 +251,398 @@ class TestLazyLoadIntegration(TestCase):
         pass
 
 
+class TestLazyFragmentBatchView(TestCase):
+    """Test the batch endpoint that renders several lazy panels in one request."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        Contact.objects.create(
+            company=self.company,
+            name="John Doe",
+            phone="555-5678",
+            email="john@test.com",
+        )
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass",
+        )
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def test_batch_url_generation(self):
+        url = admin_lazy_batch_path_for(self.company)
+        assert url.endswith(f"/{self.company.pk}/lazy/")
+
+    def test_batch_renders_all_requested_panels(self):
+        url = admin_lazy_batch_path_for(self.company)
+        response = self.client.get(url, {"key": ["lazy_contacts", "lazy_company_details"]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["fragments"]) == {"lazy_contacts", "lazy_company_details"}
+        assert "John Doe" in data["fragments"]["lazy_contacts"]
+        assert "https://test.com" in data["fragments"]["lazy_company_details"]
+        assert data["missing"] == []
+
+    def test_batch_matches_single_fragment_html(self):
+        single = self.client.get(admin_lazy_path_for(self.company, "lazy_contacts"))
+        batch = self.client.get(admin_lazy_batch_path_for(self.company), {"key": "lazy_contacts"})
+
+        assert batch.json()["fragments"]["lazy_contacts"] == single.content.decode()
+
+    def test_batch_builds_context_once(self):
+        """All panels of a batch share one object lookup and one context build."""
+        url = admin_lazy_batch_path_for(self.company)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {"key": ["lazy_contacts", "lazy_company_details"]})
+
+        object_lookups = [q for q in queries if 'FROM "companies_company"' in q["sql"]]
+        assert len(object_lookups) == 1
+
+    def test_batch_reports_missing_keys(self):
+        url = admin_lazy_batch_path_for(self.company)
+        response = self.client.get(url, {"key": ["lazy_contacts", "unknown"]})
+
+        assert response.status_code == 200
+        assert response.json()["missing"] == ["unknown"]
+
+    def test_batch_without_keys_returns_404(self):
+        response = self.client.get(admin_lazy_batch_path_for(self.company))
+        assert response.status_code == 404
+
+
+class TestLazyPanelBuilder(TestCase):
+    """Test that @lazy_panel builders let the lazy endpoint skip get_context_data()."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        Contact.objects.create(
+            company=self.company,
+            name="John Doe",
+            phone="555-5678",
+            email="john@test.com",
+        )
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass",
+        )
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def test_lazy_panel_methods_are_registered(self):
+        assert CompanyDetailView.get_lazy_panel_methods() == {"lazy_contacts": "lazy_contact_list"}
+
+    def test_builder_returns_lazy_fragment_on_page_load(self):
+        view = CompanyDetailView()
+        view.object = self.company
+
+        assert isinstance(view.lazy_contact_list(), LazyFragment)
+
+    def test_lazy_endpoint_skips_get_context_data(self):
+        url = admin_lazy_path_for(self.company, "lazy_contacts")
+
+        with patch.object(CompanyDetailView, "get_context_data", side_effect=AssertionError("full context built")):
+            response = self.client.get(url)
+
+        assert response.status_code == 200
+        assert "John Doe" in response.content.decode()
+
+    def test_batch_mixes_builders_and_context_panels(self):
+        url = admin_lazy_batch_path_for(self.company)
+        response = self.client.get(url, {"key": ["lazy_contacts", "lazy_company_details"]})
+
+        fragments = response.json()["fragments"]
+        assert list(fragments) == ["lazy_contacts", "lazy_company_details"]
+        assert "John Doe" in fragments["lazy_contacts"]
+
+
+class TestLazyFragmentMoreView(TestCase):
+    """Test keyset-paginated "load more" for table_for(load_more=True) panels."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        # Duplicate names make the pk tiebreaker matter at the page boundary
+        for name in ["Ann", "Bob", "Cat", "Dan", "Eve", "Eve", "Fay"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email="x@test.com")
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass",
+        )
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def _table(self, **kwargs):
+        reset_lazy_key_tracking()
+        return table_for(
+            panel_name="Contacts",
+            obj_set=Contact.objects.filter(company=self.company).order_by("name"),
+            obj_set_limit=5,
+            cols=[col("name")],
+            **kwargs,
+        )
+
+    def test_load_more_requires_lazy_load_key(self):
+        with pytest.raises(ValueError, match="lazy_load_key"):
+            self._table(load_more=True)
+
+    def test_first_page_has_next_cursor(self):
+        view = CompanyDetailView()
+        view.object = self.company
+        token = _rendering_lazy_panel.set("lazy_contacts")
+        try:
+            result = view.lazy_contact_list()
+        finally:
+            _rendering_lazy_panel.reset(token)
+
+        assert [row["obj"].name for row in result["rows"]] == ["Ann", "Bob", "Cat", "Dan", "Eve"]
+        assert result["load_more"] is True
+        assert result["next_cursor"]
+        assert result["count"] == 7
+
+    def test_fragment_renders_load_more_button(self):
+        response = self.client.get(admin_lazy_path_for(self.company, "lazy_contacts"))
+
+        content = response.content.decode()
+        assert 'data-action="lazy-panel#loadMore"' in content
+        assert f"/{self.company.pk}/lazy/lazy_contacts/more/?cursor=" in content
+
+    def test_more_returns_rows_after_cursor(self):
+        contacts = list(Contact.objects.filter(company=self.company).order_by("name", "pk"))
+        cursor = keyset_cursor(contacts[4], [("name", False), ("id", False)])
+        response = self.client.get(admin_lazy_more_path_for(self.company, "lazy_contacts", cursor))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rows_html"].count("<tr>") == 2
+        assert "Eve" in data["rows_html"]
+        assert "Fay" in data["rows_html"]
+        assert "No records found" not in data["rows_html"]
+        assert data["next_url"] is None
+
+    def test_more_pages_cover_every_row_once(self):
+        response = self.client.get(admin_lazy_path_for(self.company, "lazy_contacts"))
+        first_page = response.content.decode()
+        next_url = first_page.split('data-lazy-panel-url-param="')[1].split('"')[0].replace("&amp;", "&")
+
+        data = self.client.get(next_url).json()
+
+        # The id column links every contact exactly once across both pages
+        shown = first_page + data["rows_html"]
+        for contact in Contact.objects.filter(company=self.company):
+            assert shown.count(f"/admin/companies/contact/{contact.pk}/") == 1
+
+    def test_more_skips_count_query(self):
+        contacts = list(Contact.objects.filter(company=self.company).order_by("name", "pk"))
+        cursor = keyset_cursor(contacts[1], [("name", False), ("id", False)])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(admin_lazy_more_path_for(self.company, "lazy_contacts", cursor))
+
+        assert not [q for q in queries if "COUNT(" in q["sql"]]
+
+    def test_tampered_cursor_returns_404(self):
+        url = admin_lazy_more_path_for(self.company, "lazy_contacts", "not-a-cursor")
+        assert self.client.get(url).status_code == 404
+
+    def test_panel_without_load_more_returns_404(self):
+        cursor = keyset_cursor(self.company, [("id", False)])
+        url = admin_lazy_more_path_for(self.company, "lazy_company_details", cursor)
+        assert self.client.get(url).status_code == 404
+
+
+class TestLazyFragmentCache(TestCase):
+    """Test the lazy_cache_ttl fragment cache of the lazy endpoint."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        self.contact = Contact.objects.create(
+            company=self.company,
+            name="John Doe",
+            phone="555-5678",
+            email="john@test.com",
+        )
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass",
+        )
+        self.client.force_login(self.user)
+        self.url = admin_lazy_path_for(self.company, "lazy_contacts")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+
+        # Only the panel's etag validator reads contacts
+        assert second.content == first.content
+        assert not [q for q in queries if 'FROM "companies_contact"' in q["sql"] and "MAX(" not in q["sql"]]
+
+    def test_cache_key_includes_model_pk_and_key(self):
+        self.client.get(self.url)
+
+        cache_key = lazy_fragment_cache_key(self.company, "lazy_contacts")
+        assert f"companies.company:{self.company.pk}:lazy_contacts:" in cache_key
+        assert "John Doe" in cache.get(cache_key)
+
+    def test_cache_key_varies_by_extra(self):
+        assert lazy_fragment_cache_key(self.company, "lazy_contacts", 1) != lazy_fragment_cache_key(
+            self.company, "lazy_contacts", 2
+        )
+
+    def test_saving_related_object_invalidates(self):
+        self.client.get(self.url)
+
+        self.contact.name = "Jane Roe"
+        self.contact.save()
+
+        assert "Jane Roe" in self.client.get(self.url).content.decode()
+
+    def test_invalidate_lazy_fragments(self):
+        self.client.get(self.url)
+        # Bypass the post_save handler
+        Contact.objects.filter(pk=self.contact.pk).update(name="Jane Roe")
+        assert "John Doe" in self.client.get(self.url).content.decode()
+
+        invalidate_lazy_fragments(self.company)
+
+        assert "Jane Roe" in self.client.get(self.url).content.decode()
+
+    def test_batch_uses_cache(self):
+        single = self.client.get(self.url)
+        batch = self.client.get(admin_lazy_batch_path_for(self.company), {"key": "lazy_contacts"})
+
+        assert batch.json()["fragments"]["lazy_contacts"] == single.content.decode()
+
+
+class TestConditionalResponses(TestCase):
+    """Test ETag/Last-Modified conditional GETs on detail pages and lazy fragments."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        self.contact = Contact.objects.create(
+            company=self.company,
+            name="John Doe",
+            phone="555-5678",
+            email="john@test.com",
+        )
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass",
+        )
+        self.client.force_login(self.user)
+        self.lazy_url = admin_lazy_path_for(self.company, "lazy_contacts")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+
+    def test_lazy_fragment_sends_etag(self):
+        response = self.client.get(self.lazy_url)
+
+        assert response.headers["ETag"]
+        assert "no-cache" in response.headers["Cache-Control"]
+        assert "no-store" not in response.headers["Cache-Control"]
+
+    def test_lazy_fragment_not_modified_skips_panel(self):
+        etag = self.client.get(self.lazy_url).headers["ETag"]
+
+        with patch.object(LazyFragmentView, "_resolve_panels", side_effect=AssertionError("panel built")):
+            response = self.client.get(self.lazy_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_lazy_fragment_changes_etag_on_delete(self):
+        etag = self.client.get(self.lazy_url).headers["ETag"]
+
+        self.contact.delete()
+
+        response = self.client.get(self.lazy_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_panel_without_validators_is_never_cached(self):
+        response = self.client.get(admin_lazy_path_for(self.company, "lazy_company_details"))
+
+        assert "ETag" not in response.headers
+        assert "no-store" in response.headers["Cache-Control"]
+
+    def test_detail_page_last_modified(self):
+        url = admin_path_for(self.company, "detail")
+
+        with patch.object(CompanyDetailView, "get_last_modified", lambda view: view.object.updated_at):
+            response = self.client.get(url)
+            assert response.status_code == 200
+
+            with patch.object(CompanyDetailView, "get_context_data", side_effect=AssertionError("context built")):
+                response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"])
+
+        assert response.status_code == 304
+
+    def test_detail_page_without_validators_is_never_cached(self):
+        response = self.client.get(admin_path_for(self.company, "detail"))
+
+        assert response.status_code == 200
+        assert "no-store" in response.headers["Cache-Control"]
+
+
 class TestAdminDetailMixinValidation(TestCase):
     """Test that AdminDetailMixin validates proper configuration."""
 
@@ -0,0 +1,271 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import FileField
+from django.db.models.fields.files import FieldFile
+from django.template.loader import render_to_string
+from django.test import TestCase
+from django.utils.html import format_html
+from moneyed import Money
+
+from djadmin_detail_view import LazyFragment, col, detail, details_table_for, exports, table_for
+from djadmin_detail_view.template_helpers import reset_lazy_key_tracking
+from djadmin_detail_view.templatetags import djadmin_tags
+from djadmin_detail_view.url_helpers import admin_lazy_more_path_for, admin_lazy_path_for
+from example_project.companies.models import Company, Contact
+
+OBJECT_LIST = "admin/djadmin_components/object_list.html"
+OBJECT_DETAILS = "admin/djadmin_components/object_details.html"
+OBJECT_LIST_ROWS = "admin/djadmin_components/_object_list_rows.html"
+
+
+def file_value(name):
+    return FieldFile(None, FileField(), name)
+
+
+class RendererParityMixin:
+    """Renders a template with and without DJADMIN_NATIVE_RENDERER and requires identical bytes."""
+
+    def assert_parity(self, template, context):
+        with patch.object(djadmin_tags, "NATIVE_RENDERER", False):
+            expected = render_to_string(template, context)
+        with patch.object(djadmin_tags, "NATIVE_RENDERER", True):
+            actual = render_to_string(template, context)
+
+        assert actual == expected
+        return actual
+
+
+class TestObjectListRenderer(RendererParityMixin, TestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test & Co",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A <b>test</b> company",
+        )
+        for name in ["John Doe", "Jane <Doe>"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email="c@test.com")
+        self.contacts = Contact.objects.filter(company=self.company).order_by("name")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def render(self, object_list):
+        return self.assert_parity(OBJECT_LIST, {"object_list": object_list, "object": self.company})
+
+    def test_only_used_when_enabled(self):
+        object_list = table_for(obj_set=self.contacts, cols=[col("name")])
+
+        with patch.object(djadmin_tags, "NATIVE_RENDERER", False):
+            assert djadmin_tags.render_native_object_list(object_list, self.company) is None
+        with patch.object(djadmin_tags, "NATIVE_RENDERER", True):
+            assert "John Doe" in djadmin_tags.render_native_object_list(object_list, self.company)
+
+    def test_cell_kinds(self):
+        cols = [
+            col("id"),
+            col("name"),
+            col("company"),
+            col("company.website"),
+            col("created_at"),
+            col("is_active"),
+            col("balance", value=lambda contact: Money(1234, "SGD")),
+            col("count", value=lambda contact: 1234567),
+            col("missing", value=lambda contact: None),
+            col("html", value=lambda contact: format_html("<em>{}</em>", contact.name)),
+            col("data", value=lambda contact: {"a": "<b>"}),
+            col("file", value=lambda contact: file_value("docs/a & b.pdf")),
+            col("no_file", value=lambda contact: file_value("")),
+        ]
+
+        html = self.render(table_for(panel_name="Contacts <all>", obj_set=self.contacts, cols=cols))
+
+        assert "Jane &lt;Doe&gt;" in html
+        assert '<a href="https://test.com">https://test.com</a>' in html
+        assert "<em>John Doe</em>" in html
+        assert 'docs/a%20%26%20b.pdf">docs/a &amp; b.pdf</a>' in html
+
+    def test_actions_and_edit(self):
+        html = self.render(
+            table_for(
+                obj_set=self.contacts,
+                cols=[col("name")],
+                actions=[lambda contact: format_html('<a href="#{}">Call</a>', contact.pk)],
+                allow_edit=True,
+            )
+        )
+
+        assert "<th>Actions</th>" in html
+        assert 'class="ms-2">Edit</a>' in html
+
+    def test_empty_table(self):
+        for allow_edit in [False, True]:
+            html = self.render(
+                table_for(obj_set=Contact.objects.none(), cols=[col("name"), col("phone")], allow_edit=allow_edit)
+            )
+            assert "No records found." in html
+
+    def test_counts(self):
+        for kwargs in [
+            {"count_strategy": "exact"},
+            {"count_strategy": "has_more", "obj_set_limit": 1},
+            {"count_strategy": "none"},
+            {"obj_set_limit": None},
+        ]:
+            self.render(table_for(obj_set=self.contacts, cols=[col("name")], **kwargs))
+
+    def test_footer_links(self):
+        self.render(
+            table_for(
+                panel_name=None,
+                obj_set=self.contacts,
+                cols=[col("name")],
+                view_all_url="/contacts/?company=1&active=1",
+                view_all_footer_url="/contacts/",
+                add_url="/contacts/add/",
+            )
+        )
+        html = self.render(
+            table_for(obj_set=self.contacts, cols=[col("name")], add_url="/contacts/add/", add_label="New <contact>")
+        )
+
+        assert "New &lt;contact&gt;" in html
+
+    def test_export_links(self):
+        html = self.render(
+            table_for(panel_name="Contacts", obj_set=self.contacts, cols=[col("name")], exportable=True)
+        )
+
+        assert ">CSV</a>" in html
+
+    def test_xlsx_export_link(self):
+        with patch.object(exports, "xlsxwriter", object()):
+            html = self.render(
+                table_for(panel_name="Contacts", obj_set=self.contacts, cols=[col("name")], exportable=True)
+            )
+
+        assert ">XLSX</a>" in html
+
+    def test_load_more_button(self):
+        object_list = table_for(obj_set=self.contacts, obj_set_limit=1, cols=[col("name")])
+        object_list.update(lazy_key="lazy_contacts", next_cursor="abc")
+
+        html = self.render(object_list)
+
+        assert admin_lazy_more_path_for(self.company, "lazy_contacts", "abc").replace("&", "&amp;") in html
+        assert '<td colspan="2" class="text-center">' in html
+
+    def test_rows_partial(self):
+        object_list = table_for(obj_set=self.contacts, cols=[col("id"), col("name")], allow_edit=True)
+
+        self.assert_parity(OBJECT_LIST_ROWS, {"object_list": object_list})
+
+    def test_lazy_fragment_uses_template(self):
+        fragment = LazyFragment(lazy_key="lazy_contacts", panel_name="Contacts")
+
+        html = self.render(fragment)
+
+        assert 'data-controller="lazy-panel"' in html
+
+
+class TestObjectDetailsRenderer(RendererParityMixin, TestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test & Co",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A <b>test</b> company",
+        )
+        self.contact = Contact.objects.create(company=self.company, name="John", phone="555-5678", email="c@test.com")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def render(self, object_details):
+        return self.assert_parity(OBJECT_DETAILS, {"object_details": object_details, "object": self.company})
+
+    def test_detail_kinds(self):
+        details = [
+            detail("id"),
+            detail("name", help_text="Legal <name>"),
+            detail("description"),
+            detail("website"),
+            detail("created_at"),
+            detail("owner", value=self.contact),
+            detail("settings", value={"limits": [1, 2], "since": datetime(2024, 1, 2, tzinfo=timezone.utc)}),
+            detail("balance", value=Money(10, "SGD")),
+            detail("logo", value=lambda company: file_value("logos/co.png")),
+            detail("document", value=lambda company: file_value("")),
+            detail("missing", value=lambda company: None),
+        ]
+
+        html = self.render(details_table_for(panel_name="Company", obj=self.company, details=details))
+
+        assert "A &lt;b&gt;test&lt;/b&gt; company" in html
+        assert f'<a href="/admin/companies/contact/{self.contact.pk}">John</a>' in html
+        assert "<pre><code>{" in html
+
+    def test_header_without_panel_name(self):
+        html = self.render(details_table_for(obj=self.company, details=[detail("name")]))
+
+        assert "Company: " in html
+
+    def test_empty(self):
+        self.render(details_table_for(obj=None, details=[detail("name")]))
+        self.render(details_table_for(obj={}, details=[detail("name")], empty_message="Nothing <here>"))
+
+
+class TestNativeRendererEndpoints(TestCase):
+    """The lazy endpoints serve the same HTML with the native renderer."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        for name in ["Ann", "Bob", "Cat", "Dan", "Eve", "Fay"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email="x@test.com")
+        self.client.force_login(
+            User.objects.create_superuser(username="admin", email="admin@test.com", password="adminpass")
+        )
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+
+    def get_both(self, url):
+        responses = []
+        for enabled in [False, True]:
+            cache.clear()
+            with patch.object(djadmin_tags, "NATIVE_RENDERER", enabled):
+                responses.append(self.client.get(url))
+        return responses
+
+    def test_lazy_fragment(self):
+        template_response, native_response = self.get_both(admin_lazy_path_for(self.company, "lazy_contacts"))
+
+        assert native_response.status_code == 200
+        assert native_response.content == template_response.content
+
+    def test_load_more(self):
+        first_page = self.client.get(admin_lazy_path_for(self.company, "lazy_contacts")).content.decode()
+        next_url = first_page.split('data-lazy-panel-url-param="')[1].split('"')[0].replace("&amp;", "&")
+
+        template_response, native_response = self.get_both(next_url)
+
+        assert native_response.json() == template_response.json()
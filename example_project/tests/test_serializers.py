@@ -0,0 +1,132 @@
+import json
+from datetime import datetime, timezone
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import FileField
+from django.db.models.fields.files import FieldFile
+from django.test import TestCase
+from django.utils.html import format_html
+from moneyed import Money
+
+from djadmin_detail_view import admin_lazy_path_for, col, detail, details_table_for, table_for
+from djadmin_detail_view.serializers import PanelEncoder, serialize_panel, serialize_value
+from djadmin_detail_view.template_helpers import reset_lazy_key_tracking
+from example_project.companies.models import Company, Contact
+
+
+class TestSerializers(TestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test & Co",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        self.contact = Contact.objects.create(company=self.company, name="Ann", phone="555-5678", email="a@test.com")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def test_table(self):
+        object_list = table_for(
+            panel_name="Contacts",
+            obj_set=self.company.contact_set.all(),
+            cols=[col("name", help_text="Full name"), col("company"), col("company.website")],
+        )
+
+        data = serialize_panel(object_list)
+
+        assert data["type"] == "table"
+        assert data["columns"][0] == {"col_name": "name", "display_name": "Name", "help_text": "Full name"}
+        [[name, company, website]] = data["rows"]
+        assert name == "Ann"
+        assert company == {
+            "text": "Test & Co",
+            "html": f'<a href="/admin/companies/company/{self.company.pk}/">Test &amp; Co</a>',
+        }
+        assert website == {"text": "https://test.com", "url": "https://test.com"}
+        assert data["count"] == 1
+
+    def test_details(self):
+        object_details = details_table_for(
+            obj=self.company,
+            details=[detail("name"), detail("owner", value=self.contact), detail("missing", value=lambda obj: None)],
+        )
+
+        data = serialize_panel(object_details)
+
+        assert data["type"] == "details"
+        assert data["object"]["url"] == f"/admin/companies/company/{self.company.pk}"
+        assert [item["value"] for item in data["details"]] == [
+            "Test & Co",
+            {"text": "Ann", "url": f"/admin/companies/contact/{self.contact.pk}"},
+            "-",
+        ]
+        assert serialize_panel(details_table_for(obj=None, details=[detail("name")]))["details"] == []
+
+    def test_values(self):
+        value = {"since": datetime(2024, 1, 2, tzinfo=timezone.utc), "balance": Money(10, "SGD"), "other": object}
+
+        data = json.loads(json.dumps(serialize_value(value), cls=PanelEncoder))
+
+        assert data["since"] == "2024-01-02T00:00:00Z"
+        assert data["balance"] == "10"
+        assert data["other"] == "<class 'object'>"
+        assert serialize_value(FieldFile(None, FileField(), "")) is None
+        assert serialize_value(format_html("<b>{}</b>", "1 < 2")) == {"text": "1 < 2", "html": "<b>1 &lt; 2</b>"}
+
+
+class TestLazyFragmentJson(TestCase):
+    def setUp(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        for name in ["Ann", "Bob", "Cat", "Dan", "Eve", "Fay"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email="x@test.com")
+        self.client.force_login(
+            User.objects.create_superuser(username="admin", email="admin@test.com", password="adminpass")
+        )
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+
+    def test_format_json(self):
+        # An HTML request fills the fragment cache first; JSON is still built from the panel
+        html_response = self.client.get(admin_lazy_path_for(self.company, "lazy_contacts"))
+
+        response = self.client.get(admin_lazy_path_for(self.company, "lazy_contacts"), {"format": "json"})
+
+        data = response.json()
+        assert response["Content-Type"] == "application/json"
+        assert [column["col_name"] for column in data["columns"]] == ["id", "name", "email"]
+        assert [row[1] for row in data["rows"]] == ["Ann", "Bob", "Cat", "Dan", "Eve"]
+        assert data["has_more"] is True
+        assert data["next_cursor"]
+        assert response["ETag"] != html_response["ETag"]
+        assert "Accept" in response["Vary"]
+
+    def test_accept_header(self):
+        url = admin_lazy_path_for(self.company, "lazy_company_details")
+
+        json_response = self.client.get(url, headers={"Accept": "application/json"})
+        html_response = self.client.get(url, headers={"Accept": "text/html, application/json;q=0.9"})
+
+        assert json_response.json()["type"] == "details"
+        assert html_response["Content-Type"].startswith("text/html")
+
+    def test_missing_panel(self):
+        response = self.client.get(admin_lazy_path_for(self.company, "missing"), {"format": "json"})
+
+        assert response.status_code == 404
@@ -0,0 +1,517 @@
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test import TestCase
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from djadmin_detail_view import col, details_table_for, table_for
+from djadmin_detail_view.query_helpers import (
+    decode_keyset_cursor,
+    infer_related_lookups,
+    keyset_cursor,
+    keyset_filter,
+    keyset_order_by,
+    keyset_ordering,
+    with_inferred_related,
+    with_restricted_fields,
+)
+from djadmin_detail_view.template_helpers import (
+    _AUTOLINK_ROW,
+    _AUTOLINK_VALUE,
+    Column,
+    _compile_column_plan,
+    _format_datetime,
+    _format_plain,
+    _format_value,
+    reset_lazy_key_tracking,
+)
+from djadmin_detail_view.templatetags.djadmin_tags import jsonify
+from example_project.companies.models import Company, Contact
+
+
+class TestTableForRows(TestCase):
+    """Test the rows built by table_for."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        self.contacts = [
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email="c@test.com")
+            for name in ["John Doe", "Jane Doe"]
+        ]
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def test_rows_share_model_instances_but_not_column_dicts(self):
+        contacts = list(self.company.contact_set.order_by("id"))
+        cols = [col("id"), col("name")]
+
+        result = table_for(obj_set=contacts, cols=cols)
+
+        first, second = result["rows"]
+        assert first["obj"] is contacts[0]
+        assert second["obj"] is contacts[1]
+        assert first["obj_details"][1] is not second["obj_details"][1]
+        assert first["obj_details"][1]["value_out"] == "John Doe"
+        assert second["obj_details"][1]["value_out"] == "Jane Doe"
+        assert "value_out" not in cols[1]
+
+    def test_rows_and_cells_keep_dict_interface(self):
+        cols = [col("name", help_text="Full name")]
+
+        row = table_for(obj_set=self.company.contact_set.order_by("id"), cols=cols)["rows"][0]
+        [cell] = row["obj_details"]
+
+        assert cell.column is cols[0]
+        assert dict(cell) == {
+            "col_name": "name",
+            "display_name": "Name",
+            "value": None,
+            "help_text": "Full name",
+            "value_out": "John Doe",
+        }
+        assert row.get("panel_name") is None
+        assert row.get("missing", "-") == "-"
+        assert {**cols[0]} == {"col_name": "name", "display_name": "Name", "value": None, "help_text": "Full name"}
+
+        cols[0]["display_name"] = "Contact"
+        assert cell["display_name"] == "Contact"
+        cell["display_name"] = "This cell only"
+        assert cell["display_name"] == "This cell only"
+        assert cols[0]["display_name"] == "Contact"
+
+    def test_every_key_can_be_assigned(self):
+        column = col("name")
+        row = table_for(obj_set=self.company.contact_set.order_by("id"), cols=[column])["rows"][0]
+        [cell] = row["obj_details"]
+
+        for mapping in [row, column, cell]:
+            for key in type(mapping)._keys:
+                mapping[key] = f"new {key}"
+            mapping.update(custom="custom")
+
+            assert dict(mapping) == {**{key: f"new {key}" for key in type(mapping)._keys}, "custom": "custom"}
+
+    def test_columns_behave_like_dicts(self):
+        column = col("name")
+        column["css_class"] = "wide"
+
+        assert column["css_class"] == "wide"
+        assert column.get("css_class") == "wide"
+        assert list(column) == ["col_name", "display_name", "value", "help_text", "css_class"]
+
+        copied = column.copy()
+        copied["css_class"] = "narrow"
+        assert type(copied) is Column
+        assert column["css_class"] == "wide"
+
+        merged = column | {"display_name": "Full name"}
+        assert type(merged) is Column
+        assert merged["display_name"] == "Full name"
+        assert column["display_name"] == "Name"
+        assert {"display_name": "Full name", "extra": 1} | column == {**column, "extra": 1}
+
+        assert json.loads(jsonify(column)) == dict(column)
+        del column["css_class"]
+        assert "css_class" not in column
+
+    def test_actions_are_evaluated_per_row(self):
+        result = table_for(
+            obj_set=self.company.contact_set.order_by("id"),
+            cols=[col("name")],
+            actions=[lambda obj: f"action-{obj.pk}"],
+        )
+
+        assert [row["actions"] for row in result["rows"]] == [[f"action-{contact.pk}"] for contact in self.contacts]
+
+    def test_row_values_match_details_table_for(self):
+        cols = [
+            col("id"),
+            col("name"),
+            col("company"),
+            col("company.name"),
+            col("created_at"),
+            col("is_active"),
+            col("none", value=lambda obj: None),
+            col("constant", value="Fixed"),
+        ]
+
+        table_row = table_for(obj_set=self.company.contact_set.order_by("id"), cols=cols)["rows"][0]
+        details = details_table_for(obj=self.contacts[0], details=[dict(column) for column in cols])
+
+        assert [cell["value_out"] for cell in table_row["obj_details"]] == [
+            cell["value_out"] for cell in details["obj_details"]
+        ]
+
+    def test_row_values_are_formatted(self):
+        cols = [col("id"), col("company"), col("company.name"), col("none", value=lambda obj: None)]
+
+        row = table_for(obj_set=self.company.contact_set.order_by("id"), cols=cols)["rows"][0]
+        values = [cell["value_out"] for cell in row["obj_details"]]
+
+        contact = self.contacts[0]
+        assert values[0] == f'<a href="/admin/companies/contact/{contact.pk}/">{contact}</a>'
+        assert values[1] == f'<a href="/admin/companies/company/{self.company.pk}/">{self.company}</a>'
+        assert values[2] == "Test Company"
+        assert values[3] == "-"
+
+
+class TestColumnPlan(TestCase):
+    """Test that table_for columns are compiled from the model's fields."""
+
+    def test_autolink_decisions(self):
+        plan = _compile_column_plan(
+            [col("id"), col("name"), col("company"), col("company_id"), col("company.name"), col("unknown_attr")],
+            Contact,
+        )
+
+        assert [column_plan.autolink for column_plan in plan] == [
+            _AUTOLINK_ROW,
+            None,
+            _AUTOLINK_VALUE,
+            _AUTOLINK_VALUE,
+            None,
+            _AUTOLINK_VALUE,
+        ]
+
+    def test_formatters_follow_field_types(self):
+        plan = _compile_column_plan(
+            [col("name"), col("created_at"), col("unknown_attr"), col("computed", value=lambda obj: 1)],
+            Contact,
+        )
+
+        assert plan[0].formatter is _format_plain
+        assert plan[1].formatter.__name__ == "format_datetime"
+        assert plan[2].formatter is _format_value
+        assert plan[3].formatter is _format_value
+
+    def test_without_model_every_column_uses_generic_plan(self):
+        plan = _compile_column_plan([col("name"), col("created_at")])
+
+        assert [column_plan.autolink for column_plan in plan] == [_AUTOLINK_VALUE, _AUTOLINK_VALUE]
+        assert [column_plan.formatter for column_plan in plan] == [_format_value, _format_value]
+
+    def test_field_formatters_match_generic_formatting(self):
+        value = timezone.make_aware(datetime(2024, 1, 2, 3, 4, 5))
+        format_datetime = _compile_column_plan([col("created_at")], Contact)[0].formatter
+
+        assert format_datetime(value) == _format_datetime(value) == _format_value(value)
+        assert format_datetime(None) == _format_value(None) == "-"
+        assert _format_plain("text") == _format_value("text")
+
+
+class TestInferRelated(TestCase):
+    """Test select_related/prefetch_related inference from col() paths."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.companies = [
+            Company.objects.create(
+                name=f"Company {index}",
+                address="123 Test St",
+                phone="555-1234",
+                email="test@test.com",
+                website="https://test.com",
+                description="A test company",
+            )
+            for index in range(3)
+        ]
+        for company in self.companies:
+            Contact.objects.create(company=company, name="John Doe", phone="555-5678", email="c@test.com")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def test_infer_related_lookups(self):
+        select_related, prefetch_related = infer_related_lookups(
+            Contact,
+            ["id", "company", "company.name", "company.contact_set", "company_id", "name"],
+        )
+
+        assert select_related == ["company"]
+        assert prefetch_related == ["company__contact_set"]
+
+    def test_forward_relations_are_joined(self):
+        with self.assertNumQueries(1):
+            table_for(
+                obj_set=Contact.objects.filter(company__in=self.companies),
+                cols=[col("name"), col("company"), col("company.name")],
+            )
+
+    def test_reverse_relations_are_prefetched(self):
+        with self.assertNumQueries(2):
+            table_for(
+                obj_set=Company.objects.filter(pk__in=[company.pk for company in self.companies]),
+                cols=[col("name"), col("contact_set.count")],
+            )
+
+    def test_infer_related_can_be_disabled(self):
+        with self.assertNumQueries(1 + len(self.companies)):
+            table_for(
+                obj_set=Contact.objects.filter(company__in=self.companies),
+                cols=[col("name"), col("company.name")],
+                infer_related=False,
+            )
+
+    def test_callable_columns_are_ignored(self):
+        queryset = with_inferred_related(
+            Contact.objects.all(),
+            [col("company_name", value=lambda contact: contact.company.name)],
+        )
+
+        assert queryset.query.select_related is False
+
+    def test_combined_querysets_are_left_alone(self):
+        first, second = self.companies[:2]
+        contacts = Contact.objects.filter(company=first).union(Contact.objects.filter(company=second))
+
+        result = table_for(obj_set=contacts, cols=[col("name"), col("company.name")], restrict_fields=False)
+
+        assert sorted(row["obj_details"][1]["value_out"] for row in result["rows"]) == ["Company 0", "Company 1"]
+
+
+class TestRestrictFields(TestCase):
+    """Test narrowing table_for querysets to the fields the cols read."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def test_plain_columns_load_only_their_fields(self):
+        queryset = with_restricted_fields(Company.objects.all(), [col("name"), col("created_at")])
+
+        assert queryset.query.deferred_loading == ({"id", "name", "created_at"}, False)
+
+    def test_related_columns_keep_their_foreign_key(self):
+        queryset = with_restricted_fields(Contact.objects.all(), [col("name"), col("company.name")])
+
+        assert queryset.query.deferred_loading == ({"id", "name", "company"}, False)
+
+    def test_related_manager_querysets_keep_their_foreign_key(self):
+        queryset = with_restricted_fields(self.company.contact_set.all(), [col("name")])
+
+        assert queryset.query.deferred_loading == ({"id", "name", "company"}, False)
+
+    def test_combined_querysets_are_left_alone(self):
+        companies = Company.objects.filter(pk=self.company.pk).union(Company.objects.none())
+
+        assert with_restricted_fields(companies, [col("name")]) is companies
+
+        result = table_for(obj_set=companies, cols=[col("name")])
+        assert [row["obj_details"][0]["value_out"] for row in result["rows"]] == ["Test Company"]
+
+    def test_auto_linked_rows_only_defer_heavy_fields(self):
+        queryset = with_restricted_fields(
+            Company.objects.all(),
+            [col("id"), col("address")],
+            needs_whole_object=True,
+        )
+
+        assert queryset.query.deferred_loading == ({"description"}, True)
+
+    def test_callable_and_property_columns_disable_narrowing(self):
+        for cols in ([col("name"), col("total", value=lambda obj: 1)], [col("name"), col("total_order_value")]):
+            queryset = with_restricted_fields(Company.objects.all(), cols)
+            assert queryset.query.deferred_loading == (frozenset(), True)
+
+    def test_table_for_rows_do_not_query_deferred_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            result = table_for(obj_set=Company.objects.filter(pk=self.company.pk), cols=[col("id"), col("name")])
+
+        assert len(queries) == 1
+        assert '"description"' not in queries[0]["sql"]
+        assert result["rows"][0]["obj_details"][1]["value_out"] == "Test Company"
+
+    def test_actions_disable_narrowing(self):
+        with CaptureQueriesContext(connection) as queries:
+            table_for(
+                obj_set=Company.objects.filter(pk=self.company.pk),
+                cols=[col("name")],
+                actions=[lambda obj: obj.description],
+            )
+
+        assert len(queries) == 1
+        assert '"description"' in queries[0]["sql"]
+
+
+def fixed_estimate(queryset):
+    return 1234
+
+
+class TestCountStrategy(TestCase):
+    """Test the count strategies of table_for."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        for index in range(5):
+            Contact.objects.create(company=self.company, name=f"Contact {index}", phone="555", email="c@test.com")
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+
+    def table(self, **kwargs):
+        return table_for(obj_set=self.company.contact_set.all(), cols=[col("name")], **kwargs)
+
+    def test_count_is_free_when_every_row_fits(self):
+        with self.assertNumQueries(1):
+            assert self.table(obj_set_limit=10)["count"] == 5
+
+    def test_exact_count(self):
+        with self.assertNumQueries(2):
+            assert self.table(obj_set_limit=2, count_strategy="exact")["count"] == 5
+
+    def test_capped_count(self):
+        with self.assertNumQueries(2):
+            assert self.table(obj_set_limit=2, count_strategy="capped")["count"] == "2+"
+
+        assert self.table(obj_set_limit=2, count_strategy="capped", count_cap=10)["count"] == 5
+
+    def test_estimated_count_uses_estimator_hook(self):
+        with patch("djadmin_detail_view.query_helpers.COUNT_ESTIMATOR", f"{__name__}.fixed_estimate"):
+            assert self.table(obj_set_limit=2, count_strategy="estimated")["count"] == "~1234"
+
+    def test_estimated_count_falls_back_to_capped(self):
+        # The default estimator only knows PostgreSQL
+        assert self.table(obj_set_limit=2, count_strategy="estimated")["count"] == "2+"
+
+    def test_no_count(self):
+        with self.assertNumQueries(1):
+            assert self.table(obj_set_limit=2, count_strategy="none")["count"] is None
+
+    def test_explicit_count_is_kept(self):
+        with self.assertNumQueries(1):
+            assert self.table(obj_set_limit=2, count=42)["count"] == 42
+
+    def test_unknown_strategy_raises(self):
+        with pytest.raises(ValueError, match="Unknown count strategy 'fast'"):
+            self.table(obj_set_limit=2, count_strategy="fast")
+
+    def test_template_does_not_count_again(self):
+        result = self.table(obj_set_limit=2, count_strategy="capped")
+
+        with self.assertNumQueries(0):
+            html = render_to_string("admin/djadmin_components/object_list.html", {"object_list": result})
+
+        assert "(2 of 2+)" in html
+
+    def test_has_more_uses_a_single_query(self):
+        with self.assertNumQueries(1):
+            result = self.table(obj_set_limit=2, count_strategy="has_more")
+
+        assert len(result["rows"]) == 2
+        assert result["has_more"] is True
+        assert result["count"] is None
+        assert "(2+)" in render_to_string("admin/djadmin_components/object_list.html", {"object_list": result})
+
+    def test_has_more_when_every_row_fits(self):
+        with self.assertNumQueries(1):
+            result = self.table(obj_set_limit=5, count_strategy="has_more")
+
+        assert len(result["rows"]) == 5
+        assert result["has_more"] is False
+        assert result["count"] == 5
+
+    def test_has_more_follows_exact_count(self):
+        assert self.table(obj_set_limit=2)["has_more"] is True
+        assert self.table(obj_set_limit=10)["has_more"] is False
+
+
+class TestKeyset(TestCase):
+    """Test the keyset pagination helpers behind table_for(load_more=True)."""
+
+    def setUp(self):
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        for name in ["Ann", "Bob", "Bob", "Cat"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email="x@test.com")
+        self.contacts = Contact.objects.filter(company=self.company)
+
+    def test_ordering_appends_pk_tiebreaker(self):
+        assert keyset_ordering(self.contacts.order_by("-name")) == [("name", True), ("id", False)]
+        assert keyset_ordering(self.contacts.order_by("company__name", "-pk")) == [
+            ("company__name", False),
+            ("id", True),
+        ]
+
+    def test_ordering_rejects_unusable_orderings(self):
+        assert keyset_ordering(self.contacts.order_by("?")) is None
+        assert keyset_ordering(self.contacts.order_by("company")) is None
+
+    def test_filter_seeks_past_cursor_descending(self):
+        queryset = self.contacts.order_by("-name", "pk")
+        keyset = keyset_ordering(queryset)
+        ordered = list(queryset)
+
+        cursor = decode_keyset_cursor(keyset_cursor(ordered[1], keyset))
+
+        assert list(keyset_filter(queryset, keyset, cursor)) == ordered[2:]
+
+    def test_nullable_ordering_pages_through_every_row(self):
+        for name in ["Dan", "Eve"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email="x@test.com")
+        history = Contact.history.filter(company=self.company)
+        for record, reason in zip(history.order_by("pk"), ["b", None, "a", None, "a", None]):
+            record.history_change_reason = reason
+            record.save()
+        expected = sorted(record.pk for record in history)
+
+        for ordering in ["history_change_reason", "-history_change_reason"]:
+            queryset = history.order_by(ordering)
+            keyset = keyset_ordering(queryset)
+            queryset = queryset.order_by(*keyset_order_by(keyset, queryset.model))
+            seen = []
+            page = list(queryset[:2])
+            while page:
+                seen += [record.pk for record in page]
+                cursor = decode_keyset_cursor(keyset_cursor(page[-1], keyset))
+                page = list(keyset_filter(queryset, keyset, cursor)[:2])
+
+            assert len(seen) == len(expected), ordering
+            assert sorted(seen) == expected, ordering
+
+    def test_cursor_keeps_datetime_microseconds(self):
+        queryset = self.contacts.order_by("created_at")
+        keyset = keyset_ordering(queryset)
+        first = queryset.first()
+
+        cursor = decode_keyset_cursor(keyset_cursor(first, keyset))
+
+        assert str(first.created_at.microsecond) in cursor[0]
+        assert first not in keyset_filter(queryset, keyset, cursor)
@@ -0,0 +1,74 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from djadmin_detail_view import col, table_for
+from djadmin_detail_view.template_helpers import reset_lazy_key_tracking
+from djadmin_detail_view.testing import QueryBudgetExceeded, assert_detail_view_queries, assert_max_queries
+from example_project.companies.models import Company, Contact
+
+
+class TestQueryBudget(TestCase):
+    """Test the query budget assertions of djadmin_detail_view.testing."""
+
+    def setUp(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+        self.company = Company.objects.create(
+            name="Test Company",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@test.com",
+            website="https://test.com",
+            description="A test company",
+        )
+        for name in ["John Doe", "Jane Roe", "Max Moe"]:
+            Contact.objects.create(company=self.company, name=name, phone="555-5678", email="x@test.com")
+        self.user = User.objects.create_superuser(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass",
+        )
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        reset_lazy_key_tracking()
+        cache.clear()
+
+    def _n_plus_one_table(self):
+        return table_for(
+            panel_name="Contacts",
+            obj_set=Contact.objects.filter(company=self.company),
+            cols=[col("name"), col("company.name")],
+            infer_related=False,
+        )
+
+    def test_within_budget(self):
+        with assert_max_queries(4) as timings:
+            self._n_plus_one_table()
+
+        assert timings.panels["Contacts"].queries == 4
+
+    def test_over_budget_reports_panel_and_sql(self):
+        with pytest.raises(QueryBudgetExceeded) as error:
+            with assert_max_queries(2, label="Contacts table"):
+                self._n_plus_one_table()
+
+        message = str(error.value)
+        assert message.startswith("Contacts table ran 4 queries, budget is 2:")
+        assert "  Contacts: 4 queries" in message
+        assert 'FROM "companies_company"' in message
+
+    def test_detail_view_budget(self):
+        response = assert_detail_view_queries(self.client, self.company, 50)
+
+        assert response.status_code == 200
+
+    def test_lazy_fragment_budget_breakdown(self):
+        with pytest.raises(QueryBudgetExceeded) as error:
+            assert_detail_view_queries(self.client, self.company, 0, fragment_key="lazy_contacts")
+
+        message = str(error.value)
+        assert "  lazy_contacts: 1 queries" in message
+        assert "  outside panels:" in message
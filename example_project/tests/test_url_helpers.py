@@ -0,0 +1,144 @@
+from datetime import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.contrib import admin
+from django.test import SimpleTestCase, override_settings
+from django.urls import path, reverse, set_script_prefix
+
+from django.contrib.auth.models import Permission, User
+
+from djadmin_detail_view.template_helpers import _try_auto_link, admin_action_btn
+from djadmin_detail_view.templatetags.djadmin_tags import check_simple_history
+from djadmin_detail_view.url_helpers import (
+    _memoized_reverse,
+    admin_actions_for,
+    admin_has_action,
+    admin_lazy_path_for,
+    admin_path_for,
+    admin_url_for,
+    has_detail_url,
+)
+from example_project.companies.models import Company, Contact
+
+# Alternative URLconf for the invalidation tests
+urlpatterns = [
+    path("alt-admin/", admin.site.urls),
+]
+
+
+class TestMemoizedReverse(SimpleTestCase):
+    """Test that memoized URL reversing matches reverse()."""
+
+    def test_matches_reverse(self):
+        for pk in [1, 42, 1234567]:
+            company = Company(id=pk)
+            assert admin_path_for(company) == reverse("admin:companies_company_change", args=[pk])
+            assert admin_url_for(company) == reverse("admin:companies_company_change", args=[pk])
+            assert admin_path_for(company, "detail") == reverse("admin:companies_company_detail", args=[pk])
+
+    def test_urls_without_pk(self):
+        assert admin_path_for(Company, "changelist") == reverse("admin:companies_company_changelist")
+        assert admin_path_for("companies.Company") == reverse("admin:companies_company_changelist")
+
+    def test_kwargs_are_part_of_the_key(self):
+        company = Company(id=7)
+        assert admin_lazy_path_for(company, "orders") == "/admin/companies/company/7/lazy/orders/"
+        assert admin_lazy_path_for(company, "contacts") == "/admin/companies/company/7/lazy/contacts/"
+
+    def test_uuid_pk(self):
+        pk = uuid4()
+        assert _memoized_reverse("admin:companies_company_change", pk=pk) == f"/admin/companies/company/{pk}/change/"
+
+    def test_other_pks_are_reversed_directly(self):
+        assert _memoized_reverse("admin:companies_company_change", pk="a b") == reverse(
+            "admin:companies_company_change", args=["a b"]
+        )
+
+    def test_urlconf_change_invalidates(self):
+        company = Company(id=3)
+        assert admin_path_for(company) == "/admin/companies/company/3/change/"
+
+        with override_settings(ROOT_URLCONF=__name__):
+            assert admin_path_for(company) == "/alt-admin/companies/company/3/change/"
+
+        assert admin_path_for(company) == "/admin/companies/company/3/change/"
+
+    def test_script_prefix(self):
+        company = Company(id=3)
+        admin_path_for(company)
+
+        set_script_prefix("/sub/")
+        try:
+            assert admin_path_for(company) == "/sub/admin/companies/company/3/change/"
+        finally:
+            set_script_prefix("/")
+
+
+class TestDetailUrlRegistry(SimpleTestCase):
+    """Test the lookup of models with a detail URL used by autolinking."""
+
+    def test_registered_models(self):
+        assert has_detail_url(Company(id=1))
+        assert has_detail_url(Contact(id=1))
+        assert not has_detail_url(User(id=1))  # plain ModelAdmin
+
+    def test_follows_urlconf_changes(self):
+        with override_settings(ROOT_URLCONF=__name__):
+            assert has_detail_url(Company(id=1))
+
+        assert has_detail_url(Company(id=1))
+
+    def test_other_values(self):
+        for value in ["Acme", 42, datetime(2024, 1, 1), None, Company, Company()]:
+            assert not has_detail_url(value)
+
+    def test_other_site(self):
+        assert not has_detail_url(Company(id=1), site_name="other")
+
+    def test_autolink_skips_non_models_without_reversing(self):
+        with patch("djadmin_detail_view.template_helpers.auto_link") as auto_link:
+            assert _try_auto_link("Acme", "Acme") == "Acme"
+
+        auto_link.assert_not_called()
+
+    def test_autolink_links_registered_models(self):
+        company = Company(id=5, name="Acme")
+        assert _try_auto_link(company, company) == '<a href="/admin/companies/company/5/">Acme</a>'
+
+
+class TestAdminActions(SimpleTestCase):
+    """Test the per-model map of available admin actions."""
+
+    def test_actions_for_detail_view_model(self):
+        assert admin_actions_for(Company) == {"changelist", "add", "change", "delete", "history", "detail"}
+        assert admin_actions_for("companies.Company") == admin_actions_for(Company(id=1))
+
+    def test_actions_for_plain_admin(self):
+        actions = admin_actions_for(User)
+        assert "change" in actions
+        assert "detail" not in actions
+        assert "history" in actions  # ModelAdmin's own history view
+
+    def test_unregistered_model(self):
+        assert admin_actions_for(Company, site_name="other") == frozenset()
+
+    def test_resolved_once(self):
+        admin_actions_for(Contact)
+
+        with patch("djadmin_detail_view.url_helpers.reverse") as reverse_mock:
+            assert admin_has_action(Contact(id=1), "history")
+
+        reverse_mock.assert_not_called()
+
+    def test_check_simple_history(self):
+        assert check_simple_history(Company(id=1))
+        assert not check_simple_history(Permission(id=1))  # not registered in the admin
+
+    def test_admin_action_btn(self):
+        btn = admin_action_btn(Company(id=4), "delete", "Archive", confirm="Sure?")
+
+        assert btn["label"] == "Archive"
+        assert btn["url"] == "/admin/companies/company/4/delete/"
+        assert btn["confirm"] == "Sure?"
+        assert admin_action_btn(User(id=4), "detail") is None